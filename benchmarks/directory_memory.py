@@ -0,0 +1,251 @@
+"""
+Memory benchmark for cached organization directories.
+
+Generates Cal.com organization users and Calendly memberships shaped like the real API
+responses, parses them from JSON the way the server does, and measures the memory each
+form retains (with tracemalloc, each in a fresh child process):
+
+- raw items: the parsed upstream dicts on their own
+- records: the same members as compact DirectoryMember records
+- raw-dict index: the previous index layout, with raw dicts as members, separately
+  allocated lowercase columns and list-based posting lists
+- compact index: DirectoryIndex as the server builds it
+
+It also times building each index and searching the compact one.
+
+    python benchmarks/directory_memory.py --members 10000,50000
+    python benchmarks/directory_memory.py --members 100000 --platform calendly --output memory.json
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from mock_api import COMPANIES, FIRST_NAMES, LAST_NAMES, company_domain  # noqa: E402
+
+import scheduling_mcp_server as server  # noqa: E402
+
+
+def calcom_user(i: int, rng: random.Random) -> Dict[str, Any]:
+    """One entry of GET /v2/organizations/{id}/users"""
+    first, last, company = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(COMPANIES)
+    username = f"{first.lower()}{last.lower()}{i}"
+    return {
+        "id": i + 1,
+        "username": username,
+        "name": f"{first} {last}",
+        "email": f"{first.lower()}.{last.lower()}{i}@{company_domain(company)}",
+        "emailVerified": "2024-03-01T10:00:00.000Z",
+        "bio": f"{first} works on the {rng.choice(['platform', 'growth', 'sales', 'support'])} team.",
+        "avatarUrl": f"https://cal.com/api/avatar/{username}.png",
+        "timeZone": rng.choice(["Europe/London", "America/New_York", "Asia/Kolkata"]),
+        "weekStart": "Monday",
+        "appTheme": None,
+        "theme": None,
+        "defaultScheduleId": 1000 + i,
+        "locale": "en",
+        "timeFormat": 24,
+        "hideBranding": False,
+        "brandColor": "#292929",
+        "darkBrandColor": "#fafafa",
+        "allowDynamicBooking": True,
+        "createdDate": "2024-03-01T10:00:00.000Z",
+        "verified": True,
+        "invitedTo": None,
+        "organizationId": 1,
+        "metadata": {"company": company} if i % 2 else {},
+    }
+
+
+def calendly_membership(i: int, rng: random.Random) -> Dict[str, Any]:
+    """One entry of GET /organization_memberships"""
+    first, last, company = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(COMPANIES)
+    slug = f"{first.lower()}-{last.lower()}-{i}"
+    return {
+        "uri": f"https://api.calendly.com/organization_memberships/M{i:08d}",
+        "role": "user",
+        "user": {
+            "uri": f"https://api.calendly.com/users/U{i:08d}",
+            "name": f"{first} {last}",
+            "slug": slug,
+            "email": f"{first.lower()}.{last.lower()}{i}@{company_domain(company)}",
+            "scheduling_url": f"https://calendly.com/{slug}",
+            "timezone": rng.choice(["Europe/London", "America/New_York", "Asia/Kolkata"]),
+            "time_notation": "24h",
+            "avatar_url": f"https://calendly.com/avatars/{slug}.png",
+            "locale": "en",
+            "created_at": "2024-03-01T10:00:00.000000Z",
+            "updated_at": "2024-06-01T10:00:00.000000Z",
+        },
+        "organization": "https://api.calendly.com/organizations/ORG",
+        "updated_at": "2024-06-01T10:00:00.000000Z",
+        "created_at": "2024-03-01T10:00:00.000000Z",
+    }
+
+
+PLATFORMS = {
+    "calcom": (calcom_user, server.SchedulingAPI.calcom_member, server.SchedulingAPI.calcom_fields),
+    "calendly": (calendly_membership, server.SchedulingAPI.calendly_member, server.SchedulingAPI.calendly_fields),
+}
+
+
+def parsed_items(platform: str, count: int, seed: int) -> List[Dict[str, Any]]:
+    """Generate members and parse them back from JSON pages, so every string is a fresh object as after response.json()"""
+    make = PLATFORMS[platform][0]
+    rng = random.Random(seed)
+    items: List[Dict[str, Any]] = []
+    page_size = 100
+    for start in range(0, count, page_size):
+        page = json.dumps([make(i, rng) for i in range(start, min(start + page_size, count))])
+        items.extend(json.loads(page))
+    return items
+
+
+FORMS = ("raw_items", "records", "raw_dict_index", "compact_index")
+
+
+class RawDictIndex:
+    """The previous DirectoryIndex layout: raw dicts as members, plain lowercase columns and list postings"""
+
+    def __init__(self, members: List[Dict[str, Any]], fields: Callable, identity: Callable):
+        self.members = []
+        self.names, self.emails, self.companies = [], [], []
+        self.domains: Dict[str, List[int]] = {}
+        self.company_keys: Dict[str, List[int]] = {}
+        self.postings: Dict[str, List[int]] = {}
+        self.positions: Dict[Any, int] = {}
+        for member in members:
+            position = len(self.members)
+            name, email, company = fields(member)
+            name_lower, email_lower, company_lower = (name or "").lower(), (email or "").lower(), (company or "").lower()
+            self.members.append(member)
+            self.names.append(name_lower)
+            self.emails.append(email_lower)
+            self.companies.append(company_lower)
+            self.positions[identity(member)] = position
+            keys = set()
+            if "@" in email_lower:
+                domain = email_lower.rsplit("@", 1)[1]
+                self.domains.setdefault(domain, []).append(position)
+                keys.add(server.DirectoryIndex.company_key(domain))
+            if company_lower:
+                keys.add(server.DirectoryIndex.company_key(server.SchedulingAPI.extract_domain(company_lower)))
+            for key in keys:
+                if key:
+                    self.company_keys.setdefault(key, []).append(position)
+            grams = server.DirectoryIndex._grams
+            for gram in grams(name_lower) | grams(email_lower) | grams(company_lower):
+                self.postings.setdefault(gram, []).append(position)
+
+
+def build_form(platform: str, form: str, items: List[Dict[str, Any]]) -> Any:
+    _, record, fields = PLATFORMS[platform]
+    if form == "raw_items":
+        return items
+    if form == "records":
+        return [record(item) for item in items]
+    if form == "raw_dict_index":
+        identity = (lambda user: user.get("id")) if platform == "calcom" else (lambda membership: membership["user"]["uri"])
+        return RawDictIndex(items, fields, identity)
+    return server.DirectoryIndex(items, record, platform)
+
+
+def measure_form(platform: str, form: str, count: int, seed: int) -> Dict[str, float]:
+    """
+    Bytes a form retains once the parsed items it was built from are released, and the
+    seconds building it takes (timed separately, without tracemalloc). Runs in a fresh
+    child process so interned strings and allocator state don't carry over between forms.
+    """
+    gc.collect()
+    tracemalloc.start()
+    value = build_form(platform, form, parsed_items(platform, count, seed))
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+
+    items = parsed_items(platform, count, seed)
+    started = time.perf_counter()
+    build_form(platform, form, items)
+    return {"bytes": size, "build_s": time.perf_counter() - started}
+
+
+def in_child(function: Callable, *args: Any) -> Any:
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork")) as pool:
+        return pool.submit(function, *args).result()
+
+
+def measure_search(platform: str, count: int, seed: int, searches: int) -> Tuple[float, float]:
+    """Mean milliseconds and matches per search against the compact index"""
+    index = server.DirectoryIndex(parsed_items(platform, count, seed), PLATFORMS[platform][1], platform)
+    rng = random.Random(seed + 1)
+    queries = [server.SearchQuery(rng.choice(FIRST_NAMES), rng.choice(COMPANIES)) for _ in range(searches)]
+    started = time.perf_counter()
+    matched = sum(len(index.search(query)) for query in queries)
+    return (time.perf_counter() - started) * 1000 / searches, matched / searches
+
+
+def measure(platform: str, count: int, seed: int, searches: int) -> Dict[str, Any]:
+    forms = {form: in_child(measure_form, platform, form, count, seed) for form in FORMS}
+    search_ms, matched = in_child(measure_search, platform, count, seed, searches)
+
+    row: Dict[str, Any] = {"platform": platform, "members": count}
+    for form, result in forms.items():
+        row[f"{form}_mb"] = round(result["bytes"] / 1e6, 2)
+        row[f"{form}_bytes_per_member"] = round(result["bytes"] / count, 1)
+    for form in ("raw_dict_index", "compact_index"):
+        row[f"{form}_build_s"] = round(forms[form]["build_s"], 3)
+    row["index_reduction_pct"] = round(100 * (1 - forms["compact_index"]["bytes"] / forms["raw_dict_index"]["bytes"]), 1)
+    row["search_ms"] = round(search_ms, 3)
+    row["matched_per_search"] = round(matched, 1)
+    return row
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare the memory of raw-dict and compact directory indexes")
+    parser.add_argument("--members", default="10000,50000", help="Comma-separated directory sizes")
+    parser.add_argument("--platform", choices=["calcom", "calendly", "both"], default="both")
+    parser.add_argument("--searches", type=int, default=200, help="Searches timed against each compact index")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = parse_args(argv)
+    platforms = ["calcom", "calendly"] if args.platform == "both" else [args.platform]
+    sizes = [int(size) for size in args.members.split(",") if size.strip()]
+
+    results = []
+    print(f"{'platform':<10}{'members':>9}{'raw items':>12}{'records':>10}{'raw index':>12}{'compact':>10}"
+          f"{'saved':>8}{'B/member':>10}{'search':>10}")
+    for platform in platforms:
+        for size in sizes:
+            row = measure(platform, size, args.seed, args.searches)
+            results.append(row)
+            print(
+                f"{platform:<10}{size:>9}{row['raw_items_mb']:>10.1f}MB{row['records_mb']:>8.1f}MB"
+                f"{row['raw_dict_index_mb']:>10.1f}MB{row['compact_index_mb']:>8.1f}MB{row['index_reduction_pct']:>7.1f}%"
+                f"{row['compact_index_bytes_per_member']:>10.0f}{row['search_ms']:>8.2f}ms"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
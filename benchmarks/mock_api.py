@@ -0,0 +1,274 @@
+"""
+Local stand-in for the Cal.com and Calendly endpoints used by scheduling_mcp_server.py.
+
+Serves a generated organization of configurable size with optional latency, error
+and rate-limit injection, so performance work never touches the real APIs. Directory
+pages carry an ETag and answer If-None-Match with 304, like the real APIs' caches.
+
+    python benchmarks/mock_api.py --users 5000 --latency-ms 40 --port 9100
+
+Then point the server at it:
+
+    CALCOM_API_BASE=http://127.0.0.1:9100/calcom CALENDLY_API_BASE=http://127.0.0.1:9100/calendly
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+FIRST_NAMES = [
+    "Alice", "Bob", "Carol", "David", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy",
+    "Mallory", "Niaj", "Olivia", "Peggy", "Rupert", "Sybil", "Trent", "Victor", "Walter", "Yvonne",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Martinez", "Lopez",
+    "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Thompson", "White",
+]
+COMPANIES = ["Acme Corp", "Globex Inc", "Initech LLC", "Umbrella Co", "Hooli"]
+
+
+@dataclass
+class MockConfig:
+    users: int = 1000
+    event_types: int = 3
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    max_page_size: int = 100
+    org_id: str = "1"
+    seed: int = 42
+
+
+def company_domain(company: str) -> str:
+    """Same heuristic the server uses to derive a domain from a company name"""
+    name = company.lower().split()[0]
+    return f"{name}.com"
+
+
+def generate_people(config: MockConfig) -> List[Dict[str, Any]]:
+    """Build a deterministic list of organization members"""
+    rng = random.Random(config.seed)
+    people = []
+    for i in range(config.users):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        company = rng.choice(COMPANIES)
+        people.append({
+            "id": i + 1,
+            "name": f"{first} {last}",
+            "username": f"{first.lower()}{last.lower()}{i}",
+            "email": f"{first.lower()}.{last.lower()}{i}@{company_domain(company)}",
+            "company": company,
+        })
+    return people
+
+
+def create_app(config: MockConfig) -> Starlette:
+    """Return an ASGI app emulating the Cal.com (/calcom) and Calendly (/calendly) APIs"""
+    people = generate_people(config)
+    rng = random.Random(config.seed + 1)
+    stats = {"requests": 0, "errors": 0, "rate_limited": 0, "not_modified": 0}
+
+    async def simulate(request: Request) -> JSONResponse | None:
+        """Apply latency and injected failures; return a response to short-circuit"""
+        stats["requests"] += 1
+        delay = config.latency_ms + rng.uniform(0, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if config.rate_limit_rate and rng.random() < config.rate_limit_rate:
+            stats["rate_limited"] += 1
+            return JSONResponse({"message": "Too Many Requests"}, status_code=429, headers={"Retry-After": "1"})
+        if config.error_rate and rng.random() < config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"message": "Internal Server Error"}, status_code=500)
+        return None
+
+    def conditional(request: Request, payload: Dict[str, Any]) -> Response:
+        """JSON response with an ETag, or 304 when the client already has this version"""
+        body = json.dumps(payload).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if request.headers.get("if-none-match") == etag:
+            stats["not_modified"] += 1
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(body, media_type="application/json", headers={"ETag": etag})
+
+    def page_size(value: str | None) -> int:
+        return max(1, min(int(value or config.max_page_size), config.max_page_size))
+
+    async def calcom_org_users(request: Request) -> Response:
+        if (failure := await simulate(request)) is not None:
+            return failure
+        if request.path_params["org_id"] != config.org_id:
+            return JSONResponse({"status": "error", "message": "Organization not found"}, status_code=404)
+        take = page_size(request.query_params.get("take"))
+        skip = int(request.query_params.get("skip", 0))
+        data = [
+            {
+                "id": person["id"],
+                "name": person["name"],
+                "email": person["email"],
+                "username": person["username"],
+                "metadata": {"company": person["company"]} if person["id"] % 2 else {},
+            }
+            for person in people[skip:skip + take]
+        ]
+        return conditional(request, {"status": "success", "data": data})
+
+    async def calcom_event_types(request: Request) -> JSONResponse:
+        if (failure := await simulate(request)) is not None:
+            return failure
+        user_id = int(request.query_params.get("userId", 0))
+        data = [
+            {"id": user_id * 100 + n, "slug": f"meeting-{n}", "hidden": n == config.event_types - 1 and n > 0}
+            for n in range(config.event_types)
+        ]
+        return JSONResponse({"status": "success", "data": data})
+
+    async def calcom_organizations(request: Request) -> JSONResponse:
+        if (failure := await simulate(request)) is not None:
+            return failure
+        return JSONResponse({"status": "success", "data": [{"id": int(config.org_id), "name": "Mock Org", "slug": "mock-org"}]})
+
+    def calendly_base(request: Request) -> str:
+        return str(request.base_url).rstrip("/") + "/calendly"
+
+    async def calendly_me(request: Request) -> JSONResponse:
+        if (failure := await simulate(request)) is not None:
+            return failure
+        base = calendly_base(request)
+        return JSONResponse({"resource": {
+            "uri": f"{base}/users/OWNER",
+            "name": "Mock Owner",
+            "email": "owner@acme.com",
+            "current_organization": f"{base}/organizations/ORG",
+        }})
+
+    def paginate(request: Request, items: List[Dict[str, Any]]) -> Response:
+        count = page_size(request.query_params.get("count"))
+        start = int(request.query_params.get("page_token", 0))
+        next_page = None
+        if start + count < len(items):
+            next_page = str(request.url.include_query_params(page_token=start + count, count=count))
+        return conditional(request, {"collection": items[start:start + count], "pagination": {"next_page": next_page}})
+
+    async def calendly_memberships(request: Request) -> Response:
+        if (failure := await simulate(request)) is not None:
+            return failure
+        base = calendly_base(request)
+        memberships = [
+            {"user": {"uri": f"{base}/users/U{person['id']}", "name": person["name"], "email": person["email"]}}
+            for person in people
+        ]
+        return paginate(request, memberships)
+
+    async def calendly_event_types(request: Request) -> Response:
+        if (failure := await simulate(request)) is not None:
+            return failure
+        user = request.query_params.get("user", "").rsplit("/", 1)[-1]
+        event_types = [
+            {
+                "uri": f"{calendly_base(request)}/event_types/{user}-{n}",
+                "scheduling_url": f"https://calendly.com/{user.lower()}/meeting-{n}",
+                "active": n != config.event_types - 1 or n == 0,
+            }
+            for n in range(config.event_types)
+        ]
+        return paginate(request, event_types)
+
+    def open_slots(key: str, start: str, end: str) -> List[datetime]:
+        """Deterministic half-hour slots between 09:00 and 17:00 UTC on weekdays, some of them taken"""
+        start_at = datetime.fromisoformat(start.replace("Z", "+00:00"))
+        end_at = datetime.fromisoformat(end.replace("Z", "+00:00"))
+        slot = start_at.replace(minute=30 if start_at.minute > 30 else 0, second=0, microsecond=0)
+        if slot < start_at:
+            slot += timedelta(minutes=30)
+        slots = []
+        while slot < end_at:
+            taken = hashlib.blake2b(f"{key}:{slot.isoformat()}".encode(), digest_size=1).digest()[0] < 96
+            if slot.weekday() < 5 and 9 <= slot.hour < 17 and not taken:
+                slots.append(slot)
+            slot += timedelta(minutes=30)
+        return slots
+
+    async def calcom_slots(request: Request) -> JSONResponse:
+        if (failure := await simulate(request)) is not None:
+            return failure
+        params = request.query_params
+        data: Dict[str, List[Dict[str, str]]] = {}
+        for slot in open_slots(params.get("eventTypeId", ""), params["start"], params["end"]):
+            data.setdefault(slot.date().isoformat(), []).append({"start": slot.strftime("%Y-%m-%dT%H:%M:%S.000Z")})
+        return JSONResponse({"status": "success", "data": data})
+
+    async def calendly_available_times(request: Request) -> JSONResponse:
+        if (failure := await simulate(request)) is not None:
+            return failure
+        params = request.query_params
+        start, end = params["start_time"], params["end_time"]
+        if datetime.fromisoformat(end.replace("Z", "+00:00")) - datetime.fromisoformat(start.replace("Z", "+00:00")) > timedelta(days=7):
+            return JSONResponse({"title": "Invalid Argument", "message": "date range can be no greater than 1 week (7 days)"}, status_code=400)
+        collection = [
+            {"status": "available", "invitees_remaining": 1, "start_time": slot.strftime("%Y-%m-%dT%H:%M:%S.000000Z")}
+            for slot in open_slots(params.get("event_type", ""), start, end)
+        ]
+        return JSONResponse({"collection": collection})
+
+    async def mock_stats(request: Request) -> JSONResponse:
+        return JSONResponse(stats)
+
+    return Starlette(routes=[
+        Route("/calcom/v2/organizations/{org_id}/users", calcom_org_users),
+        Route("/calcom/v2/event-types", calcom_event_types),
+        Route("/calcom/v2/slots", calcom_slots),
+        Route("/calcom/v2/organizations", calcom_organizations),
+        Route("/calendly/users/me", calendly_me),
+        Route("/calendly/organization_memberships", calendly_memberships),
+        Route("/calendly/event_types", calendly_event_types),
+        Route("/calendly/event_type_available_times", calendly_available_times),
+        Route("/_stats", mock_stats),
+    ])
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Local Cal.com/Calendly stand-in for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--users", type=int, default=MockConfig.users, help="Members in the generated organization")
+    parser.add_argument("--event-types", type=int, default=MockConfig.event_types, help="Event types per member")
+    parser.add_argument("--latency-ms", type=float, default=MockConfig.latency_ms, help="Fixed latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=MockConfig.jitter_ms, help="Random extra latency per request")
+    parser.add_argument("--error-rate", type=float, default=MockConfig.error_rate, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=MockConfig.rate_limit_rate, help="Fraction of requests answered with 429")
+    parser.add_argument("--max-page-size", type=int, default=MockConfig.max_page_size, help="Largest page returned by paginated endpoints")
+    parser.add_argument("--seed", type=int, default=MockConfig.seed)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = parse_args(argv)
+    config = MockConfig(
+        users=args.users,
+        event_types=args.event_types,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        max_page_size=args.max_page_size,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
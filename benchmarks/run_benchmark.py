@@ -0,0 +1,237 @@
+"""
+End-to-end benchmark for the scheduling MCP server against the local mock API.
+
+Starts benchmarks/mock_api.py in a subprocess, points the server at it and calls the
+MCP tools through a FastMCP client at each concurrency level, reporting throughput,
+p50/p95/p99 latency, errors and memory.
+
+    python benchmarks/run_benchmark.py --users 5000 --latency-ms 40 --concurrency 1,8,32
+
+By default the server runs in-process behind an in-memory MCP transport. Use --url to
+benchmark an already running server over streamable HTTP instead (it must have been
+started with CALCOM_API_BASE/CALENDLY_API_BASE pointing at --mock-port).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+import httpx
+from mcp import McpError
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from mock_api import COMPANIES, FIRST_NAMES, LAST_NAMES  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock(args: argparse.Namespace, port: int) -> subprocess.Popen:
+    """Launch the mock API and wait until it answers"""
+    process = subprocess.Popen([
+        sys.executable, os.path.join(HERE, "mock_api.py"),
+        "--port", str(port),
+        "--users", str(args.users),
+        "--event-types", str(args.event_types),
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate),
+        "--rate-limit-rate", str(args.rate_limit_rate),
+        "--max-page-size", str(args.max_page_size),
+    ])
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/_stats", timeout=1)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Mock API did not start")
+
+
+def configure_server(mock_base: str) -> None:
+    """Point the server at the mock before it is imported (settings are read at import time)"""
+    os.environ["CALCOM_API_BASE"] = f"{mock_base}/calcom"
+    os.environ["CALENDLY_API_BASE"] = f"{mock_base}/calendly"
+    os.environ.setdefault("CALCOM_API_KEY", "cal_benchmark")
+    os.environ.setdefault("CALENDLY_PAT", "benchmark_pat")
+    # Measure the server rather than the client-side rate limiter or admission control unless asked otherwise
+    os.environ.setdefault("CALCOM_RATE_LIMIT_PER_SECOND", "0")
+    os.environ.setdefault("CALENDLY_RATE_LIMIT_PER_SECOND", "0")
+    os.environ.setdefault("TOOL_MAX_IN_FLIGHT", "0")
+    os.environ.setdefault("TOOL_MAX_IN_FLIGHT_OVERRIDES", "")
+    os.environ.setdefault("TOKEN_MAX_IN_FLIGHT", "0")
+
+
+def make_queries(count: int, platform: str, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "platform": platform,
+            "org_id": "1",
+            "name": rng.choice(FIRST_NAMES) if rng.random() < 0.5 else f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "company": rng.choice(COMPANIES),
+        }
+        for _ in range(count)
+    ]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def memory_mb() -> Dict[str, float]:
+    """Current and peak resident set size of this process"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    current = peak
+    try:
+        with open("/proc/self/statm") as statm:
+            current = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        pass
+    return {"rss_mb": round(current, 1), "peak_rss_mb": round(peak, 1)}
+
+
+async def run_level(client, tool: str, queries: List[Dict[str, Any]], concurrency: int) -> Dict[str, Any]:
+    """Send every query with `concurrency` workers and summarise latencies"""
+    latencies: List[float] = []
+    errors = 0
+    pending = iter(queries)
+
+    async def worker() -> None:
+        nonlocal errors
+        for arguments in pending:
+            started = time.perf_counter()
+            try:
+                result = await client.call_tool(tool, arguments, raise_on_error=False)
+                failed = result.is_error
+            except McpError:
+                # Calls rejected by admission control come back as JSON-RPC errors
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            if failed:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        **memory_mb(),
+    }
+
+
+async def benchmark(args: argparse.Namespace, mock_base: str) -> Dict[str, Any]:
+    from fastmcp import Client
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = []
+
+    if args.url:
+        client = Client(args.url, auth=args.token)
+        server_resources = None
+    else:
+        configure_server(mock_base)
+        import scheduling_mcp_server as server
+        client = Client(server.mcp)
+        server_resources = server.server_resources()
+
+    async def run_all() -> None:
+        async with client:
+            # Warm up connections and caches so levels are comparable
+            for arguments in make_queries(args.warmup, args.platform, args.seed - 1):
+                await client.call_tool(args.tool, arguments, raise_on_error=False)
+            for level in levels:
+                queries = make_queries(args.requests, args.platform, args.seed + level)
+                if args.cold and not args.url:
+                    server.directory_cache.clear()
+                    server.event_type_cache.clear()
+                result = await run_level(client, args.tool, queries, level)
+                results.append(result)
+                print(
+                    f"c={result['concurrency']:<4} rps={result['throughput_rps']:<8} "
+                    f"p50={result['p50_ms']}ms p95={result['p95_ms']}ms p99={result['p99_ms']}ms "
+                    f"errors={result['errors']} rss={result['rss_mb']}MB"
+                )
+
+    if server_resources is not None:
+        async with server_resources:
+            await run_all()
+    else:
+        await run_all()
+
+    mock_stats = httpx.get(f"{mock_base}/_stats").json()
+    return {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "token")},
+        "levels": results,
+        "mock": mock_stats,
+    }
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the scheduling MCP server against a local mock API")
+    parser.add_argument("--tool", default="search_scheduling_links")
+    parser.add_argument("--platform", default="calcom", help="Platform argument passed to the tool (calcom, calendly, all)")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Tool calls per concurrency level")
+    parser.add_argument("--warmup", type=int, default=5, help="Tool calls before measuring")
+    parser.add_argument("--cold", action="store_true", help="Clear in-process caches before each level")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--event-types", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--max-page-size", type=int, default=100)
+    parser.add_argument("--mock-port", type=int, default=0, help="Port for the mock API (default: any free port)")
+    parser.add_argument("--url", help="Benchmark a running server, e.g. http://127.0.0.1:8086/mcp/")
+    parser.add_argument("--token", default=os.getenv("MCP_BEARER_TOKEN"), help="Bearer token for --url")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = parse_args(argv)
+    port = args.mock_port or free_port()
+    mock = start_mock(args, port)
+    try:
+        report = asyncio.run(benchmark(args, f"http://127.0.0.1:{port}"))
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
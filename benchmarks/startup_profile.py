@@ -0,0 +1,174 @@
+"""
+Cold-start profile for the scheduling MCP server.
+
+Runs fresh interpreters and reports:
+
+- an import-time breakdown of `import scheduling_mcp_server` by top-level package
+  (from `python -X importtime`), plus the module's own setup time
+- time from process start to the first HTTP response, and the resident memory of the
+  server (RSS and, for worker processes that share pages, PSS) at that point
+
+    python benchmarks/startup_profile.py --runs 5
+    python benchmarks/startup_profile.py --runs 3 --workers 4
+
+Each figure is the median over --runs.
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+SERVER = os.path.join(ROOT, "scheduling_mcp_server.py")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def import_breakdown() -> Dict[str, float]:
+    """Cumulative import milliseconds per top-level package imported by the server module"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import scheduling_mcp_server"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    packages: Dict[str, float] = {}
+    children: List[tuple] = []
+    total = 0.0
+    # importtime lists a module's imports (one level deeper) just before the module itself
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        head, cumulative_us, name = line.split("|", 2)
+        try:
+            self_us, cumulative_us = int(head.split(":")[1]), int(cumulative_us)
+        except ValueError:
+            # The header line
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        if depth == 1:
+            children.append((name, cumulative_us))
+        elif depth == 0:
+            if name == "scheduling_mcp_server":
+                total = cumulative_us / 1000
+                packages["(module setup)"] = self_us / 1000
+                for child, child_us in children:
+                    top = child.split(".")[0]
+                    packages[top] = packages.get(top, 0.0) + child_us / 1000
+            children = []
+    packages["(total)"] = total
+    return packages
+
+
+def process_tree(pid: int) -> List[int]:
+    pids = [pid]
+    for current in pids:
+        try:
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def memory_mb(pid: int) -> Dict[str, float]:
+    """RSS and PSS summed over a process and its children"""
+    rss = pss = 0
+    for child in process_tree(pid):
+        try:
+            with open(f"/proc/{child}/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith("Rss:"):
+                        rss += int(line.split()[1])
+                    elif line.startswith("Pss:"):
+                        pss += int(line.split()[1])
+        except OSError:
+            pass
+    return {"rss_mb": round(rss / 1024, 1), "pss_mb": round(pss / 1024, 1)}
+
+
+def server_startup(workers: int, timeout: float) -> Dict[str, float]:
+    """Start the server and time the first HTTP response from /mcp/"""
+    port = free_port()
+    env = {**os.environ, "SERVER_HOST": "127.0.0.1", "SERVER_PORT": str(port), "WORKERS": str(workers)}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, SERVER], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            try:
+                # Any response (401 without a token) means a worker is serving requests
+                httpx.post(f"http://127.0.0.1:{port}/mcp/", timeout=0.5)
+                break
+            except httpx.TransportError:
+                time.sleep(0.01)
+        else:
+            raise RuntimeError("Server did not answer before the timeout")
+        first_response = time.perf_counter() - started
+        if workers > 1:
+            # Let the remaining workers finish starting before measuring memory
+            time.sleep(2)
+        return {"first_response_s": round(first_response, 3), **memory_mb(process.pid)}
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def median_of(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    return {key: round(statistics.median(sample[key] for sample in samples), 3) for key in samples[0]}
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Profile the scheduling MCP server's cold start")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--workers", type=int, default=1, help="WORKERS for the server start measurement")
+    parser.add_argument("--top", type=int, default=12, help="Packages shown in the import breakdown")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for the first response")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = parse_args(argv)
+
+    imports = median_of([import_breakdown() for _ in range(args.runs)])
+    print("Import time by package (ms, median):")
+    ordered = sorted(((key, value) for key, value in imports.items() if key != "(total)"), key=lambda item: -item[1])
+    for name, value in ordered[:args.top]:
+        print(f"  {name:<28}{value:>9.1f}")
+    print(f"  {'(total)':<28}{imports['(total)']:>9.1f}")
+
+    startup = median_of([server_startup(args.workers, args.timeout) for _ in range(args.runs)])
+    print(
+        f"Startup (workers={args.workers}): first response after {startup['first_response_s']}s, "
+        f"rss={startup['rss_mb']}MB pss={startup['pss_mb']}MB"
+    )
+
+    if args.output:
+        report: Dict[str, Any] = {"config": vars(args), "imports_ms": imports, "startup": startup}
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
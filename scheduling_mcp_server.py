@@ -1,16 +1,49 @@
-from typing import Annotated, List, Dict, Any
-from fastmcp import FastMCP
-from fastmcp.server.auth.providers.bearer import BearerAuthProvider, RSAKeyPair
+import time
+
+# Startup profile: when this module started loading, before the framework imports below
+_LOAD_STARTED = time.perf_counter()
+
+from typing import TYPE_CHECKING, Annotated, List, Dict, Any, Tuple, Callable, Awaitable, AsyncIterator, Iterator
+from collections import OrderedDict, deque
+from contextlib import aclosing, asynccontextmanager, contextmanager
+from fastmcp import Context, FastMCP
+from fastmcp.server.auth.auth import OAuthProvider
+from fastmcp.server.dependencies import get_access_token
+from fastmcp.server.middleware import Middleware, MiddlewareContext
 from mcp import ErrorData, McpError
-from mcp.server.auth.provider import AccessToken
-from mcp.types import INTERNAL_ERROR, INVALID_PARAMS, TextContent
+from mcp.server.auth.provider import AccessToken, AuthorizationCode, AuthorizationParams, RefreshToken, TokenVerifier
+from mcp.server.auth.settings import ClientRegistrationOptions, RevocationOptions
+from mcp.shared.auth import OAuthClientInformationFull, OAuthToken
+from mcp.types import INTERNAL_ERROR, INVALID_PARAMS, CallToolRequest, TextContent
 from pydantic import BaseModel, Field
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
 import httpx
 import asyncio
+import bisect
+import contextvars
+import functools
+import hashlib
+import heapq
+import hmac
+import importlib.util
+import itertools
+import multiprocessing
 import os
 import json
+import random
 import re
-from urllib.parse import quote
+import signal
+import socket
+import sys
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+if TYPE_CHECKING:
+    # Only imported at runtime by PersistentStore, when a persistent cache is configured
+    import sqlite3
 
 # Load environment variables from .env file if it exists
 try:
@@ -20,14 +53,172 @@ except ImportError:
     # dotenv not installed, continue with system environment variables
     pass
 
-TOKEN = "696969"
+# Faster JSON encoding for compact responses when orjson is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Seconds spent in each startup phase, reported at startup and by get_performance_stats
+STARTUP_TIMINGS: Dict[str, float] = {"imports_seconds": round(time.perf_counter() - _LOAD_STARTED, 3)}
+
+TOKEN = os.getenv("MCP_BEARER_TOKEN", "696969")
+# The built-in default token is only accepted while no other token is configured
+TOKEN_IS_DEFAULT = "MCP_BEARER_TOKEN" not in os.environ
 MY_NUMBER = ""  # Insert your number {91}{Your number}
 
+# Address the MCP server listens on
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8086"))  # Different port from the original server
+
+# Worker processes sharing the listening socket (1 = single process)
+WORKERS = int(os.getenv("WORKERS", "1"))
+# Cache file the workers share when WORKERS > 1 and PERSISTENT_CACHE_PATH is unset
+WORKERS_CACHE_PATH = "scheduling_cache.sqlite3"
+# Seconds to let in-flight requests finish after SIGTERM/SIGINT before closing connections
+SHUTDOWN_DRAIN_TIMEOUT = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "30"))
+
+# Additional client tokens: comma-separated "client_id:token" or "token" entries, and/or a file with one entry per line
+MCP_BEARER_TOKENS = os.getenv("MCP_BEARER_TOKENS", "")
+MCP_BEARER_TOKENS_FILE = os.getenv("MCP_BEARER_TOKENS_FILE", "")
+
 # Environment variables for API keys
 CALCOM_API_KEY = os.getenv("CALCOM_API_KEY")
 CALENDLY_PAT = os.getenv("CALENDLY_PAT")
 CALCOM_ORG_ID = os.getenv("CALCOM_ORG_ID")
 
+# Upstream API base URLs (override to point the server at a local stand-in, e.g. benchmarks/mock_api.py)
+CALCOM_API_BASE = os.getenv("CALCOM_API_BASE", "https://api.cal.com").rstrip("/")
+CALENDLY_API_BASE = os.getenv("CALENDLY_API_BASE", "https://api.calendly.com").rstrip("/")
+
+# HTTP connection pool tuning for upstream API clients
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
+HTTP_MAX_CLIENTS = int(os.getenv("HTTP_MAX_CLIENTS", "32"))
+
+# Prometheus-style metrics served at /metrics (set to false to disable collection and the endpoint)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Per-request tracing: share of tool calls traced, OTLP JSON export file, slow-request log threshold (0 disables)
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() in ("1", "true", "yes")
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "5"))
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "2000"))
+
+# Upstream rate limiting: token bucket per platform credential (requests/second, burst size; 0 disables)
+CALCOM_RATE_LIMIT_PER_SECOND = float(os.getenv("CALCOM_RATE_LIMIT_PER_SECOND", "2"))
+CALCOM_RATE_LIMIT_BURST = int(os.getenv("CALCOM_RATE_LIMIT_BURST", "20"))
+CALENDLY_RATE_LIMIT_PER_SECOND = float(os.getenv("CALENDLY_RATE_LIMIT_PER_SECOND", "2"))
+CALENDLY_RATE_LIMIT_BURST = int(os.getenv("CALENDLY_RATE_LIMIT_BURST", "20"))
+
+# Retries for 429 and 5xx upstream responses (jittered exponential backoff, Retry-After honoured)
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "3"))
+UPSTREAM_BACKOFF_BASE = float(os.getenv("UPSTREAM_BACKOFF_BASE", "0.5"))
+UPSTREAM_BACKOFF_MAX = float(os.getenv("UPSTREAM_BACKOFF_MAX", "30"))
+
+# Upstream timeouts in seconds: per phase for httpx, plus a total per request including the body and any hedge
+UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "5"))
+UPSTREAM_READ_TIMEOUT = float(os.getenv("UPSTREAM_READ_TIMEOUT", "15"))
+UPSTREAM_WRITE_TIMEOUT = float(os.getenv("UPSTREAM_WRITE_TIMEOUT", "10"))
+UPSTREAM_POOL_TIMEOUT = float(os.getenv("UPSTREAM_POOL_TIMEOUT", "10"))
+UPSTREAM_TOTAL_TIMEOUT = float(os.getenv("UPSTREAM_TOTAL_TIMEOUT", "30"))
+
+# Per-endpoint circuit breakers: open when at least CIRCUIT_FAILURE_RATIO of the last CIRCUIT_WINDOW calls
+# (and at least CIRCUIT_MIN_CALLS) failed or took longer than CIRCUIT_SLOW_CALL_SECONDS; CIRCUIT_WINDOW=0 disables
+CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", "20"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "10"))
+CIRCUIT_FAILURE_RATIO = float(os.getenv("CIRCUIT_FAILURE_RATIO", "0.5"))
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "10"))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+
+# Hedged GETs: send a second copy when the first is slower than the endpoint's recent p95
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))
+
+# How cached directories are refreshed: "incremental" re-walks the pages with conditional requests and
+# applies only the changed members, "full" downloads and rebuilds the whole directory
+DIRECTORY_SYNC_MODE = os.getenv("DIRECTORY_SYNC_MODE", "incremental").lower()
+
+# Seconds after which an incrementally synced directory is rebuilt from scratch anyway (0 = never)
+DIRECTORY_FULL_SYNC_INTERVAL = float(os.getenv("DIRECTORY_FULL_SYNC_INTERVAL", "86400"))
+
+# Calendly membership webhook events: the signing key enables POST /webhooks/calendly; with DIRECTORY_EVENTS_PATH
+# events are spooled to a file every worker replays, otherwise they are queued in memory (at most DIRECTORY_EVENTS_MAX)
+CALENDLY_WEBHOOK_SIGNING_KEY = os.getenv("CALENDLY_WEBHOOK_SIGNING_KEY", "")
+DIRECTORY_EVENTS_PATH = os.getenv("DIRECTORY_EVENTS_PATH", "")
+DIRECTORY_EVENTS_MAX = int(os.getenv("DIRECTORY_EVENTS_MAX", "10000"))
+
+# Page sizes used when walking paginated directory endpoints
+CALCOM_PAGE_SIZE = int(os.getenv("CALCOM_PAGE_SIZE", "100"))
+CALENDLY_PAGE_SIZE = int(os.getenv("CALENDLY_PAGE_SIZE", "100"))
+# Most pages read in one directory walk, so an API that ignores paging can't loop forever
+DIRECTORY_MAX_PAGES = int(os.getenv("DIRECTORY_MAX_PAGES", "1000"))
+
+# Optional on-disk store of upstream responses (directories, event types) for warm restarts; empty disables
+PERSISTENT_CACHE_PATH = os.getenv("PERSISTENT_CACHE_PATH", "")
+# Stored responses are served without revalidation for at most as long as the in-memory caches keep them
+PERSISTENT_CACHE_TTL = float(os.getenv("PERSISTENT_CACHE_TTL", "300"))
+PERSISTENT_CACHE_RETENTION = float(os.getenv("PERSISTENT_CACHE_RETENTION", str(7 * 24 * 3600)))
+# Entries mirrored in memory; least recently used ones beyond this are re-read from the file on demand
+PERSISTENT_CACHE_MAX_SIZE = int(os.getenv("PERSISTENT_CACHE_MAX_SIZE", "10000"))
+
+# Organization directory cache (member lists, organizations, token owner)
+DIRECTORY_CACHE_TTL = float(os.getenv("DIRECTORY_CACHE_TTL", "300"))
+DIRECTORY_CACHE_MAX_SIZE = int(os.getenv("DIRECTORY_CACHE_MAX_SIZE", "256"))
+
+# Per-user booking links cache
+EVENT_TYPE_CACHE_TTL = float(os.getenv("EVENT_TYPE_CACHE_TTL", "300"))
+EVENT_TYPE_CACHE_MAX_SIZE = int(os.getenv("EVENT_TYPE_CACHE_MAX_SIZE", "10000"))
+
+# Identical concurrent searches share one upstream search; results are reused for this many seconds after it completes
+SEARCH_MEMO_TTL = float(os.getenv("SEARCH_MEMO_TTL", "5"))
+SEARCH_MEMO_MAX_SIZE = int(os.getenv("SEARCH_MEMO_MAX_SIZE", "1024"))
+
+# Seconds after expiry during which cached entries are still served while they refresh
+CACHE_STALE_TTL = float(os.getenv("CACHE_STALE_TTL", "600"))
+
+# Background refresh of hot cache entries (interval 0 disables)
+REFRESH_INTERVAL = float(os.getenv("REFRESH_INTERVAL", "30"))
+REFRESH_AHEAD = float(os.getenv("REFRESH_AHEAD", "60"))
+REFRESH_MAX_PER_CYCLE = int(os.getenv("REFRESH_MAX_PER_CYCLE", "20"))
+REFRESH_BUDGET_SHARE = float(os.getenv("REFRESH_BUDGET_SHARE", "0.2"))
+
+# Maximum number of queries accepted by batch_search_scheduling_links
+BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "100"))
+
+# Default and maximum page size of list_company_scheduling_links
+COMPANY_LIST_PAGE_SIZE = int(os.getenv("COMPANY_LIST_PAGE_SIZE", "25"))
+COMPANY_LIST_MAX_PAGE_SIZE = int(os.getenv("COMPANY_LIST_MAX_PAGE_SIZE", "100"))
+
+# Maximum number of per-user event-type requests in flight for a single search
+EVENT_TYPE_CONCURRENCY = int(os.getenv("EVENT_TYPE_CONCURRENCY", "8"))
+
+# Open slots returned with include_availability: default and maximum days ahead, and slots kept per event type
+AVAILABILITY_DAYS = int(os.getenv("AVAILABILITY_DAYS", "7"))
+AVAILABILITY_MAX_DAYS = int(os.getenv("AVAILABILITY_MAX_DAYS", "14"))
+AVAILABILITY_MAX_SLOTS = int(os.getenv("AVAILABILITY_MAX_SLOTS", "10"))
+
+# Per-event-type open slots cache; kept short because slots are booked continuously
+AVAILABILITY_CACHE_TTL = float(os.getenv("AVAILABILITY_CACHE_TTL", "60"))
+AVAILABILITY_CACHE_MAX_SIZE = int(os.getenv("AVAILABILITY_CACHE_MAX_SIZE", "10000"))
+
+# Admission control for tool calls: maximum in flight per tool and per client token in each worker (0 disables)
+TOOL_MAX_IN_FLIGHT = int(os.getenv("TOOL_MAX_IN_FLIGHT", "32"))
+TOKEN_MAX_IN_FLIGHT = int(os.getenv("TOKEN_MAX_IN_FLIGHT", "8"))
+# Per-tool limits overriding TOOL_MAX_IN_FLIGHT: comma-separated "tool:limit" entries
+TOOL_MAX_IN_FLIGHT_OVERRIDES = os.getenv("TOOL_MAX_IN_FLIGHT_OVERRIDES", "batch_search_scheduling_links:8")
+# Calls that may wait for a slot in each per-tool and per-token queue, and seconds they may wait
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "64"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "5"))
+# Cheap tools that are never queued or rejected
+ADMISSION_EXEMPT_TOOLS = os.getenv(
+    "ADMISSION_EXEMPT_TOOLS", "validate,get_server_info,get_scheduling_config,get_performance_stats"
+)
+
 
 class RichToolDescription(BaseModel):
     description: str
@@ -35,283 +226,3725 @@ class RichToolDescription(BaseModel):
     side_effects: str | None
 
 
-class SimpleBearerAuthProvider(BearerAuthProvider):
+# Fields of a search result that can be selected with the `fields` tool parameter
+RESULT_FIELDS = ("name", "email", "company", "bookingLinks", "availability", "platforms")
+
+
+def encode_json(data: Any, compact: bool = False) -> str:
+    """Serialize a tool response: indented by default, minified when compact"""
+    if not compact:
+        return json.dumps(data, indent=2)
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(",", ":"))
+
+
+def parse_fields(fields: str) -> Tuple[str, ...] | None:
+    """Parse a comma-separated `fields` parameter; None means all fields"""
+    selected = tuple(field.strip() for field in fields.split(",") if field.strip())
+    if not selected:
+        return None
+    unknown = [field for field in selected if field not in RESULT_FIELDS]
+    if unknown:
+        raise McpError(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message=f"Unknown field(s) {', '.join(unknown)}; choose from {', '.join(RESULT_FIELDS)}"
+            )
+        )
+    return selected
+
+
+def project(result: Dict[str, Any], fields: Tuple[str, ...] | None) -> Dict[str, Any]:
+    """Keep only the selected fields of a search result"""
+    if fields is None:
+        return result
+    return {field: result[field] for field in fields if field in result}
+
+
+class TokenRegistry:
+    """
+    Accepted MCP bearer tokens, stored as SHA-256 digests mapped to prebuilt AccessTokens.
+
+    Tokens come from MCP_BEARER_TOKEN, MCP_BEARER_TOKENS and MCP_BEARER_TOKENS_FILE. Each
+    entry is "client_id:token" or a bare token. The file is reloaded when it changes.
+    A fallback token is accepted only while neither MCP_BEARER_TOKEN, MCP_BEARER_TOKENS nor
+    a token file is configured, so configuring real tokens retires it.
+    """
+
+    # Minimum seconds between checks of the token file for changes
+    RELOAD_CHECK_INTERVAL = 5.0
+
+    def __init__(self, default_token: str = "", tokens: str = "", path: str = "", fallback_token: str = ""):
+        self.default_token = default_token
+        self.tokens = tokens
+        self.path = path
+        self.fallback_token = fallback_token
+        self._entries: Dict[bytes, AccessToken] = {}
+        self._file_mtime: float | None = None
+        self._checked_at = 0.0
+        self.accepted = 0
+        self.rejected = 0
+        self.reload()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    @staticmethod
+    def parse_entry(entry: str, default_client_id: str) -> Tuple[str, str] | None:
+        """Split an entry into (client_id, token); None for blank lines and comments"""
+        entry = entry.strip()
+        if not entry or entry.startswith("#"):
+            return None
+        client_id, separator, token = entry.partition(":")
+        if not separator:
+            return default_client_id, entry
+        return client_id.strip() or default_client_id, token.strip()
+
+    def _file_entries(self) -> List[str]:
+        if not self.path:
+            return []
+        try:
+            self._file_mtime = os.stat(self.path).st_mtime
+            with open(self.path) as f:
+                return f.read().splitlines()
+        except OSError as e:
+            print(f"Warning: Could not read bearer tokens from {self.path}: {e}")
+            self._file_mtime = None
+            return []
+
+    def reload(self) -> None:
+        """Rebuild the digest table from the environment and the token file"""
+        entries: Dict[bytes, AccessToken] = {}
+        sources = [("default", [self.default_token]), ("env", self.tokens.split(",")), ("file", self._file_entries())]
+        if self.using_fallback:
+            sources.append(("default", [self.fallback_token]))
+        for default_client_id, lines in sources:
+            for line in lines:
+                parsed = self.parse_entry(line, default_client_id)
+                if parsed is None or not parsed[1]:
+                    continue
+                client_id, token = parsed
+                entries[self.digest(token)] = AccessToken(token=token, client_id=client_id, scopes=[], expires_at=None)
+        self._entries = entries
+        self._checked_at = time.monotonic()
+
+    def _reload_if_changed(self) -> None:
+        if not self.path or time.monotonic() - self._checked_at < self.RELOAD_CHECK_INTERVAL:
+            return
+        self._checked_at = time.monotonic()
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != self._file_mtime:
+            self.reload()
+
+    def lookup(self, token: str) -> AccessToken | None:
+        """Return the cached AccessToken for a presented token, or None"""
+        self._reload_if_changed()
+        # Keyed by digest, so lookup time says nothing about how much of a presented token matched
+        access_token = self._entries.get(self.digest(token))
+        if access_token is None:
+            self.rejected += 1
+            return None
+        self.accepted += 1
+        return access_token
+
+    @property
+    def using_fallback(self) -> bool:
+        """Whether the fallback token is accepted because no other token source is configured"""
+        # Decided by configuration, not by the file's contents, so emptying the file can't re-enable it
+        return bool(self.fallback_token) and not (self.default_token or self.tokens.strip() or self.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tokens": len(self._entries),
+            "token_file": self.path or None,
+            "default_token": self.using_fallback,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+        }
+
+
+class SimpleBearerAuthProvider(OAuthProvider, TokenVerifier):
     """
-    A simple BearerAuthProvider that does not require any specific configuration.
-    It allows any valid bearer token to access the MCP server.
+    A bearer-only auth provider that accepts the opaque tokens held in a TokenRegistry.
+    Tokens are looked up rather than verified as JWTs, and none of the OAuth server
+    flows are supported.
     """
 
-    def __init__(self, token: str):
-        k = RSAKeyPair.generate()
+    def __init__(self, registry: TokenRegistry):
         super().__init__(
-            public_key=k.public_key, jwks_uri=None, issuer=None, audience=None
+            issuer_url="https://fastmcp.example.com",
+            client_registration_options=ClientRegistrationOptions(enabled=False),
+            revocation_options=RevocationOptions(enabled=False),
         )
-        self.token = token
+        self.registry = registry
 
     async def load_access_token(self, token: str) -> AccessToken | None:
-        if token == self.token:
-            return AccessToken(
-                token=token,
-                client_id="unknown",
-                scopes=[],
-                expires_at=None,  # No expiration for simplicity
+        return self.registry.lookup(token)
+
+    async def verify_token(self, token: str) -> AccessToken | None:
+        return await self.load_access_token(token)
+
+    # --- Unused OAuth server methods ---
+    async def get_client(self, client_id: str) -> OAuthClientInformationFull | None:
+        raise NotImplementedError("Client management not supported")
+
+    async def register_client(self, client_info: OAuthClientInformationFull) -> None:
+        raise NotImplementedError("Client registration not supported")
+
+    async def authorize(self, client: OAuthClientInformationFull, params: AuthorizationParams) -> str:
+        raise NotImplementedError("Authorization flow not supported")
+
+    async def load_authorization_code(self, client: OAuthClientInformationFull,
+                                      authorization_code: str) -> AuthorizationCode | None:
+        raise NotImplementedError("Authorization code flow not supported")
+
+    async def exchange_authorization_code(self, client: OAuthClientInformationFull,
+                                          authorization_code: AuthorizationCode) -> OAuthToken:
+        raise NotImplementedError("Authorization code exchange not supported")
+
+    async def load_refresh_token(self, client: OAuthClientInformationFull, refresh_token: str) -> RefreshToken | None:
+        raise NotImplementedError("Refresh token flow not supported")
+
+    async def exchange_refresh_token(self, client: OAuthClientInformationFull, refresh_token: RefreshToken,
+                                     scopes: List[str]) -> OAuthToken:
+        raise NotImplementedError("Refresh token exchange not supported")
+
+    async def revoke_token(self, token: AccessToken | RefreshToken) -> None:
+        raise NotImplementedError("Token revocation not supported")
+
+
+@functools.lru_cache(maxsize=256)
+def hash_credential(credential: str) -> str:
+    """Return a short, non-reversible fingerprint of an API credential"""
+    return hashlib.sha256(credential.encode("utf-8")).hexdigest()[:16]
+
+
+class MetricsRegistry:
+    """Minimal Prometheus text-format registry; recording is a no-op while disabled"""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._metrics: List[Any] = []
+
+    def register(self, metric: Any) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, registry: MetricsRegistry, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple, float] = {}
+        registry.register(self)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if not self.registry.enabled:
+            return
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(tuple(zip(self.labelnames, key)))} {value}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are read from a callback at scrape time"""
+
+    def __init__(self, registry: MetricsRegistry, name: str, documentation: str,
+                 labelnames: Tuple[str, ...], callback: Callable[[], Dict[Tuple, float]]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.callback = callback
+        registry.register(self)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for key, value in self.callback().items():
+            lines.append(f"{self.name}{_format_labels(tuple(zip(self.labelnames, key)))} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels"""
+
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+    COUNT_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+    def __init__(self, registry: MetricsRegistry, name: str, documentation: str,
+                 labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, List[float]] = {}
+        registry.register(self)
+
+    def observe(self, value: float, **labels: str) -> None:
+        if not self.registry.enabled:
+            return
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            # One slot per bucket, then sum and count
+            series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, series in self._series.items():
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0.0
+            for index, bound in enumerate(self.buckets):
+                cumulative += series[index]
+                lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', repr(float(bound))),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {series[-1]}")
+        return lines
+
+
+metrics = MetricsRegistry()
+
+TOOL_DURATION = Histogram(
+    metrics, "mcp_tool_duration_seconds", "Latency of MCP tool invocations", ("tool", "status")
+)
+UPSTREAM_DURATION = Histogram(
+    metrics, "upstream_request_duration_seconds",
+    "Latency of upstream HTTP calls including the response body", ("platform", "endpoint", "status")
+)
+UPSTREAM_RESPONSE_BYTES = Histogram(
+    metrics, "upstream_response_bytes", "Bytes received per upstream HTTP call",
+    ("platform", "endpoint"), Histogram.SIZE_BUCKETS
+)
+USERS_SCANNED = Histogram(
+    metrics, "directory_users_scanned", "Directory members examined per search",
+    ("platform",), Histogram.COUNT_BUCKETS
+)
+USERS_MATCHED = Histogram(
+    metrics, "directory_users_matched", "Directory members matched per search",
+    ("platform",), Histogram.COUNT_BUCKETS
+)
+CACHE_REQUESTS = Counter(
+    metrics, "cache_requests_total", "Cache lookups by outcome (hit, miss, coalesced)", ("cache", "outcome")
+)
+ADMISSION_WAIT = Histogram(
+    metrics, "mcp_admission_wait_seconds", "Time tool calls spent queued for an admission slot", ("tool",)
+)
+ADMISSION_REJECTED = Counter(
+    metrics, "mcp_admission_rejected_total", "Tool calls rejected by admission control", ("tool", "reason")
+)
+
+
+def endpoint_template(path: str) -> str:
+    """Collapse ID-like path segments so metrics are grouped per endpoint, e.g. /v2/organizations/{id}/users"""
+    return "/".join(
+        "{id}" if any(char.isdigit() for char in segment) and not re.fullmatch(r"v\d+", segment) else segment
+        for segment in path.split("/")
+    )
+
+
+# Tracing: each traced tool call records a tree of spans, the innermost span of the current task
+SPAN_INTERNAL = 1
+SPAN_SERVER = 2
+SPAN_CLIENT = 3
+current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ("trace", "name", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: str, kind: int, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def child(self, name: str, kind: int = SPAN_INTERNAL, **attributes: Any) -> "Span | None":
+        """Start a span under this one without making it the current span"""
+        return self.trace.start(name, self.span_id, kind, attributes)
+
+    def end(self, error: str | None = None) -> None:
+        if self.end_ns:
+            return
+        self.end_ns = time.perf_counter_ns()
+        if error is not None:
+            self.error = error
+
+
+class Trace:
+    """The spans of one tool call, with its OTLP JSON and slow-log renderings"""
+
+    __slots__ = ("trace_id", "spans", "max_spans", "dropped", "finished", "started_unix_ns", "started_ns")
+
+    def __init__(self, max_spans: int):
+        self.trace_id = f"{random.getrandbits(128):032x}"
+        self.spans: List[Span] = []
+        self.max_spans = max_spans
+        self.dropped = 0
+        self.finished = False
+        # Span times come from the monotonic clock and are shifted to wall-clock time on export
+        self.started_unix_ns = time.time_ns()
+        self.started_ns = time.perf_counter_ns()
+
+    def start(self, name: str, parent_id: str, kind: int, attributes: Dict[str, Any]) -> Span | None:
+        """Record a new span, or return None once the trace is finished or full"""
+        if self.finished:
+            return None
+        if len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return None
+        span = Span(self, name, parent_id, kind, attributes)
+        self.spans.append(span)
+        return span
+
+    @staticmethod
+    def otlp_value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def to_otlp(self, service_name: str = "scheduling-mcp-server") -> Dict[str, Any]:
+        """Render the trace as an OTLP/JSON ExportTraceServiceRequest"""
+        offset = self.started_unix_ns - self.started_ns
+        spans = []
+        for span in self.spans:
+            entry = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": span.kind,
+                "startTimeUnixNano": str(span.start_ns + offset),
+                "endTimeUnixNano": str((span.end_ns or span.start_ns) + offset),
+                "attributes": [{"key": key, "value": self.otlp_value(value)} for key, value in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error is not None else {"code": 1},
+            }
+            if span.parent_id:
+                entry["parentSpanId"] = span.parent_id
+            spans.append(entry)
+        return {"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": service_name}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]},
+            "scopeSpans": [{"scope": {"name": "scheduling_mcp_server"}, "spans": spans}],
+        }]}
+
+    def render(self) -> str:
+        """Indented span tree with each span's start offset and duration in milliseconds"""
+        children: Dict[str, List[Span]] = {}
+        for span in self.spans:
+            children.setdefault(span.parent_id, []).append(span)
+        root_start = self.spans[0].start_ns if self.spans else self.started_ns
+        lines = []
+
+        def walk(span: Span, depth: int) -> None:
+            duration = ((span.end_ns or span.start_ns) - span.start_ns) / 1e6
+            details = " ".join(f"{key}={value}" for key, value in span.attributes.items())
+            if span.error is not None:
+                details = f"{details} error={span.error!r}".strip()
+            lines.append(
+                f"{'  ' * depth}{span.name}  +{(span.start_ns - root_start) / 1e6:.1f}ms  {duration:.1f}ms  {details}".rstrip()
             )
-        return None
+            for child in sorted(children.get(span.span_id, ()), key=lambda child: child.start_ns):
+                walk(child, depth + 1)
 
+        for root in children.get("", ()):
+            walk(root, 1)
+        if self.dropped:
+            lines.append(f"  ({self.dropped} more spans dropped past TRACE_MAX_SPANS)")
+        return "\n".join(lines)
 
-class SchedulingAPI:
+
+class Tracer:
     """
-    Handles API interactions with Cal.com and Calendly platforms
+    Opt-in per-request tracing. A sampled tool call gets a trace whose root span is the
+    current span of its task; code phases add child spans with span(), and upstream HTTP
+    calls are traced through httpx event hooks plus httpcore's trace extension, which
+    reports connect (DNS + TCP), TLS, request, time to response headers and body download.
+    Untraced calls only pay for a context variable lookup.
     """
-    
-    @staticmethod
-    def extract_domain(company: str) -> str:
-        """Extract domain from company name for email matching"""
-        # Simple heuristic: convert "Acme Corp" -> "acme.com"
-        domain = company.lower()
-        domain = re.sub(r'\s+(corp|inc|llc|ltd|company|co)\.?$', '', domain, flags=re.IGNORECASE)
-        domain = re.sub(r'\s+', '', domain)
-        domain = re.sub(r'[^a-z0-9]', '', domain)
-        return f"{domain}.com"
-    
-    @staticmethod
-    def match_name(search_name: str, user_name: str, user_email: str) -> bool:
-        """Check if the search name matches the user's name or email"""
-        search_words = search_name.lower().split()
-        user_name_lower = (user_name or "").lower()
-        user_email_lower = (user_email or "").lower()
-        
-        return all(
-            word in user_name_lower or word in user_email_lower
-            for word in search_words
+
+    # httpcore events not worth a span of their own
+    IGNORED_EVENTS = ("response_closed", "send_request_body", "send_connection_init")
+
+    def __init__(self, enabled: bool = TRACING_ENABLED, sample_rate: float = TRACE_SAMPLE_RATE,
+                 export_path: str = TRACE_EXPORT_PATH, slow_seconds: float = SLOW_REQUEST_SECONDS,
+                 max_spans: int = TRACE_MAX_SPANS):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.export_path = export_path
+        self.slow_seconds = slow_seconds
+        self.max_spans = max(1, max_spans)
+        self.traces = 0
+        self.spans = 0
+        self.dropped_spans = 0
+        self.slow_requests = 0
+        self.exported = 0
+        self.export_errors = 0
+
+    @contextmanager
+    def trace(self, name: str, kind: int = SPAN_SERVER, **attributes: Any) -> Iterator[Span | None]:
+        """Trace the enclosed call when tracing is enabled and it is sampled"""
+        if not self.enabled or current_span.get() is not None or random.random() >= self.sample_rate:
+            yield None
+            return
+        trace = Trace(self.max_spans)
+        root = trace.start(name, "", kind, attributes)
+        token = current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.end(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            current_span.reset(token)
+            root.end()
+            self.finish(trace)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Time the enclosed block as a child of the current span; a no-op outside a trace"""
+        parent = current_span.get()
+        span = parent.child(name, **attributes) if parent is not None else None
+        if span is None:
+            yield None
+            return
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.end(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            current_span.reset(token)
+            span.end()
+
+    async def on_request(self, request: httpx.Request) -> None:
+        """httpx request hook: open a client span and subscribe to httpcore's connection events"""
+        parent = current_span.get()
+        if parent is None:
+            return
+        span = parent.child(
+            f"{request.method} {endpoint_template(request.url.path)}", SPAN_CLIENT,
+            **{"http.request.method": request.method, "server.address": request.url.host, "url.path": request.url.path},
         )
-    
-    @staticmethod
-    def match_company(search_company: str, user_email: str, user_company: str = None) -> bool:
-        """Check if the search company matches the user's company or email domain"""
-        expected_domain = SchedulingAPI.extract_domain(search_company)
-        email_domain_match = expected_domain.lower() in (user_email or "").lower()
-        
-        if user_company:
-            company_match = search_company.lower() in user_company.lower()
-            return email_domain_match or company_match
-        
-        return email_domain_match
+        if span is None:
+            return
+        request.extensions["trace_span"] = span
+        phases: Dict[str, List[Span]] = {}
 
-    @classmethod
-    async def search_calcom(cls, name: str, company: str, org_id: str, api_key: str = None) -> List[Dict[str, Any]]:
-        """Search Cal.com for users matching name and company"""
-        used_api_key = api_key or CALCOM_API_KEY
-        
-        if not used_api_key:
-            raise McpError(
-                ErrorData(
-                    code=INTERNAL_ERROR,
-                    message="Cal.com API key not provided. Either set CALCOM_API_KEY environment variable or pass api_key parameter."
-                )
-            )
-        
-        if not org_id:
-            raise McpError(
-                ErrorData(
-                    code=INVALID_PARAMS,
-                    message="Organization ID is required for Cal.com API calls"
-                )
-            )
+        async def on_event(event: str, info: Dict[str, Any]) -> None:
+            phase, _, state = event.rpartition(".")
+            if phase.endswith(self.IGNORED_EVENTS):
+                return
+            if state == "started":
+                child = span.child(phase)
+                if child is not None:
+                    phases.setdefault(phase, []).append(child)
+            elif phases.get(phase):
+                # A hedged request runs the same phases twice; match them up in order
+                child = phases[phase].pop(0)
+                child.end(str(info["exception"]) if state == "failed" else None)
 
-        async with httpx.AsyncClient() as client:
-            try:
-                # Get organization users
-                users_response = await client.get(
-                    f"https://api.cal.com/v2/organizations/{org_id}/users",
-                    headers={
-                        "Authorization": f"Bearer {used_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    timeout=30
-                )
-                
-                if users_response.status_code >= 400:
-                    raise McpError(
-                        ErrorData(
-                            code=INTERNAL_ERROR,
-                            message=f"Cal.com API error: {users_response.status_code} - {users_response.text}"
-                        )
-                    )
+        request.extensions["trace"] = on_event
 
-                users_data = users_response.json()
-                users = users_data.get("data", [])
-
-                # Filter users by name and company
-                matched_users = []
-                for user in users:
-                    if (cls.match_name(name, user.get("name"), user.get("email")) and
-                        cls.match_company(company, user.get("email"), user.get("metadata", {}).get("company"))):
-                        matched_users.append(user)
-
-                # Get event types for each matched user
-                results = []
-                for user in matched_users:
-                    try:
-                        event_types_response = await client.get(
-                            f"https://api.cal.com/v2/event-types?userId={user.get('id')}",
-                            headers={
-                                "Authorization": f"Bearer {used_api_key}",
-                                "Content-Type": "application/json"
-                            },
-                            timeout=30
-                        )
+    async def on_response(self, response: httpx.Response) -> None:
+        """httpx response hook: close the client span opened by on_request"""
+        span = response.request.extensions.get("trace_span")
+        if span is None:
+            return
+        span.set(**{"http.response.status_code": response.status_code})
+        if "content-length" in response.headers:
+            span.set(**{"http.response.body.size": int(response.headers["content-length"])})
+        span.end(f"HTTP {response.status_code}" if response.status_code >= 500 else None)
 
-                        if event_types_response.status_code == 200:
-                            event_types_data = event_types_response.json()
-                            event_types = event_types_data.get("data", [])
-                            
-                            # Generate booking links
-                            booking_links = []
-                            for event_type in event_types:
-                                if event_type.get("slug") and not event_type.get("hidden"):
-                                    link = f"https://cal.com/{user.get('username', 'user')}/{event_type['slug']}"
-                                    booking_links.append(link)
-
-                            results.append({
-                                "name": user.get("name", "Unknown"),
-                                "email": user.get("email", ""),
-                                "company": user.get("metadata", {}).get("company", company),
-                                "bookingLinks": booking_links
-                            })
-                    except Exception as e:
-                        # Continue with other users if one fails
-                        print(f"Warning: Failed to fetch event types for user {user.get('id')}: {e}")
-                        continue
-
-                return results
-
-            except httpx.HTTPError as e:
-                raise McpError(
-                    ErrorData(
-                        code=INTERNAL_ERROR,
-                        message=f"Cal.com API request failed: {str(e)}"
-                    )
-                )
+    def finish(self, trace: Trace) -> None:
+        """Close the trace, then export it and log its span tree if it was slow"""
+        trace.finished = True
+        for span in trace.spans:
+            # Requests that raised never reached the response hook
+            span.end("did not complete")
+        self.traces += 1
+        self.spans += len(trace.spans)
+        self.dropped_spans += trace.dropped
 
-    @classmethod
-    async def search_calendly(cls, name: str, company: str, pat: str = None) -> List[Dict[str, Any]]:
-        """Search Calendly for users matching name and company"""
-        used_pat = pat or CALENDLY_PAT
-        
-        if not used_pat:
-            raise McpError(
-                ErrorData(
-                    code=INTERNAL_ERROR,
-                    message="Calendly Personal Access Token not provided. Either set CALENDLY_PAT environment variable or pass pat parameter."
-                )
-            )
+        root = trace.spans[0]
+        duration = (root.end_ns - root.start_ns) / 1e9
+        if self.slow_seconds and duration >= self.slow_seconds:
+            self.slow_requests += 1
+            print(f"Warning: Slow request {root.name} took {duration:.2f}s (trace {trace.trace_id}):\n{trace.render()}")
 
-        async with httpx.AsyncClient() as client:
+        if self.export_path:
+            line = (json.dumps(trace.to_otlp(), separators=(",", ":")) + "\n").encode()
             try:
-                # Get current user info
-                user_response = await client.get(
-                    "https://api.calendly.com/users/me",
-                    headers={
-                        "Authorization": f"Bearer {used_pat}",
-                        "Content-Type": "application/json"
-                    },
-                    timeout=30
-                )
+                # One append-mode write per trace keeps lines whole when workers share the file
+                fd = os.open(self.export_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, line)
+                finally:
+                    os.close(fd)
+                self.exported += 1
+            except OSError as e:
+                self.export_errors += 1
+                print(f"Warning: Failed to export trace {trace.trace_id}: {e}")
 
-                if user_response.status_code >= 400:
-                    raise McpError(
-                        ErrorData(
-                            code=INTERNAL_ERROR,
-                            message=f"Calendly API error: {user_response.status_code} - {user_response.text}"
-                        )
-                    )
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "slow_request_seconds": self.slow_seconds,
+            "export_path": self.export_path or None,
+            "traces": self.traces,
+            "spans": self.spans,
+            "dropped_spans": self.dropped_spans,
+            "slow_requests": self.slow_requests,
+            "exported": self.exported,
+            "export_errors": self.export_errors,
+        }
 
-                user_data = user_response.json()
-                organization_uri = user_data["resource"]["current_organization"]
-
-                # Get organization memberships
-                memberships_response = await client.get(
-                    f"https://api.calendly.com/organization_memberships?organization={quote(organization_uri)}",
-                    headers={
-                        "Authorization": f"Bearer {used_pat}",
-                        "Content-Type": "application/json"
-                    },
-                    timeout=30
-                )
 
-                if memberships_response.status_code >= 400:
-                    raise McpError(
-                        ErrorData(
-                            code=INTERNAL_ERROR,
-                            message=f"Calendly memberships API error: {memberships_response.status_code}"
-                        )
-                    )
+tracer = Tracer()
 
-                memberships_data = memberships_response.json()
-                memberships = memberships_data.get("collection", [])
-
-                # Filter members by name and company
-                matched_members = []
-                for membership in memberships:
-                    user = membership.get("user", {})
-                    if (cls.match_name(name, user.get("name"), user.get("email")) and
-                        cls.match_company(company, user.get("email"))):
-                        matched_members.append(membership)
-
-                # Get event types for each matched member
-                results = []
-                for membership in matched_members:
-                    try:
-                        user_uri = membership["user"]["uri"]
-                        
-                        event_types_response = await client.get(
-                            f"https://api.calendly.com/event_types?user={quote(user_uri)}",
-                            headers={
-                                "Authorization": f"Bearer {used_pat}",
-                                "Content-Type": "application/json"
-                            },
-                            timeout=30
-                        )
 
-                        if event_types_response.status_code == 200:
-                            event_types_data = event_types_response.json()
-                            event_types = event_types_data.get("collection", [])
-                            
-                            # Generate booking links
-                            booking_links = []
-                            for event_type in event_types:
-                                if (event_type.get("scheduling_url") and 
-                                    event_type.get("active", False)):
-                                    booking_links.append(event_type["scheduling_url"])
-
-                            results.append({
-                                "name": membership["user"].get("name", "Unknown"),
-                                "email": membership["user"].get("email", ""),
-                                "company": company,  # Calendly doesn't store company info directly
-                                "bookingLinks": booking_links
-                            })
-                    except Exception as e:
-                        # Continue with other users if one fails
-                        print(f"Warning: Failed to fetch event types for user {membership['user']['uri']}: {e}")
-                        continue
-
-                return results
-
-            except httpx.HTTPError as e:
-                raise McpError(
-                    ErrorData(
-                        code=INTERNAL_ERROR,
-                        message=f"Calendly API request failed: {str(e)}"
-                    )
-                )
+async def gather_bounded(awaitables: List[Any], limit: int) -> List[Any]:
+    """Await all items concurrently with at most `limit` running at once, preserving input order"""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(awaitable):
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(run(awaitable) for awaitable in awaitables))
+
+
+async def collect_matches(items: AsyncIterator[Any], predicate: Callable[[Any], bool],
+                          max_results: int = None, platform: str = "") -> List[Any]:
+    """Consume items until exhausted or max_results matches are found, then stop fetching"""
+    matched = []
+    scanned = 0
+    async with aclosing(items):
+        async for item in items:
+            scanned += 1
+            if predicate(item):
+                matched.append(item)
+                if max_results and len(matched) >= max_results:
+                    break
+    USERS_SCANNED.observe(scanned, platform=platform)
+    USERS_MATCHED.observe(len(matched), platform=platform)
+    return matched
+
+
+# Scheduling priority of upstream requests made by the current task; lower values go first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+PRIORITY_BACKGROUND = 2
+request_priority: contextvars.ContextVar[int] = contextvars.ContextVar("request_priority", default=PRIORITY_INTERACTIVE)
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate` tokens per second"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available (0 if one is available now)"""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        if self.rate > 0:
+            self.tokens -= 1
+
+    def try_take(self, amount: float) -> bool:
+        """Take `amount` tokens if available; a full bucket may go into debt for large amounts"""
+        if self.rate <= 0:
+            return True
+        self._refill()
+        if self.tokens < min(amount, self.capacity):
+            return False
+        self.tokens -= amount
+        return True
+
+
+class _SchedulerLane:
+    """Waiting requests and rate-limit state for one platform credential"""
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self.dispatcher: asyncio.Task | None = None
+        self.blocked_until = 0.0
+        self.dispatched = 0
+        self.throttled = 0
+        self.throttle_seconds = 0.0
+        self.retries = 0
+        self.rate_limited = 0
+
+
+class RequestScheduler:
+    """
+    Admits upstream requests per platform credential.
+
+    Each credential has a token bucket and a priority queue, so interactive searches are
+    sent before bulk/batch work when the bucket runs dry. A 429 pauses the whole lane
+    until its Retry-After has passed.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        rates: Dict[str, Tuple[float, int]] = None,
+        max_retries: int = UPSTREAM_MAX_RETRIES,
+        backoff_base: float = UPSTREAM_BACKOFF_BASE,
+        backoff_max: float = UPSTREAM_BACKOFF_MAX,
+    ):
+        self.rates = rates if rates is not None else {
+            "calcom": (CALCOM_RATE_LIMIT_PER_SECOND, CALCOM_RATE_LIMIT_BURST),
+            "calendly": (CALENDLY_RATE_LIMIT_PER_SECOND, CALENDLY_RATE_LIMIT_BURST),
+        }
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lanes: Dict[Tuple[str, str], _SchedulerLane] = {}
+        self._sequence = itertools.count()
+
+    async def __aenter__(self) -> "RequestScheduler":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def share_rate_limits(self, workers: int) -> None:
+        """Give this process its share of each platform's limit when several workers call upstream"""
+        self.rates = {
+            platform: (rate / workers, max(1, burst // workers))
+            for platform, (rate, burst) in self.rates.items()
+        }
+
+    def _lane(self, key: Tuple[str, str]) -> _SchedulerLane:
+        lane = self._lanes.get(key)
+        if lane is None:
+            rate, burst = self.rates.get(key[0], (0.0, 1))
+            lane = self._lanes[key] = _SchedulerLane(TokenBucket(rate, burst))
+        return lane
+
+    def try_acquire(self, key: Tuple[str, str]) -> bool:
+        """Take a token only if nothing is queued and one is available right now"""
+        lane = self._lane(key)
+        if lane.waiters or lane.blocked_until > time.monotonic() or lane.bucket.delay() > 0:
+            return False
+        lane.bucket.take()
+        lane.dispatched += 1
+        return True
+
+    async def acquire(self, key: Tuple[str, str], priority: int = PRIORITY_INTERACTIVE) -> None:
+        """Wait until the credential's lane admits one request"""
+        if self.try_acquire(key):
+            # Fast path: nothing queued and a token is available
+            return
+
+        lane = self._lane(key)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(lane.waiters, (priority, next(self._sequence), time.monotonic(), future))
+        if lane.dispatcher is None or lane.dispatcher.done():
+            lane.dispatcher = asyncio.ensure_future(self._dispatch(lane))
+        await future
+
+    async def _dispatch(self, lane: _SchedulerLane) -> None:
+        while lane.waiters:
+            delay = max(lane.blocked_until - time.monotonic(), lane.bucket.delay())
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            _, _, enqueued_at, future = heapq.heappop(lane.waiters)
+            if future.done():
+                # The caller gave up while queued
+                continue
+
+            lane.bucket.take()
+            lane.dispatched += 1
+            lane.throttled += 1
+            lane.throttle_seconds += time.monotonic() - enqueued_at
+            future.set_result(None)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def retry_after(self, response: httpx.Response) -> float | None:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(self.backoff_max, max(0.0, seconds))
+
+    def record_retry(self, key: Tuple[str, str], status_code: int, delay: float) -> None:
+        lane = self._lane(key)
+        lane.retries += 1
+        if status_code == 429:
+            lane.rate_limited += 1
+            # Hold back every request on this credential, not just the one being retried
+            lane.blocked_until = max(lane.blocked_until, time.monotonic() + delay)
+
+    async def aclose(self) -> None:
+        for lane in self._lanes.values():
+            if lane.dispatcher is not None:
+                lane.dispatcher.cancel()
+            for _, _, _, future in lane.waiters:
+                future.cancel()
+        self._lanes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        lanes = []
+        for (platform, credential), lane in self._lanes.items():
+            lanes.append({
+                "platform": platform,
+                "credential": credential,
+                "queue_depth": len(lane.waiters),
+                "tokens_available": round(lane.bucket.tokens, 2) if lane.bucket.rate > 0 else None,
+                "blocked_for_seconds": round(max(0.0, lane.blocked_until - now), 3),
+                "dispatched": lane.dispatched,
+                "throttled": lane.throttled,
+                "throttle_seconds": round(lane.throttle_seconds, 3),
+                "retries": lane.retries,
+                "rate_limited": lane.rate_limited,
+            })
+
+        return {
+            "rates": {platform: {"per_second": rate, "burst": burst} for platform, (rate, burst) in self.rates.items()},
+            "max_retries": self.max_retries,
+            "queue_depth": sum(lane["queue_depth"] for lane in lanes),
+            "throttle_seconds": round(sum(lane["throttle_seconds"] for lane in lanes), 3),
+            "lanes": lanes,
+        }
+
+
+class ScheduledTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that admits each request through the RequestScheduler and retries
+    429/5xx responses with jittered exponential backoff
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, scheduler: RequestScheduler, key: Tuple[str, str]):
+        self.transport = transport
+        self.scheduler = scheduler
+        self.key = key
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        span = request.extensions.get("trace_span")
+        while True:
+            wait = span.child("rate_limit.wait", attempt=attempt) if span is not None else None
+            await self.scheduler.acquire(self.key, request_priority.get())
+            if wait is not None:
+                wait.end()
+            response = await self.transport.handle_async_request(request)
+
+            if response.status_code not in self.scheduler.RETRY_STATUSES or attempt >= self.scheduler.max_retries:
+                return response
+
+            delay = self.scheduler.retry_after(response)
+            if delay is None:
+                delay = self.scheduler.backoff(attempt)
+            await response.aclose()
+
+            self.scheduler.record_retry(self.key, response.status_code, delay)
+            if span is not None:
+                span.set(retries=attempt + 1)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+request_scheduler = RequestScheduler()
+
+Gauge(
+    metrics, "upstream_queue_depth", "Upstream requests waiting for a rate-limit token", ("platform",),
+    lambda: {
+        (platform,): sum(len(lane.waiters) for (lane_platform, _), lane in request_scheduler._lanes.items() if lane_platform == platform)
+        for platform in request_scheduler.rates
+    },
+)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of calling an upstream endpoint whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Outcomes and latencies of recent calls to one upstream endpoint. Opens when too many
+    calls fail or are slow, rejects calls while open, then lets one probe call through.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, window: int, min_calls: int, failure_ratio: float, slow_call_seconds: float,
+                 open_seconds: float, latency_samples: int = 100):
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.outcomes: deque = deque(maxlen=max(1, window))
+        self.latencies: deque = deque(maxlen=latency_samples)
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+        # Half-open: a single probe decides whether to close again
+        if self.probing:
+            self.rejected += 1
+            return False
+        self.probing = True
+        return True
+
+    def record(self, ok: bool, latency: float) -> None:
+        failed = not ok or latency > self.slow_call_seconds
+        if ok:
+            self.latencies.append(latency)
+        if self.state == self.HALF_OPEN:
+            self.probing = False
+            if failed:
+                self._open()
+            else:
+                self.state = self.CLOSED
+                self.outcomes.clear()
+            return
+
+        self.outcomes.append(failed)
+        if (self.state == self.CLOSED and len(self.outcomes) >= self.min_calls
+                and sum(self.outcomes) / len(self.outcomes) >= self.failure_ratio):
+            self._open()
+
+    def abandon(self) -> None:
+        """The caller gave up before an outcome was known"""
+        if self.state == self.HALF_OPEN:
+            self.probing = False
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def p95(self, min_samples: int) -> float | None:
+        """95th percentile of recent successful call latencies, once enough samples exist"""
+        if len(self.latencies) < min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "recent_failure_ratio": round(sum(self.outcomes) / len(self.outcomes), 3) if self.outcomes else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "p95_seconds": self.p95(1),
+        }
+
+
+class UpstreamGuard:
+    """Circuit breakers and hedging settings shared by every upstream client, per (platform, endpoint)"""
+
+    def __init__(
+        self,
+        total_timeout: float = UPSTREAM_TOTAL_TIMEOUT,
+        window: int = CIRCUIT_WINDOW,
+        min_calls: int = CIRCUIT_MIN_CALLS,
+        failure_ratio: float = CIRCUIT_FAILURE_RATIO,
+        slow_call_seconds: float = CIRCUIT_SLOW_CALL_SECONDS,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS,
+        hedging: bool = HEDGE_ENABLED,
+        hedge_min_samples: int = HEDGE_MIN_SAMPLES,
+        hedge_min_delay: float = HEDGE_MIN_DELAY,
+    ):
+        self.total_timeout = total_timeout or None
+        self.breakers_enabled = window > 0
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.hedging = hedging
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+
+    def breaker(self, platform: str, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get((platform, endpoint))
+        if breaker is None:
+            breaker = self._breakers[(platform, endpoint)] = CircuitBreaker(
+                self.window, self.min_calls, self.failure_ratio, self.slow_call_seconds, self.open_seconds
+            )
+        return breaker
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "total_timeout_seconds": self.total_timeout,
+            "circuit_breakers_enabled": self.breakers_enabled,
+            "hedging_enabled": self.hedging,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "endpoints": {
+                f"{platform} {endpoint}": breaker.stats() for (platform, endpoint), breaker in self._breakers.items()
+            },
+        }
+
+
+class GuardedTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that applies the UpstreamGuard to every attempt: fails fast while the
+    endpoint's circuit is open, enforces the total timeout (body included), and hedges
+    slow GETs when a rate-limit token is free
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, guard: UpstreamGuard, platform: str,
+                 scheduler: RequestScheduler | None = None, key: Tuple[str, str] | None = None):
+        self.transport = transport
+        self.guard = guard
+        self.platform = platform
+        self.scheduler = scheduler
+        self.key = key
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = endpoint_template(request.url.path)
+        breaker = self.guard.breaker(self.platform, endpoint)
+        if self.guard.breakers_enabled and not breaker.allow():
+            raise CircuitOpenError(
+                f"{self.platform} {endpoint} is failing; requests are paused for up to {breaker.open_seconds:g}s",
+                request=request,
+            )
+
+        started = time.monotonic()
+        ok = None
+        try:
+            response = await asyncio.wait_for(self._send(request, breaker), self.guard.total_timeout)
+            ok = response.status_code < 500
+            return response
+        except asyncio.TimeoutError:
+            ok = False
+            self.guard.timeouts += 1
+            raise httpx.TimeoutException(
+                f"Upstream request took longer than {self.guard.total_timeout:g}s", request=request
+            ) from None
+        except httpx.TransportError:
+            ok = False
+            raise
+        finally:
+            if ok is None:
+                breaker.abandon()
+            else:
+                breaker.record(ok, time.monotonic() - started)
+
+    async def _fetch(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        try:
+            # Read the body here so the total timeout and hedging cover the whole download
+            await response.aread()
+        except BaseException:
+            await response.aclose()
+            raise
+        return response
+
+    def _may_hedge(self) -> bool:
+        # A hedge is extra load, so it only goes out if it doesn't delay anyone else's request
+        return self.scheduler is None or self.scheduler.try_acquire(self.key)
+
+    async def _send(self, request: httpx.Request, breaker: CircuitBreaker) -> httpx.Response:
+        delay = breaker.p95(self.guard.hedge_min_samples) if self.guard.hedging and request.method == "GET" else None
+        if delay is None:
+            return await self._fetch(request)
+
+        primary = asyncio.ensure_future(self._fetch(request))
+        pending = {primary}
+        # Every copy still pending when this returns or is cancelled (total timeout, client gone) is cancelled
+        try:
+            done, _ = await asyncio.wait(pending, timeout=max(delay, self.guard.hedge_min_delay))
+            if done or not self._may_hedge():
+                return await primary
+
+            self.guard.hedges += 1
+            hedge = asyncio.ensure_future(self._fetch(request))
+            pending.add(hedge)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.guard.hedge_wins += 1
+                        return task.result()
+                if not pending:
+                    # Both copies failed; surface the error
+                    return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+upstream_guard = UpstreamGuard()
+
+Gauge(
+    metrics, "upstream_circuit_open", "1 while an upstream endpoint's circuit breaker is open", ("platform", "endpoint"),
+    lambda: {key: int(breaker.state == CircuitBreaker.OPEN) for key, breaker in upstream_guard._breakers.items()},
+)
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """Response body wrapper that counts bytes and reports once the body is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[int], None]):
+        self.stream = stream
+        self.on_close = on_close
+        self.received = 0
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            self.received += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+        if not self.closed:
+            self.closed = True
+            self.on_close(self.received)
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records latency and bytes received per upstream endpoint"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, platform: str):
+        self.transport = transport
+        self.platform = platform
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        endpoint = endpoint_template(request.url.path)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception as e:
+            UPSTREAM_DURATION.observe(
+                time.perf_counter() - started, platform=self.platform, endpoint=endpoint, status=type(e).__name__
+            )
+            raise
+
+        def record(received: int) -> None:
+            UPSTREAM_DURATION.observe(
+                time.perf_counter() - started, platform=self.platform, endpoint=endpoint, status=str(response.status_code)
+            )
+            UPSTREAM_RESPONSE_BYTES.observe(received, platform=self.platform, endpoint=endpoint)
+
+        response.stream = _MeteredStream(response.stream, record)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class PersistentStore:
+    """
+    SQLite-backed store of upstream GET responses with ETag/Last-Modified and TTL metadata.
+
+    The table is bulk-loaded into memory on first use (off the event loop) and written
+    through on every change. Expired entries are kept for PERSISTENT_CACHE_RETENTION
+    seconds so they can be revalidated with conditional requests instead of re-downloaded.
+    The in-memory mirror holds at most `max_size` entries in LRU order; once it has dropped
+    any, misses are looked up in the file. When `shared`, several processes use the same
+    file: misses and expired entries are re-read from disk first, since another process may
+    have fetched them already.
+    """
+
+    def __init__(self, path: str = PERSISTENT_CACHE_PATH, ttl: float = PERSISTENT_CACHE_TTL,
+                 retention: float = PERSISTENT_CACHE_RETENTION, shared: bool = False,
+                 max_size: int = PERSISTENT_CACHE_MAX_SIZE):
+        self.path = path
+        self.ttl = ttl
+        self.retention = retention
+        self.shared = shared
+        self.max_size = max(1, max_size)
+        self._entries: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        # Set once the file holds entries that are not mirrored in memory
+        self._spilled = False
+        self._connection: "sqlite3.Connection | None" = None
+        self._db_lock = threading.Lock()
+        self._load_task: asyncio.Task | None = None
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.refreshed = 0
+        self.misses = 0
+        self.writes = 0
+        self.shared_reads = 0
+        self.stale_if_error = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path) and self.ttl > 0
+
+    async def __aenter__(self) -> "PersistentStore":
+        if self.enabled:
+            # Start the bulk load in the background so it doesn't delay server startup
+            self._ensure_loaded()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _ensure_loaded(self) -> asyncio.Task:
+        if self._load_task is None:
+            self._load_task = asyncio.ensure_future(asyncio.to_thread(self._load_all))
+        return self._load_task
+
+    def _open(self) -> "sqlite3.Connection":
+        if self._connection is None:
+            # Imported here so servers without a persistent cache never load it
+            import sqlite3
+
+            # Wait for other processes' write locks instead of failing immediately
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    content_type TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+        return self._connection
+
+    def _load_all(self) -> None:
+        with self._db_lock:
+            connection = self._open()
+            connection.execute("DELETE FROM responses WHERE expires_at < ?", (time.time() - self.retention,))
+            connection.commit()
+            rows = connection.execute(
+                "SELECT key, body, content_type, etag, last_modified, stored_at, expires_at FROM ("
+                "SELECT * FROM responses ORDER BY stored_at DESC LIMIT ?) ORDER BY stored_at",
+                (self.max_size + 1,),
+            ).fetchall()
+
+        if len(rows) > self.max_size:
+            self._spilled = True
+            rows = rows[1:]
+        # Newest first, each moved in front of the last, so the oldest ends up least recently used
+        for row in reversed(rows):
+            # Entries written since startup are newer than what was on disk
+            if row[0] not in self._entries:
+                self._entries[row[0]] = self._row_entry(row)
+                self._entries.move_to_end(row[0], last=False)
+        self._evict()
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            self._spilled = True
+
+    @staticmethod
+    def _row_entry(row: Tuple) -> Dict[str, Any]:
+        _, body, content_type, etag, last_modified, stored_at, expires_at = row
+        return {
+            "body": body,
+            "content_type": content_type,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": stored_at,
+            "expires_at": expires_at,
+        }
+
+    def _read(self, key: str) -> Dict[str, Any] | None:
+        with self._db_lock:
+            row = self._open().execute(
+                "SELECT key, body, content_type, etag, last_modified, stored_at, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        return self._row_entry(row) if row is not None else None
+
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._db_lock:
+            connection = self._open()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, body, content_type, etag, last_modified, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, entry["body"], entry["content_type"], entry["etag"], entry["last_modified"],
+                 entry["stored_at"], entry["expires_at"]),
+            )
+            connection.commit()
+
+    async def get(self, key: str) -> Dict[str, Any] | None:
+        """Return the stored entry for key, fresh or stale, or None"""
+        await asyncio.shield(self._ensure_loaded())
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        if (self.shared and (entry is None or entry["expires_at"] <= time.time())) or (entry is None and self._spilled):
+            stored = await asyncio.to_thread(self._read, key)
+            if stored is not None and (entry is None or stored["expires_at"] > entry["expires_at"]):
+                if self.shared:
+                    self.shared_reads += 1
+                entry = stored
+                self._remember(key, entry)
+        return entry
+
+    async def put(self, key: str, body: bytes, content_type: str | None,
+                  etag: str | None, last_modified: str | None) -> Dict[str, Any]:
+        now = time.time()
+        entry = {
+            "body": body,
+            "content_type": content_type,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": now,
+            "expires_at": now + self.ttl,
+        }
+        self._remember(key, entry)
+        self.writes += 1
+        await asyncio.to_thread(self._write, key, entry)
+        return entry
+
+    async def touch(self, key: str, entry: Dict[str, Any]) -> None:
+        """Extend a revalidated entry's lifetime"""
+        entry["expires_at"] = time.time() + self.ttl
+        await asyncio.to_thread(self._write, key, entry)
+
+    async def aclose(self) -> None:
+        if self._load_task is not None and not self._load_task.done():
+            await asyncio.gather(self._load_task, return_exceptions=True)
+        with self._db_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "enabled": self.enabled,
+            "path": self.path or None,
+            "shared": self.shared,
+            "ttl_seconds": self.ttl,
+            "loaded": self._load_task is not None and self._load_task.done(),
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "evictions": self.evictions,
+            "fresh_entries": sum(1 for entry in self._entries.values() if entry["expires_at"] > now),
+            "fresh_hits": self.fresh_hits,
+            "revalidated": self.revalidated,
+            "refreshed": self.refreshed,
+            "misses": self.misses,
+            "writes": self.writes,
+            "shared_reads": self.shared_reads,
+            "stale_if_error": self.stale_if_error,
+        }
+
+
+class PersistentCacheTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that serves GETs from the PersistentStore while fresh, revalidates
+    stale entries with If-None-Match / If-Modified-Since, and falls back to the stored
+    copy when the upstream is failing (open circuit, timeout or 5xx)
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, store: PersistentStore, key_prefix: str):
+        self.transport = transport
+        self.store = store
+        self.key_prefix = key_prefix
+
+    @staticmethod
+    def _stored_response(request: httpx.Request, entry: Dict[str, Any]) -> httpx.Response:
+        headers = {
+            name: entry[field]
+            for name, field in (("Content-Type", "content_type"), ("ETag", "etag"), ("Last-Modified", "last_modified"))
+            if entry[field]
+        }
+        return httpx.Response(200, headers=headers, content=entry["body"], request=request)
+
+    def _stale_response(self, request: httpx.Request, entry: Dict[str, Any]) -> httpx.Response:
+        self.store.stale_if_error += 1
+        CACHE_REQUESTS.inc(cache="persistent", outcome="stale_if_error")
+        return self._stored_response(request, entry)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Requests whose URL changes on every call (slot windows) opt out, or they'd pile up unread
+        if request.method != "GET" or request.extensions.get("persistent_cache") is False:
+            return await self.transport.handle_async_request(request)
+
+        key = f"{self.key_prefix}:{request.url}"
+        entry = await self.store.get(key)
+        # A request with its own validators (an incremental directory sync) always asks upstream
+        conditional = "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
+        if entry is not None and not conditional and entry["expires_at"] > time.time():
+            self.store.fresh_hits += 1
+            CACHE_REQUESTS.inc(cache="persistent", outcome="hit")
+            return self._stored_response(request, entry)
+
+        if entry is not None:
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TransportError:
+            if entry is None:
+                raise
+            return self._stale_response(request, entry)
+
+        if entry is not None and response.status_code >= 500:
+            await response.aclose()
+            return self._stale_response(request, entry)
+
+        if entry is not None and response.status_code == 304:
+            await response.aclose()
+            self.store.revalidated += 1
+            CACHE_REQUESTS.inc(cache="persistent", outcome="revalidated")
+            await self.store.touch(key, entry)
+            return self._stored_response(request, entry)
+
+        if entry is None:
+            self.store.misses += 1
+            CACHE_REQUESTS.inc(cache="persistent", outcome="miss")
+        else:
+            self.store.refreshed += 1
+            CACHE_REQUESTS.inc(cache="persistent", outcome="refreshed")
+
+        if response.status_code != 200:
+            return response
+
+        # Decode once and store the plain body; the replayed response carries no content-encoding
+        body = await response.aread()
+        entry = await self.store.put(
+            key, body, response.headers.get("Content-Type"),
+            response.headers.get("ETag"), response.headers.get("Last-Modified"),
+        )
+        return self._stored_response(request, entry)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+persistent_store = PersistentStore()
+
+
+class HTTPClientPool:
+    """
+    Long-lived httpx clients shared across tool calls, one per platform and credential.
+    Reusing clients keeps TLS sessions and keep-alive connections warm between requests.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        http2: bool = HTTP2_ENABLED,
+        max_clients: int = HTTP_MAX_CLIENTS,
+        scheduler: RequestScheduler | None = None,
+        store: PersistentStore | None = None,
+        guard: UpstreamGuard | None = None,
+    ):
+        self.scheduler = scheduler
+        self.store = store
+        self.guard = guard
+        self.timeout = httpx.Timeout(
+            connect=UPSTREAM_CONNECT_TIMEOUT,
+            read=UPSTREAM_READ_TIMEOUT,
+            write=UPSTREAM_WRITE_TIMEOUT,
+            pool=UPSTREAM_POOL_TIMEOUT,
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and self._http2_available()
+        self.max_clients = max_clients
+        self._clients: Dict[Tuple[str, str], httpx.AsyncClient] = {}
+        self._transports: Dict[Tuple[str, str], httpx.AsyncHTTPTransport] = {}
+        self._request_counts: Dict[Tuple[str, str], int] = {}
+        self._closing: set = set()
+        # Evicted clients waiting out their grace period; aclose closes any that are left
+        self._retired: set = set()
+        self.clients_created = 0
+        self.clients_evicted = 0
+
+    @staticmethod
+    def _http2_available() -> bool:
+        # Only look the package up: httpx imports h2 itself when the first HTTP/2 connection is made
+        if importlib.util.find_spec("h2") is None:
+            print("Warning: HTTP2_ENABLED is set but the 'h2' package is not installed, using HTTP/1.1")
+            return False
+        return True
+
+    async def __aenter__(self) -> "HTTPClientPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def get_client(self, platform: str, credential: str) -> httpx.AsyncClient:
+        """Return the shared client for a platform/credential pair, creating it on first use"""
+        key = (platform, hash_credential(credential))
+        client = self._clients.pop(key, None)
+        if client is None or client.is_closed:
+            client = self._create_client(key, credential)
+        # Re-insert to keep the dict in least-recently-used order
+        self._clients[key] = client
+
+        while len(self._clients) > self.max_clients:
+            oldest_key = next(iter(self._clients))
+            self._retire(oldest_key)
+
+        return client
+
+    def _create_client(self, key: Tuple[str, str], credential: str) -> httpx.AsyncClient:
+        transport = httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+        self._transports[key] = transport
+        wrapped: httpx.AsyncBaseTransport = transport
+        if metrics.enabled:
+            wrapped = InstrumentedTransport(wrapped, key[0])
+        if self.guard is not None:
+            wrapped = GuardedTransport(wrapped, self.guard, key[0], self.scheduler, key)
+        if self.scheduler:
+            wrapped = ScheduledTransport(wrapped, self.scheduler, key)
+        if self.store is not None and self.store.enabled:
+            # Fresh hits skip the scheduler entirely; revalidations still count against the rate limit
+            wrapped = PersistentCacheTransport(wrapped, self.store, f"{key[0]}:{key[1]}")
+        self._request_counts.setdefault(key, 0)
+        self.clients_created += 1
+
+        async def count_request(request: httpx.Request) -> None:
+            self._request_counts[key] = self._request_counts.get(key, 0) + 1
+
+        event_hooks = {"request": [count_request], "response": []}
+        if tracer.enabled:
+            event_hooks["request"].append(tracer.on_request)
+            event_hooks["response"].append(tracer.on_response)
+
+        return httpx.AsyncClient(
+            transport=wrapped,
+            headers={
+                "Authorization": f"Bearer {credential}",
+                "Content-Type": "application/json"
+            },
+            event_hooks=event_hooks,
+            timeout=self.timeout,
+        )
+
+    def _retire(self, key: Tuple[str, str]) -> None:
+        client = self._clients.pop(key)
+        self._transports.pop(key, None)
+        self._request_counts.pop(key, None)
+        self.clients_evicted += 1
+        # Give in-flight requests on the evicted client time to finish before closing it
+        self._retired.add(client)
+        task = asyncio.ensure_future(self._close_later(client, delay=30))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_later(self, client: httpx.AsyncClient, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._retired.discard(client)
+        await client.aclose()
+
+    async def aclose(self) -> None:
+        """Close every pooled client and every retired one still in its grace period, e.g. when the server shuts down"""
+        for task in list(self._closing):
+            task.cancel()
+        clients = list(self._clients.values()) + list(self._retired)
+        self._retired.clear()
+        self._clients.clear()
+        self._transports.clear()
+        self._request_counts.clear()
+        await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool utilization per platform/credential client"""
+        clients = []
+        for key, transport in self._transports.items():
+            # httpcore keeps the live connection list on the transport's pool
+            connections = getattr(getattr(transport, "_pool", None), "connections", [])
+            idle = sum(1 for conn in connections if conn.is_idle())
+            clients.append({
+                "platform": key[0],
+                "credential": key[1],
+                "requests": self._request_counts.get(key, 0),
+                "connections": len(connections),
+                "active_connections": len(connections) - idle,
+                "idle_connections": idle,
+            })
+
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "max_clients": self.max_clients,
+            "clients_created": self.clients_created,
+            "clients_evicted": self.clients_evicted,
+            "clients": clients,
+        }
+
+
+client_pool = HTTPClientPool(scheduler=request_scheduler, store=persistent_store, guard=upstream_guard)
+
+
+def pooled(platform: str, credential: str, fetch: Callable[[httpx.AsyncClient], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+    """
+    Cache loader that takes the credential's client from the pool each time it runs. Loaders
+    are kept with cache entries and rerun by refreshes, possibly after the client a search
+    used has been evicted from the pool and closed.
+    """
+    return lambda: fetch(client_pool.get_client(platform, credential))
+
+
+class _CacheEntry:
+    __slots__ = ("value", "expires_at", "loader", "accesses")
+
+    def __init__(self, value: Any, expires_at: float, loader: Callable[[], Awaitable[Any]] | None):
+        self.value = value
+        self.expires_at = expires_at
+        self.loader = loader
+        self.accesses = 0
+
+
+class TTLCache:
+    """
+    In-process cache with per-entry TTL, LRU eviction and single-flight loading.
+    Concurrent misses for the same key share one upstream fetch. Within `stale_ttl`
+    seconds after expiry an entry is still served while it is reloaded in the background.
+    """
+
+    def __init__(self, name: str, ttl: float, max_size: int, stale_ttl: float = 0.0,
+                 cost: Callable[[Any], int] | None = None):
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stale_ttl = stale_ttl
+        self.cost = cost or (lambda value: 1)
+        self._entries: "OrderedDict[Tuple, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def _lookup(self, key: Tuple) -> _CacheEntry | None:
+        """Return the entry for key if it is fresh or still within its stale window"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at + self.stale_ttl <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        return entry
+
+    def get(self, key: Tuple) -> Any:
+        """Return a fresh cached value or None"""
+        entry = self._lookup(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def peek(self, key: Tuple) -> Any:
+        """Return the cached value even if it is stale, without counting a lookup"""
+        entry = self._lookup(key)
+        return entry.value if entry is not None else None
+
+    def set(self, key: Tuple, value: Any, loader: Callable[[], Awaitable[Any]] | None = None,
+            ttl: float | None = None) -> None:
+        """Store value for key; ttl overrides the cache's TTL for this entry"""
+        if not self.enabled:
+            return
+        previous = self._entries.get(key)
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        entry = _CacheEntry(value, time.monotonic() + ttl, loader or (previous.loader if previous else None))
+        if previous is not None:
+            entry.accesses = previous.accesses
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Tuple) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_load(self, key: Tuple, loader: Callable[[], Awaitable[Any]], ttl: float | None = None) -> Any:
+        """Return the cached value for key, calling loader once on a miss and keeping it for ttl seconds"""
+        entry = self._lookup(key)
+        if entry is not None:
+            entry.accesses += 1
+            entry.loader = loader
+            self._entries.move_to_end(key)
+            if entry.expires_at > time.monotonic():
+                self.hits += 1
+                CACHE_REQUESTS.inc(cache=self.name, outcome="hit")
+            else:
+                # Serve the stale value now and refresh it behind the caller's back
+                self.stale_hits += 1
+                CACHE_REQUESTS.inc(cache=self.name, outcome="stale")
+                self.refresh(key, loader, ttl)
+            return entry.value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            CACHE_REQUESTS.inc(cache=self.name, outcome="coalesced")
+        else:
+            self.misses += 1
+            CACHE_REQUESTS.inc(cache=self.name, outcome="miss")
+            task = self._start_load(key, loader, ttl)
+
+        # Shield the shared load so one cancelled caller doesn't abort it for the others
+        return await asyncio.shield(task)
+
+    def refresh(self, key: Tuple, loader: Callable[[], Awaitable[Any]], ttl: float | None = None) -> asyncio.Task:
+        """Reload key in the background, joining a load that is already running"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_load(key, loader, ttl)
+            # Nobody may await a background refresh; mark its failure as handled
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return task
+
+    def _start_load(self, key: Tuple, loader: Callable[[], Awaitable[Any]], ttl: float | None = None) -> asyncio.Task:
+        task = asyncio.ensure_future(self._load(key, loader, ttl))
+        self._inflight[key] = task
+        return task
+
+    async def _load(self, key: Tuple, loader: Callable[[], Awaitable[Any]], ttl: float | None = None) -> Any:
+        try:
+            value = await loader()
+            self.set(key, value, loader, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def hot_entries(self, refresh_ahead: float) -> List[Tuple[Tuple, _CacheEntry]]:
+        """Entries that were used recently and expire within refresh_ahead seconds, hottest first"""
+        deadline = time.monotonic() + refresh_ahead
+        entries = [
+            (key, entry) for key, entry in self._entries.items()
+            if entry.accesses > 0 and entry.loader is not None
+            and entry.expires_at <= deadline and key not in self._inflight
+        ]
+        entries.sort(key=lambda item: item[1].accesses, reverse=True)
+        return entries
+
+    def decay_accesses(self) -> None:
+        """Halve access counts so hotness reflects recent traffic"""
+        for entry in self._entries.values():
+            entry.accesses //= 2
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "in_flight": len(self._inflight),
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+directory_cache = TTLCache(
+    "directory", DIRECTORY_CACHE_TTL, DIRECTORY_CACHE_MAX_SIZE, CACHE_STALE_TTL,
+    # Refreshing a directory costs roughly one request per page
+    cost=lambda value: (
+        1 + len(value) // max(1, min(CALCOM_PAGE_SIZE, CALENDLY_PAGE_SIZE)) if isinstance(value, DirectoryIndex) else 1
+    ),
+)
+event_type_cache = TTLCache("event_types", EVENT_TYPE_CACHE_TTL, EVENT_TYPE_CACHE_MAX_SIZE, CACHE_STALE_TTL)
+# Coalesces in-flight searches even when the memo window is 0, since single-flight doesn't depend on the TTL
+search_memo = TTLCache("search", SEARCH_MEMO_TTL, SEARCH_MEMO_MAX_SIZE)
+availability_cache = TTLCache("availability", AVAILABILITY_CACHE_TTL, AVAILABILITY_CACHE_MAX_SIZE)
+
+Gauge(
+    metrics, "cache_entries", "Entries currently held per cache", ("cache",),
+    lambda: {(cache.name,): len(cache._entries) for cache in (directory_cache, event_type_cache, search_memo, availability_cache)},
+)
+
+
+class BackgroundRefresher:
+    """
+    Periodically reloads the most-used cache entries shortly before they expire, so
+    searches keep hitting warm data. Refreshes run at background priority and are
+    limited to a share of each platform's upstream rate limit.
+    """
+
+    def __init__(
+        self,
+        caches: List[TTLCache],
+        scheduler: RequestScheduler,
+        interval: float = REFRESH_INTERVAL,
+        refresh_ahead: float = REFRESH_AHEAD,
+        max_per_cycle: int = REFRESH_MAX_PER_CYCLE,
+        budget_share: float = REFRESH_BUDGET_SHARE,
+    ):
+        self.caches = caches
+        self.scheduler = scheduler
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.max_per_cycle = max_per_cycle
+        self.budget_share = budget_share
+        self._budgets: Dict[str, TokenBucket] = {}
+        self._task: asyncio.Task | None = None
+        self.cycles = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.budget_skipped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0 and self.max_per_cycle > 0 and self.budget_share > 0
+
+    async def __aenter__(self) -> "BackgroundRefresher":
+        if self.enabled:
+            self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _budget(self, platform: str) -> TokenBucket:
+        budget = self._budgets.get(platform)
+        if budget is None:
+            rate, burst = self.scheduler.rates.get(platform, (0.0, 1))
+            budget = self._budgets[platform] = TokenBucket(rate * self.budget_share, int(burst * self.budget_share))
+        return budget
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Warning: Background refresh cycle failed: {e}")
+
+    async def run_once(self) -> None:
+        """Refresh the hottest entries that are about to expire, within budget"""
+        candidates = [
+            (entry.accesses, cache, key, entry)
+            for cache in self.caches
+            for key, entry in cache.hot_entries(self.refresh_ahead)
+        ]
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        jobs = []
+        for _, cache, key, entry in candidates[:self.max_per_cycle]:
+            if not self._budget(key[0]).try_take(cache.cost(entry.value)):
+                self.budget_skipped += 1
+                continue
+            jobs.append(self._refresh(cache, key, entry.loader))
+
+        await asyncio.gather(*jobs)
+        for cache in self.caches:
+            cache.decay_accesses()
+        self.cycles += 1
+
+    async def _refresh(self, cache: TTLCache, key: Tuple, loader: Callable[[], Awaitable[Any]]) -> None:
+        # Runs in its own task, so this only lowers the priority of the refresh's requests
+        request_priority.set(PRIORITY_BACKGROUND)
+        try:
+            await cache.refresh(key, loader)
+            self.refreshed += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"Warning: Background refresh of {cache.name} entry failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval,
+            "refresh_ahead_seconds": self.refresh_ahead,
+            "budget_share": self.budget_share,
+            "cycles": self.cycles,
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "budget_skipped": self.budget_skipped,
+        }
+
+
+background_refresher = BackgroundRefresher([directory_cache, event_type_cache], request_scheduler)
+
+
+class SearchQuery:
+    """
+    A name/company search normalized once, with the same semantics as
+    SchedulingAPI.match_name and SchedulingAPI.match_company
+    """
+
+    def __init__(self, name: str, company: str):
+        self.name = name
+        self.company = company
+        self.words = name.lower().split()
+        self.company_lower = company.lower()
+        self.domain = SchedulingAPI.extract_domain(company).lower()
+
+    def matches(self, user_name: str | None, user_email: str | None, user_company: str | None = None) -> bool:
+        return self.matches_normalized(
+            (user_name or "").lower(),
+            (user_email or "").lower(),
+            user_company.lower() if user_company else "",
+        )
+
+    def matches_normalized(self, name_lower: str, email_lower: str, company_lower: str) -> bool:
+        """Match against fields that are already lowercased"""
+        if not all(word in name_lower or word in email_lower for word in self.words):
+            return False
+        return self.domain in email_lower or bool(company_lower and self.company_lower in company_lower)
+
+
+def intern_text(value: Any) -> Any:
+    """Intern strings so equal values repeated across members (and their lowercased forms) share one object"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class DirectoryMember:
+    """
+    Compact directory entry holding only what searches and results use, taken from an
+    upstream Cal.com user or Calendly membership, which is not kept. Strings are interned.
+    """
+
+    __slots__ = ("id", "name", "email", "username", "company", "uri")
+
+    def __init__(self, id: Any, name: str | None, email: str | None, username: str | None = None,
+                 company: str | None = None, uri: str | None = None):
+        self.id = id
+        self.name = intern_text(name)
+        self.email = intern_text(email)
+        self.username = intern_text(username)
+        self.company = intern_text(company)
+        self.uri = intern_text(uri)
+
+    @property
+    def key(self) -> Any:
+        """Identity within the directory: the Calendly user URI, otherwise the Cal.com user id"""
+        return self.uri if self.uri is not None else self.id
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, DirectoryMember):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"DirectoryMember({self.key!r}, {self.name!r}, {self.email!r})"
+
+
+class DirectoryPage:
+    """Validators of one directory page from the last sync and the member ids it listed"""
+
+    __slots__ = ("key", "etag", "digest", "next_url", "ids")
+
+    def __init__(self, key: Any, etag: str | None, digest: bytes, next_url: str | None = None):
+        self.key = key
+        self.etag = etag
+        self.digest = digest
+        self.next_url = next_url
+        self.ids: List[Any] = []
+
+
+class DirectoryIndex:
+    """
+    Search index over one organization directory, built once per directory fetch.
+
+    Holds the normalized name/email/company of each member, an email-domain -> members
+    map, a company key -> members map and a trigram -> posting-list map. Lookups intersect
+    posting lists to find a small candidate set, then confirm each candidate with the exact
+    substring semantics of SearchQuery so results are identical to a full scan.
+
+    The company key is a domain without its public suffix ("acme" for acme.com, acme.io,
+    acme.co.uk or eng.acme.com), taken from the email domain and from the company field
+    (through SchedulingAPI.extract_domain), so company-only lookups match domain aliases.
+
+    Members are stored as DirectoryMember records built by `record` from the upstream
+    items, and the normalized fields share interned strings with them. Posting lists and
+    the domain and company maps are int arrays.
+
+    Incremental syncs apply deltas in place: a removed or replaced member leaves a
+    tombstone (None) at its old position and updates are appended, so posting lists stay
+    sorted. The index is rebuilt once tombstones exceed COMPACT_RATIO of the positions.
+    """
+
+    GRAM_SIZE = 3
+    # Second-level labels that are part of a country suffix, as in acme.co.uk
+    SECOND_LEVEL_LABELS = frozenset({"ac", "co", "com", "edu", "gov", "net", "org"})
+    COMPACT_RATIO = 0.25
+
+    def __init__(self, members: List[Dict[str, Any]], record: Callable[[Dict[str, Any]], DirectoryMember],
+                 platform: str = ""):
+        self.record = record
+        self.platform = platform
+        # Page validators from the last sync, and the last directory event applied
+        self.pages: Dict[Any, "DirectoryPage"] = {}
+        self.event_seq = 0
+        self.built_at = time.monotonic()
+        self._build([record(member) for member in members])
+
+    def _build(self, members: List[DirectoryMember]) -> None:
+        self.members: List[DirectoryMember | None] = []
+        self.names: List[str] = []
+        self.emails: List[str] = []
+        self.companies: List[str] = []
+        self.domains: Dict[str, array] = {}
+        self.company_keys: Dict[str, array] = {}
+        self.postings: Dict[str, array] = {}
+        self.positions: Dict[Any, int] = {}
+        self.removed = 0
+        for member in members:
+            self._add(member)
+
+    @staticmethod
+    def _append(table: Dict[str, array], key: str, position: int) -> None:
+        positions = table.get(key)
+        if positions is None:
+            positions = table[key] = array("i")
+        positions.append(position)
+
+    def _add(self, member: DirectoryMember) -> None:
+        position = len(self.members)
+        # Lowercasing an already lowercase value yields the same interned string, not a copy
+        name_lower = intern_text((member.name or "").lower())
+        email_lower = intern_text((member.email or "").lower())
+        company_lower = intern_text((member.company or "").lower())
+        self.members.append(member)
+        self.names.append(name_lower)
+        self.emails.append(email_lower)
+        self.companies.append(company_lower)
+        self.positions[member.key] = position
+
+        keys = set()
+        if "@" in email_lower:
+            domain = intern_text(email_lower.rsplit("@", 1)[1])
+            self._append(self.domains, domain, position)
+            keys.add(self.company_key(domain))
+        if company_lower:
+            keys.add(self.company_key(SchedulingAPI.extract_domain(company_lower)))
+        for key in keys:
+            if key:
+                self._append(self.company_keys, key, position)
+
+        # Posting lists stay sorted because positions are only ever appended
+        for gram in self._grams(name_lower) | self._grams(email_lower) | self._grams(company_lower):
+            self._append(self.postings, gram, position)
+
+    def _remove(self, member_id: Any) -> None:
+        position = self.positions.pop(member_id)
+        self.members[position] = None
+        self.names[position] = self.emails[position] = self.companies[position] = ""
+        self.removed += 1
+
+    def __len__(self) -> int:
+        return len(self.members) - self.removed
+
+    def changed(self, member: DirectoryMember) -> bool:
+        """Whether member is new or differs from the indexed record in any field the index keeps"""
+        position = self.positions.get(member.key)
+        return position is None or member != self.members[position]
+
+    def apply(self, upserts: List[DirectoryMember], removals: List[Any]) -> None:
+        """Add or replace upserts and drop the members with the given identities"""
+        for member_id in removals:
+            if member_id in self.positions:
+                self._remove(member_id)
+        for member in upserts:
+            if member.key in self.positions:
+                self._remove(member.key)
+            self._add(member)
+        if self.removed > self.COMPACT_RATIO * len(self.members):
+            self._build([member for member in self.members if member is not None])
+
+    async def sync(self, pages: AsyncIterator[Tuple["DirectoryPage", List[Dict[str, Any]] | None]]) -> Dict[str, int]:
+        """
+        Reconcile the index with a fresh walk of the directory pages. Unchanged pages
+        (items None) keep the member ids recorded last time; members that are new or
+        changed are upserted and members no longer listed on any page are removed.
+        Nothing is applied unless every page was read.
+        """
+        synced: Dict[Any, DirectoryPage] = {}
+        seen = set()
+        upserts = []
+        unchanged_pages = 0
+        async for page, items in pages:
+            if items is None:
+                unchanged_pages += 1
+            else:
+                members = [self.record(item) for item in items]
+                page.ids = [member.key for member in members]
+                upserts.extend(member for member in members if self.changed(member))
+            seen.update(page.ids)
+            synced[page.key] = page
+
+        removals = [member_id for member_id in self.positions if member_id not in seen]
+        with tracer.span("directory.index", upserts=len(upserts), removals=len(removals)):
+            self.apply(upserts, removals)
+        self.pages = synced
+        return {"pages": len(synced), "unchanged_pages": unchanged_pages, "upserts": len(upserts), "removals": len(removals)}
+
+    @classmethod
+    def company_key(cls, domain: str) -> str:
+        """Reduce a domain to the label that identifies the company: eng.acme.co.uk -> acme"""
+        labels = [label for label in domain.lower().strip().rsplit("@", 1)[-1].split(".") if label]
+        if len(labels) < 2:
+            return labels[0] if labels else ""
+        suffix = 1
+        if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in cls.SECOND_LEVEL_LABELS:
+            suffix = 2
+        return labels[-suffix - 1]
+
+    @classmethod
+    def _grams(cls, text: str) -> set:
+        size = cls.GRAM_SIZE
+        return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+    def _candidates_for(self, text: str) -> set | None:
+        """Positions whose fields contain every gram of text, or None if text is too short to narrow"""
+        grams = self._grams(text)
+        if not grams:
+            return None
+        postings = sorted((self.postings.get(gram, []) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        return candidates
+
+    def candidates(self, query: SearchQuery) -> List[int]:
+        """Return a sorted superset of the positions that can match query"""
+        candidates = None
+        for word in query.words:
+            word_candidates = self._candidates_for(word)
+            if word_candidates is not None:
+                candidates = word_candidates if candidates is None else candidates & word_candidates
+
+        # The company matches through either the email domain or the company field
+        domain_candidates = self._candidates_for(query.domain)
+        company_candidates = self._candidates_for(query.company_lower)
+        if domain_candidates is not None and company_candidates is not None:
+            either = domain_candidates | company_candidates
+            candidates = either if candidates is None else candidates & either
+
+        if candidates is None:
+            return list(range(len(self.members)))
+        return sorted(candidates)
+
+    def search(self, query: SearchQuery, max_results: int = None) -> List[DirectoryMember]:
+        """Return matching members in directory order"""
+        matched = []
+        scanned = 0
+        for position in self.candidates(query):
+            scanned += 1
+            if self.members[position] is None:
+                continue
+            if query.matches_normalized(self.names[position], self.emails[position], self.companies[position]):
+                matched.append(self.members[position])
+                if max_results and len(matched) >= max_results:
+                    break
+        USERS_SCANNED.observe(scanned, platform=self.platform)
+        USERS_MATCHED.observe(len(matched), platform=self.platform)
+        return matched
+
+    def members_for_domain(self, domain: str) -> List[DirectoryMember]:
+        """Return members whose email address is at exactly this domain"""
+        return [
+            self.members[position] for position in self.domains.get(domain.lower(), [])
+            if self.members[position] is not None
+        ]
+
+    def company_positions(self, domain: str, aliases: bool = True) -> List[int]:
+        """
+        Return the positions of a company's members in directory order. With aliases, any
+        domain sharing the company key matches; otherwise the email domain or the company
+        field's derived domain must equal domain exactly.
+        """
+        domain = domain.lower()
+        positions = self.company_keys.get(self.company_key(domain), [])
+        if aliases:
+            return [position for position in positions if self.members[position] is not None] if self.removed else positions
+        return [
+            position for position in positions
+            if self.emails[position].endswith(f"@{domain}")
+            or (self.companies[position] and SchedulingAPI.extract_domain(self.companies[position]) == domain)
+        ]
+
+
+def verify_calendly_signature(header: str, body: bytes, signing_key: str, tolerance: float = 180) -> bool:
+    """Check a Calendly-Webhook-Signature header ("t=<unix time>,v1=<hex HMAC-SHA256 of 't.body'>")"""
+    parts = dict(part.split("=", 1) for part in header.split(",") if "=" in part)
+    try:
+        timestamp = int(parts["t"])
+    except (KeyError, ValueError):
+        return False
+    if abs(time.time() - timestamp) > tolerance:
+        return False
+    expected = hmac.new(signing_key.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, parts.get("v1", ""))
+
+
+class DirectorySync:
+    """
+    Incremental refresh of cached directories, and the local queue of Calendly membership
+    events replayed onto them.
+
+    Events are numbered in the order they are queued. Each DirectoryIndex remembers the
+    last event it applied, so replaying is a scan of the newer events for its organization.
+    With an events file every worker tails the same spool; otherwise events stay in memory.
+    A periodic page sync still runs, so a lost event is corrected on the next refresh.
+    """
+
+    EVENT_TYPES = frozenset({
+        "organization_membership.created",
+        "organization_membership.updated",
+        "organization_membership.deleted",
+    })
+
+    def __init__(self, mode: str = DIRECTORY_SYNC_MODE, full_sync_interval: float = DIRECTORY_FULL_SYNC_INTERVAL,
+                 events_path: str = DIRECTORY_EVENTS_PATH, max_events: int = DIRECTORY_EVENTS_MAX):
+        self.incremental = mode == "incremental"
+        self.full_sync_interval = full_sync_interval
+        self.events_path = events_path
+        self._events: deque = deque(maxlen=max(1, max_events))
+        self._offset = 0
+        self.last_seq = 0
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        self.unchanged_pages = 0
+        self.changed_pages = 0
+        self.upserts = 0
+        self.removals = 0
+        self.events_received = 0
+        self.events_applied = 0
+
+    def reuse(self, previous: "DirectoryIndex | None") -> bool:
+        """Whether a cached directory should be synced in place rather than rebuilt"""
+        if not self.incremental or previous is None:
+            return False
+        return not self.full_sync_interval or time.monotonic() - previous.built_at < self.full_sync_interval
+
+    def record(self, result: Dict[str, int], incremental: bool) -> None:
+        if incremental:
+            self.incremental_syncs += 1
+        else:
+            self.full_syncs += 1
+        self.unchanged_pages += result["unchanged_pages"]
+        self.changed_pages += result["pages"] - result["unchanged_pages"]
+        self.upserts += result["upserts"]
+        self.removals += result["removals"]
+
+    def _push(self, event: Dict[str, Any]) -> None:
+        self.last_seq += 1
+        self._events.append((self.last_seq, event))
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Queue a membership event, appending it to the events file when one is configured"""
+        self.events_received += 1
+        if not self.events_path:
+            self._push(event)
+            return
+        with open(self.events_path, "a") as f:
+            f.write(json.dumps(event, separators=(",", ":")) + "\n")
+        self.poll()
+
+    def poll(self) -> None:
+        """Queue events other processes appended to the events file since the last poll"""
+        if not self.events_path:
+            return
+        try:
+            size = os.path.getsize(self.events_path)
+        except OSError:
+            return
+        if size < self._offset:
+            # The file was truncated or rotated; start over from its beginning
+            self._offset = 0
+        if size == self._offset:
+            return
+        with open(self.events_path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        # Leave a partially written last line for the next poll
+        complete = data[:data.rfind(b"\n") + 1]
+        self._offset += len(complete)
+        for line in complete.splitlines():
+            try:
+                self._push(json.loads(line))
+            except ValueError:
+                print(f"Warning: Skipping malformed directory event: {line[:200]!r}")
+
+    def replay(self, index: "DirectoryIndex", organization_uri: str) -> int:
+        """Apply the queued events for organization_uri that index hasn't seen yet"""
+        self.poll()
+        if index.event_seq >= self.last_seq:
+            return 0
+        applied = 0
+        for seq, event in self._events:
+            if seq <= index.event_seq:
+                continue
+            membership = event.get("payload") or {}
+            member_id = (membership.get("user") or {}).get("uri")
+            if membership.get("organization") != organization_uri or not member_id:
+                continue
+            if event.get("event") == "organization_membership.deleted":
+                index.apply([], [member_id])
+            else:
+                index.apply([index.record(membership)], [])
+            applied += 1
+        index.event_seq = self.last_seq
+        self.events_applied += applied
+        return applied
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "incremental" if self.incremental else "full",
+            "full_syncs": self.full_syncs,
+            "incremental_syncs": self.incremental_syncs,
+            "unchanged_pages": self.unchanged_pages,
+            "changed_pages": self.changed_pages,
+            "upserts": self.upserts,
+            "removals": self.removals,
+            "events_path": self.events_path or None,
+            "events_received": self.events_received,
+            "events_queued": len(self._events),
+            "events_applied": self.events_applied,
+        }
+
+
+directory_sync = DirectorySync()
+
+
+# Called with (platform, result) as soon as each matched person's booking links are known
+ResultCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class SchedulingAPI:
+    """
+    Handles API interactions with Cal.com and Calendly platforms
+    """
+
+    PLATFORMS = ("calcom", "calendly")
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def extract_domain(company: str) -> str:
+        """Extract domain from company name for email matching"""
+        # Simple heuristic: convert "Acme Corp" -> "acme.com"
+        domain = company.lower()
+        domain = re.sub(r'\s+(corp|inc|llc|ltd|company|co)\.?$', '', domain, flags=re.IGNORECASE)
+        domain = re.sub(r'\s+', '', domain)
+        domain = re.sub(r'[^a-z0-9]', '', domain)
+        return f"{domain}.com"
+    
+    @staticmethod
+    def match_name(search_name: str, user_name: str, user_email: str) -> bool:
+        """Check if the search name matches the user's name or email"""
+        search_words = search_name.lower().split()
+        user_name_lower = (user_name or "").lower()
+        user_email_lower = (user_email or "").lower()
+        
+        return all(
+            word in user_name_lower or word in user_email_lower
+            for word in search_words
+        )
+    
+    @staticmethod
+    def match_company(search_company: str, user_email: str, user_company: str = None) -> bool:
+        """Check if the search company matches the user's company or email domain"""
+        expected_domain = SchedulingAPI.extract_domain(search_company)
+        email_domain_match = expected_domain.lower() in (user_email or "").lower()
+        
+        if user_company:
+            company_match = search_company.lower() in user_company.lower()
+            return email_domain_match or company_match
+        
+        return email_domain_match
+
+    @staticmethod
+    async def fetch_directory_page(client: httpx.AsyncClient, url: str, params: Dict[str, Any] | None, key: Any,
+                                   previous: DirectoryPage | None, error_label: str) -> Tuple[DirectoryPage, Dict[str, Any] | None]:
+        """
+        GET one directory page, conditionally when a previous sync recorded its ETag.
+        Returns the previous page and None when it is unchanged (304 or identical body).
+        """
+        headers = {"If-None-Match": previous.etag} if previous is not None and previous.etag else None
+        response = await client.get(url, params=params, headers=headers)
+
+        if response.status_code == 304 and previous is not None:
+            return previous, None
+
+        if response.status_code >= 400:
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"{error_label} API error: {response.status_code} - {response.text}"
+                )
+            )
+
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        if previous is not None and previous.digest == digest:
+            return previous, None
+        with tracer.span("json.parse", bytes=len(response.content)):
+            data = response.json()
+        return DirectoryPage(key, response.headers.get("ETag"), digest), data
+
+    @classmethod
+    async def calcom_user_pages(cls, client: httpx.AsyncClient, org_id: str, previous: Dict[Any, DirectoryPage] | None = None,
+                                page_size: int = None) -> AsyncIterator[Tuple[DirectoryPage, List[Dict[str, Any]] | None]]:
+        """Yield each page of a Cal.com organization's members, following skip/take; items are None when unchanged"""
+        previous = previous or {}
+        take = page_size or CALCOM_PAGE_SIZE
+        skip = 0
+        last_page: DirectoryPage | None = None
+        last_ids: List[Any] = []
+        for _ in range(DIRECTORY_MAX_PAGES):
+            page, data = await cls.fetch_directory_page(
+                client, f"{CALCOM_API_BASE}/v2/organizations/{org_id}/users", {"take": take, "skip": skip},
+                skip, previous.get(skip), "Cal.com",
+            )
+            items = None if data is None else data.get("data", [])
+            ids = page.ids if items is None else [item.get("id") for item in items]
+            if last_page is not None and (page.digest == last_page.digest or (ids and ids == last_ids)):
+                # The API ignored skip and sent the previous page again
+                print(f"Warning: Cal.com organization {org_id} repeated a page at skip={skip}; stopping there")
+                return
+            yield page, items
+            last_page, last_ids = page, ids
+
+            # Cal.com may return fewer than `take` members per page, so only an empty page or
+            # pagination saying there is nothing left ends the directory
+            count = len(page.ids) if items is None else len(items)
+            pagination = (data or {}).get("pagination") or {}
+            if not count or pagination.get("hasNextPage") is False or pagination.get("remainingItems") == 0:
+                return
+            skip += count
+        print(f"Warning: Cal.com organization {org_id} has more than {DIRECTORY_MAX_PAGES} pages; stopping there")
+
+    @classmethod
+    async def calendly_pages(cls, client: httpx.AsyncClient, url: str, params: Dict[str, Any],
+                             previous: Dict[Any, DirectoryPage] | None = None, error_label: str = "Calendly"
+                             ) -> AsyncIterator[Tuple[DirectoryPage, List[Dict[str, Any]] | None]]:
+        """Yield each page of a Calendly collection, following pagination.next_page; items are None when unchanged"""
+        previous = previous or {}
+        next_url = url
+        next_params = {**params, "count": CALENDLY_PAGE_SIZE}
+        number = 0
+        while next_url:
+            if number >= DIRECTORY_MAX_PAGES:
+                print(f"Warning: {error_label} collection has more than {DIRECTORY_MAX_PAGES} pages; stopping there")
+                return
+            page, data = await cls.fetch_directory_page(
+                client, next_url, next_params, number, previous.get(number), error_label,
+            )
+            if data is None:
+                yield page, None
+            else:
+                # next_page is an absolute URL that already carries the query string
+                page.next_url = (data.get("pagination") or {}).get("next_page")
+                yield page, data.get("collection", [])
+            next_url = page.next_url
+            next_params = None
+            number += 1
+
+    @classmethod
+    async def iter_calcom_users(cls, client: httpx.AsyncClient, org_id: str,
+                                page_size: int = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every member of a Cal.com organization, following skip/take pages lazily"""
+        async for _, items in cls.calcom_user_pages(client, org_id, page_size=page_size):
+            for user in items:
+                yield user
+
+    @classmethod
+    async def iter_calendly_collection(cls, client: httpx.AsyncClient, url: str, params: Dict[str, Any],
+                                       error_label: str = "Calendly") -> AsyncIterator[Dict[str, Any]]:
+        """Yield every item of a Calendly collection, following pagination.next_page lazily"""
+        async for _, items in cls.calendly_pages(client, url, params, error_label=error_label):
+            for item in items:
+                yield item
+
+    @staticmethod
+    async def fetch_calcom_organizations(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
+        """Download the Cal.com organizations visible to the API key"""
+        response = await client.get(
+            f"{CALCOM_API_BASE}/v2/organizations"
+        )
+
+        if response.status_code >= 400:
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Cal.com API error: {response.status_code} - {response.text}"
+                )
+            )
+
+        data = response.json()
+        return data.get("data", [])
+
+    @staticmethod
+    async def fetch_calendly_user(client: httpx.AsyncClient) -> Dict[str, Any]:
+        """Download the Calendly user resource that owns the access token"""
+        user_response = await client.get(
+            f"{CALENDLY_API_BASE}/users/me"
+        )
+
+        if user_response.status_code >= 400:
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Calendly API error: {user_response.status_code} - {user_response.text}"
+                )
+            )
+
+        user_data = user_response.json()
+        return user_data.get("resource", {})
+
+    @staticmethod
+    def calcom_fields(user: Dict[str, Any]) -> Tuple[str | None, str | None, str | None]:
+        """Return the (name, email, company) used to match a Cal.com user"""
+        return user.get("name"), user.get("email"), user.get("metadata", {}).get("company")
+
+    @staticmethod
+    def calendly_fields(membership: Dict[str, Any]) -> Tuple[str | None, str | None, str | None]:
+        """Return the (name, email, company) used to match a Calendly membership"""
+        user = membership.get("user", {})
+        # Calendly doesn't store company info directly
+        return user.get("name"), user.get("email"), None
+
+    @staticmethod
+    def calcom_member(user: Dict[str, Any]) -> DirectoryMember:
+        """Keep the fields of a Cal.com organization user that searches and results use"""
+        return DirectoryMember(
+            user.get("id"), user.get("name"), user.get("email"), user.get("username"),
+            (user.get("metadata") or {}).get("company"),
+        )
+
+    @staticmethod
+    def calendly_member(membership: Dict[str, Any]) -> DirectoryMember:
+        """Keep the fields of a Calendly organization membership that searches and results use"""
+        user = membership.get("user", {})
+        return DirectoryMember(None, user.get("name"), user.get("email"), user.get("slug"), uri=user.get("uri"))
+
+    @staticmethod
+    async def sync_directory(
+        key: Tuple,
+        pages: Callable[[Dict[Any, DirectoryPage]], AsyncIterator[Tuple[DirectoryPage, List[Dict[str, Any]] | None]]],
+        record: Callable[[Dict[str, Any]], DirectoryMember],
+    ) -> "DirectoryIndex":
+        """
+        Load a directory for the directory cache. In incremental mode the cached index is
+        re-synced in place from conditional page requests; otherwise a new one is built.
+        """
+        directory_sync.poll()
+        event_seq = directory_sync.last_seq
+        previous = directory_cache.peek(key)
+        incremental = directory_sync.reuse(previous)
+        index = previous if incremental else DirectoryIndex([], record, key[0])
+
+        with tracer.span("directory.sync", platform=key[0], incremental=incremental) as span:
+            result = await index.sync(pages(index.pages))
+            if span is not None:
+                span.set(**result)
+        directory_sync.record(result, incremental)
+        # Events queued while the pages were read may be newer than what they showed
+        index.event_seq = min(index.event_seq, event_seq) if incremental else event_seq
+        return index
+
+    @classmethod
+    async def calcom_directory(cls, api_key: str, org_id: str) -> "DirectoryIndex":
+        """Return the indexed member directory of a Cal.com organization, using the directory cache"""
+        key = ("calcom", hash_credential(api_key), str(org_id))
+
+        async def load() -> DirectoryIndex:
+            client = client_pool.get_client("calcom", api_key)
+            return await cls.sync_directory(
+                key,
+                lambda previous: cls.calcom_user_pages(client, org_id, previous),
+                cls.calcom_member,
+            )
+
+        return await directory_cache.get_or_load(key, load)
+
+    @classmethod
+    async def calendly_directory(cls, pat: str, organization_uri: str) -> "DirectoryIndex":
+        """Return the indexed membership directory of a Calendly organization, using the directory cache"""
+        key = ("calendly", hash_credential(pat), organization_uri)
+
+        async def load() -> DirectoryIndex:
+            client = client_pool.get_client("calendly", pat)
+            return await cls.sync_directory(
+                key,
+                lambda previous: cls.calendly_pages(
+                    client,
+                    f"{CALENDLY_API_BASE}/organization_memberships",
+                    {"organization": organization_uri},
+                    previous,
+                    error_label="Calendly memberships",
+                ),
+                cls.calendly_member,
+            )
+
+        index = await directory_cache.get_or_load(key, load)
+        # Membership events received since the last sync are applied before the index is used
+        directory_sync.replay(index, organization_uri)
+        return index
+
+    @classmethod
+    async def get_calcom_organizations(cls, api_key: str) -> List[Dict[str, Any]]:
+        """Return the Cal.com organizations for an API key, using the directory cache"""
+        return await directory_cache.get_or_load(
+            ("calcom", hash_credential(api_key), "organizations"),
+            pooled("calcom", api_key, cls.fetch_calcom_organizations),
+        )
+
+    @classmethod
+    async def get_calendly_user(cls, pat: str) -> Dict[str, Any]:
+        """Return the Calendly user resource for a token, using the directory cache"""
+        return await directory_cache.get_or_load(
+            ("calendly", hash_credential(pat), "users/me"),
+            pooled("calendly", pat, cls.fetch_calendly_user),
+        )
+
+    @staticmethod
+    def resolve_credential(platform: str, credential: str = None) -> str:
+        """Return the explicit credential or the platform's environment default"""
+        if platform == "calcom":
+            used_api_key = credential or CALCOM_API_KEY
+            if not used_api_key:
+                raise McpError(
+                    ErrorData(
+                        code=INTERNAL_ERROR,
+                        message="Cal.com API key not provided. Either set CALCOM_API_KEY environment variable or pass api_key parameter."
+                    )
+                )
+            return used_api_key
+
+        used_pat = credential or CALENDLY_PAT
+        if not used_pat:
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message="Calendly Personal Access Token not provided. Either set CALENDLY_PAT environment variable or pass pat parameter."
+                )
+            )
+        return used_pat
+
+    @staticmethod
+    async def fetch_calcom_event_types(client: httpx.AsyncClient, user: DirectoryMember) -> List[Tuple[str, Any]]:
+        """Download a Cal.com user's event types and return (booking link, event type ID) for the visible ones"""
+        event_types_response = await client.get(
+            f"{CALCOM_API_BASE}/v2/event-types?userId={user.id}"
+        )
+
+        if event_types_response.status_code != 200:
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Cal.com event types API error: {event_types_response.status_code}"
+                )
+            )
+
+        event_types_data = event_types_response.json()
+        event_types = event_types_data.get("data", [])
+
+        # Generate booking links
+        booking_links = []
+        for event_type in event_types:
+            if event_type.get("slug") and not event_type.get("hidden"):
+                link = f"https://cal.com/{user.username or 'user'}/{event_type['slug']}"
+                booking_links.append((link, event_type.get("id")))
+
+        return booking_links
+
+    @staticmethod
+    async def fetch_calendly_event_types(client: httpx.AsyncClient, membership: DirectoryMember) -> List[Tuple[str, Any]]:
+        """Download a Calendly member's event types and return (booking link, event type URI) for the active ones"""
+        event_types = [
+            event_type async for event_type in SchedulingAPI.iter_calendly_collection(
+                client,
+                f"{CALENDLY_API_BASE}/event_types",
+                {"user": membership.uri},
+            )
+        ]
+
+        # Generate booking links
+        booking_links = []
+        for event_type in event_types:
+            if (event_type.get("scheduling_url") and
+                event_type.get("active", False)):
+                booking_links.append((event_type["scheduling_url"], event_type.get("uri")))
+
+        return booking_links
+
+    @classmethod
+    async def _calcom_event_types(cls, api_key: str, user: DirectoryMember) -> List[Tuple[str, Any]] | None:
+        """Return a Cal.com user's event types from the event-type cache, or None if they can't be retrieved"""
+        try:
+            return await event_type_cache.get_or_load(
+                ("calcom", hash_credential(api_key), user.id),
+                pooled("calcom", api_key, lambda client: cls.fetch_calcom_event_types(client, user)),
+            )
+        except Exception as e:
+            # Continue with other users if one fails
+            print(f"Warning: Failed to fetch event types for user {user.id}: {e}")
+            return None
+
+    @classmethod
+    async def _calendly_event_types(cls, pat: str, membership: DirectoryMember) -> List[Tuple[str, Any]] | None:
+        """Return a Calendly member's event types from the event-type cache, or None if they can't be retrieved"""
+        try:
+            return await event_type_cache.get_or_load(
+                ("calendly", hash_credential(pat), membership.uri),
+                pooled("calendly", pat, lambda client: cls.fetch_calendly_event_types(client, membership)),
+            )
+        except Exception as e:
+            # Continue with other users if one fails
+            print(f"Warning: Failed to fetch event types for user {membership.uri}: {e}")
+            return None
+
+    @classmethod
+    async def _calcom_booking_links(cls, api_key: str, user: DirectoryMember) -> List[str] | None:
+        """Return a Cal.com user's booking links, or None if they can't be retrieved"""
+        event_types = await cls._calcom_event_types(api_key, user)
+        return None if event_types is None else [link for link, _ in event_types]
+
+    @classmethod
+    async def _calendly_booking_links(cls, pat: str, membership: DirectoryMember) -> List[str] | None:
+        """Return a Calendly member's booking links, or None if they can't be retrieved"""
+        event_types = await cls._calendly_event_types(pat, membership)
+        return None if event_types is None else [link for link, _ in event_types]
+
+    @staticmethod
+    def slot_time(value: str) -> str:
+        """Normalize an upstream slot start to second-precision UTC, e.g. 2026-10-19T09:00:00Z"""
+        start = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        return start.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    @classmethod
+    async def fetch_calcom_slots(cls, client: httpx.AsyncClient, event_type_id: Any, days: int) -> List[str]:
+        """Download the open slots of a Cal.com event type for the next `days` days"""
+        start = datetime.now(timezone.utc)
+        response = await client.get(
+            f"{CALCOM_API_BASE}/v2/slots",
+            params={
+                "eventTypeId": event_type_id,
+                "start": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "end": (start + timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "timeZone": "UTC",
+            },
+            headers={"cal-api-version": "2024-09-04"},
+            extensions={"persistent_cache": False},
+        )
+
+        if response.status_code != 200:
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Cal.com slots API error: {response.status_code}"
+                )
+            )
+
+        # Slots come grouped by date: {"2026-10-19": [{"start": "..."}, ...], ...}
+        slots_by_day = response.json().get("data", {})
+        return sorted(
+            cls.slot_time(slot["start"])
+            for day_slots in slots_by_day.values()
+            for slot in day_slots
+            if slot.get("start")
+        )
+
+    @classmethod
+    async def fetch_calendly_slots(cls, client: httpx.AsyncClient, event_type_uri: str, days: int) -> List[str]:
+        """Download the open slots of a Calendly event type for the next `days` days"""
+        # Calendly answers at most 7 days per request and only for start times in the future
+        start = datetime.now(timezone.utc) + timedelta(minutes=1)
+        end = start + timedelta(days=days)
+        windows = []
+        while start < end:
+            windows.append((start, min(start + timedelta(days=7), end)))
+            start = windows[-1][1]
+
+        async def fetch_window(window_start: datetime, window_end: datetime) -> List[str]:
+            response = await client.get(
+                f"{CALENDLY_API_BASE}/event_type_available_times",
+                params={
+                    "event_type": event_type_uri,
+                    "start_time": window_start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "end_time": window_end.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                },
+                extensions={"persistent_cache": False},
+            )
+            if response.status_code != 200:
+                raise McpError(
+                    ErrorData(
+                        code=INTERNAL_ERROR,
+                        message=f"Calendly available times API error: {response.status_code}"
+                    )
+                )
+            return [
+                cls.slot_time(slot["start_time"])
+                for slot in response.json().get("collection", [])
+                if slot.get("status", "available") == "available" and slot.get("start_time")
+            ]
+
+        window_slots = await asyncio.gather(*(fetch_window(*window) for window in windows))
+        return sorted(slot for slots in window_slots for slot in slots)
+
+    @classmethod
+    async def availability(cls, platform: str, credential: str, event_types: List[Tuple[str, Any]], days: int) -> List[Dict[str, Any]]:
+        """
+        Return the soonest open slots of each event type, fetched in parallel.
+
+        Slots are cached per event type for AVAILABILITY_CACHE_TTL seconds. Slots that have
+        started since they were cached are dropped, and at most AVAILABILITY_MAX_SLOTS are
+        returned per event type. An event type whose slots can't be retrieved is returned
+        with an empty list and an error.
+        """
+        credential_key = hash_credential(credential)
+        fetch_slots = cls.fetch_calcom_slots if platform == "calcom" else cls.fetch_calendly_slots
+
+        async def slots_for(link: str, event_type_key: Any) -> Dict[str, Any]:
+            if event_type_key is None:
+                return {"link": link, "slots": []}
+            try:
+                slots = await availability_cache.get_or_load(
+                    (platform, credential_key, event_type_key, days),
+                    pooled(platform, credential, lambda client: fetch_slots(client, event_type_key, days)),
+                )
+            except Exception as e:
+                print(f"Warning: Failed to fetch availability for {link}: {e}")
+                return {"link": link, "slots": [], "error": cls._describe_failure(platform, e)}
+            now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            upcoming = slots[bisect.bisect_left(slots, now):]
+            return {"link": link, "slots": upcoming[:AVAILABILITY_MAX_SLOTS]}
+
+        with tracer.span("availability", platform=platform, event_types=len(event_types)):
+            return await asyncio.gather(*(slots_for(link, event_type_key) for link, event_type_key in event_types))
+
+    @staticmethod
+    def calcom_result(user: DirectoryMember, company: str, booking_links: List[str]) -> Dict[str, Any]:
+        """Build the result entry for a matched Cal.com user"""
+        return {
+            "name": user.name if user.name is not None else "Unknown",
+            "email": user.email if user.email is not None else "",
+            "company": user.company if user.company is not None else company,
+            "bookingLinks": booking_links
+        }
+
+    @staticmethod
+    def calendly_result(membership: DirectoryMember, company: str, booking_links: List[str]) -> Dict[str, Any]:
+        """Build the result entry for a matched Calendly member"""
+        return {
+            "name": membership.name if membership.name is not None else "Unknown",
+            "email": membership.email if membership.email is not None else "",
+            "company": company,  # Calendly doesn't store company info directly
+            "bookingLinks": booking_links
+        }
+
+    @classmethod
+    async def _calcom_user_result(cls, api_key: str, user: DirectoryMember, company: str, availability_days: int = 0) -> Dict[str, Any] | None:
+        """Fetch a Cal.com user's event types (and, with availability_days, their open slots) and build their result entry"""
+        event_types = await cls._calcom_event_types(api_key, user)
+        if event_types is None:
+            return None
+        result = cls.calcom_result(user, company, [link for link, _ in event_types])
+        if availability_days:
+            result["availability"] = await cls.availability("calcom", api_key, event_types, availability_days)
+        return result
+
+    @classmethod
+    async def _calendly_member_result(cls, pat: str, membership: DirectoryMember, company: str, availability_days: int = 0) -> Dict[str, Any] | None:
+        """Fetch a Calendly member's event types (and, with availability_days, their open slots) and build their result entry"""
+        event_types = await cls._calendly_event_types(pat, membership)
+        if event_types is None:
+            return None
+        result = cls.calendly_result(membership, company, [link for link, _ in event_types])
+        if availability_days:
+            result["availability"] = await cls.availability("calendly", pat, event_types, availability_days)
+        return result
+
+    @staticmethod
+    async def _emit(platform: str, pending_result: Awaitable[Dict[str, Any] | None],
+                    on_result: ResultCallback | None) -> Dict[str, Any] | None:
+        """Await one person's result and hand it to on_result as soon as it is ready"""
+        result = await pending_result
+        if result is not None and on_result is not None:
+            await on_result(platform, result)
+        return result
+
+    @classmethod
+    async def search_calcom(cls, name: str, company: str, org_id: str, api_key: str = None,
+                            concurrency: int = None, max_results: int = None,
+                            on_result: ResultCallback = None, availability_days: int = 0) -> List[Dict[str, Any]]:
+        """Search Cal.com for users matching name and company"""
+        used_api_key = cls.resolve_credential("calcom", api_key)
+
+        if not org_id:
+            raise McpError(
+                ErrorData(
+                    code=INVALID_PARAMS,
+                    message="Organization ID is required for Cal.com API calls"
+                )
+            )
+
+        client = client_pool.get_client("calcom", used_api_key)
+
+        try:
+            # Filter users by name and company
+            query = SearchQuery(name, company)
+            if directory_cache.enabled:
+                # Look up the cached, pre-indexed organization directory
+                with tracer.span("calcom.directory"):
+                    directory = await cls.calcom_directory(used_api_key, org_id)
+                with tracer.span("directory.match", members=len(directory)) as span:
+                    matched_users = directory.search(query, max_results)
+            else:
+                # Stream pages straight into the matcher so large orgs are never held in memory
+                with tracer.span("directory.scan") as span:
+                    matched_users = [cls.calcom_member(user) for user in await collect_matches(
+                        cls.iter_calcom_users(client, org_id),
+                        lambda user: query.matches(*cls.calcom_fields(user)),
+                        max_results,
+                        platform="calcom",
+                    )]
+            if span is not None:
+                span.set(matched=len(matched_users))
+
+            # Get event types for all matched users concurrently, keeping match order
+            with tracer.span("calcom.event_types", users=len(matched_users)):
+                user_results = await gather_bounded(
+                    [
+                        cls._emit(
+                            "calcom", cls._calcom_user_result(used_api_key, user, company, availability_days),
+                            on_result,
+                        )
+                        for user in matched_users
+                    ],
+                    concurrency or EVENT_TYPE_CONCURRENCY,
+                )
+            results = [result for result in user_results if result is not None]
+
+            return results
+
+        except httpx.HTTPError as e:
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Cal.com API request failed: {str(e)}"
+                )
+            )
+
+    @classmethod
+    async def search_calendly(cls, name: str, company: str, pat: str = None,
+                              concurrency: int = None, max_results: int = None,
+                              on_result: ResultCallback = None, availability_days: int = 0) -> List[Dict[str, Any]]:
+        """Search Calendly for users matching name and company"""
+        used_pat = cls.resolve_credential("calendly", pat)
+
+        client = client_pool.get_client("calendly", used_pat)
+
+        try:
+            # Get current user info (served from the directory cache when fresh)
+            with tracer.span("calendly.user"):
+                resource = await cls.get_calendly_user(used_pat)
+            organization_uri = resource["current_organization"]
+
+            # Filter members by name and company
+            query = SearchQuery(name, company)
+            if directory_cache.enabled:
+                # Look up the cached, pre-indexed organization directory
+                with tracer.span("calendly.directory"):
+                    directory = await cls.calendly_directory(used_pat, organization_uri)
+                with tracer.span("directory.match", members=len(directory)) as span:
+                    matched_members = directory.search(query, max_results)
+            else:
+                # Stream pages straight into the matcher so large orgs are never held in memory
+                with tracer.span("directory.scan") as span:
+                    matched_members = [cls.calendly_member(membership) for membership in await collect_matches(
+                        cls.iter_calendly_collection(
+                            client,
+                            f"{CALENDLY_API_BASE}/organization_memberships",
+                            {"organization": organization_uri},
+                            error_label="Calendly memberships",
+                        ),
+                        lambda membership: query.matches(*cls.calendly_fields(membership)),
+                        max_results,
+                        platform="calendly",
+                    )]
+            if span is not None:
+                span.set(matched=len(matched_members))
+
+            # Get event types for all matched members concurrently, keeping match order
+            with tracer.span("calendly.event_types", users=len(matched_members)):
+                member_results = await gather_bounded(
+                    [
+                        cls._emit(
+                            "calendly", cls._calendly_member_result(used_pat, membership, company, availability_days),
+                            on_result,
+                        )
+                        for membership in matched_members
+                    ],
+                    concurrency or EVENT_TYPE_CONCURRENCY,
+                )
+            results = [result for result in member_results if result is not None]
+
+            return results
+
+        except httpx.HTTPError as e:
+            raise McpError(
+                ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Calendly API request failed: {str(e)}"
+                )
+            )
+
+
+    @classmethod
+    async def _directory_for(cls, platform: str, credential: str, org_id: str) -> DirectoryIndex:
+        """Load the indexed directory a batch group searches against"""
+        if platform == "calcom":
+            return await cls.calcom_directory(credential, org_id)
+
+        resource = await cls.get_calendly_user(credential)
+        return await cls.calendly_directory(credential, resource["current_organization"])
+
+    @classmethod
+    async def list_company(cls, platform: str, company: str, org_id: str = "", api_key: str = None,
+                           cursor: int = 0, page_size: int = COMPANY_LIST_PAGE_SIZE, aliases: bool = True,
+                           with_links_only: bool = True, concurrency: int = None) -> Dict[str, Any]:
+        """
+        Return one page of a company's members and their booking links.
+
+        company may be a company name ("Acme Corp") or a domain ("acme.io"). Members come
+        from the indexed directory, so paging through a company slices its member list
+        instead of rescanning the directory; event types are fetched for the current page
+        only. cursor is the position in that list where the page starts.
+        """
+        domain = company.strip().lower() if "." in company and " " not in company.strip() else cls.extract_domain(company)
+        credential = cls.resolve_credential(platform, api_key)
+        if platform == "calcom" and not org_id:
+            raise McpError(ErrorData(code=INVALID_PARAMS, message="Organization ID is required for Cal.com API calls"))
+
+        try:
+            directory = await cls._directory_for(platform, credential, str(org_id) if platform == "calcom" else "")
+            positions = directory.company_positions(domain, aliases)
+            page = [directory.members[position] for position in positions[cursor:cursor + page_size]]
+
+            if platform == "calcom":
+                pending = [cls._calcom_user_result(credential, user, company) for user in page]
+            else:
+                pending = [cls._calendly_member_result(credential, membership, company) for membership in page]
+            results = await gather_bounded(pending, concurrency or EVENT_TYPE_CONCURRENCY)
+        except httpx.HTTPError as e:
+            raise McpError(ErrorData(code=INTERNAL_ERROR, message=cls._describe_failure(platform, e)))
+
+        results = [
+            result for result in results
+            if result is not None and (result["bookingLinks"] or not with_links_only)
+        ]
+        end = cursor + len(page)
+        return {
+            "platform": platform,
+            "domain": domain,
+            "company_key": DirectoryIndex.company_key(domain),
+            "total_members": len(positions),
+            "cursor": cursor,
+            "next_cursor": end if end < len(positions) else None,
+            "results": results,
+        }
+
+    @classmethod
+    def _validate_batch_query(cls, query: Dict[str, Any]) -> Tuple[Tuple[str, str, str], SearchQuery]:
+        """Validate one batch item and return its directory group key and normalized query"""
+        platform = query.get("platform")
+        name = (query.get("name") or "").strip()
+        company = (query.get("company") or "").strip()
+        org_id = str(query.get("org_id") or "")
+
+        if platform not in ["calcom", "calendly"]:
+            raise McpError(ErrorData(code=INVALID_PARAMS, message="Platform must be either 'calcom' or 'calendly'"))
+        if not name:
+            raise McpError(ErrorData(code=INVALID_PARAMS, message="Name is required and cannot be empty"))
+        if not company:
+            raise McpError(ErrorData(code=INVALID_PARAMS, message="Company is required and cannot be empty"))
+        if platform == "calcom" and not org_id:
+            raise McpError(ErrorData(code=INVALID_PARAMS, message="org_id is required for Cal.com searches"))
+
+        credential = cls.resolve_credential(platform, query.get("api_key") or None)
+        return (platform, credential, org_id if platform == "calcom" else ""), SearchQuery(name, company)
+
+    @staticmethod
+    def _describe_failure(platform: str, error: BaseException) -> str:
+        if isinstance(error, McpError):
+            return error.error.message
+        label = "Cal.com" if platform == "calcom" else "Calendly"
+        if isinstance(error, httpx.HTTPError):
+            return f"{label} API request failed: {str(error)}"
+        return f"Search failed: {str(error)}"
+
+    @classmethod
+    async def batch_search(cls, queries: List[Dict[str, Any]], concurrency: int = None,
+                           max_results: int = None) -> List[Dict[str, Any]]:
+        """
+        Resolve many (platform, name, company) queries in one pass.
+
+        Each organization directory is loaded once and every query in its group is matched
+        against it. Event types are fetched once per distinct person even when several
+        queries match them. Failures are reported on the affected items only.
+        """
+        items = []
+        groups: Dict[Tuple[str, str, str], List[Tuple[Dict[str, Any], SearchQuery]]] = {}
+
+        for index, query in enumerate(queries):
+            item = {
+                "index": index,
+                "platform": query.get("platform"),
+                "name": query.get("name"),
+                "company": query.get("company"),
+            }
+            items.append(item)
+            try:
+                group_key, search_query = cls._validate_batch_query(query)
+            except McpError as e:
+                item["error"] = e.error.message
+                continue
+            groups.setdefault(group_key, []).append((item, search_query))
+
+        # Load every distinct directory once, concurrently
+        group_keys = list(groups)
+        directories = await asyncio.gather(
+            *(cls._directory_for(*group_key) for group_key in group_keys),
+            return_exceptions=True,
+        )
+
+        # Match all queries, collecting the distinct people whose event types are needed
+        people: Dict[Tuple[str, str, Any], Tuple[Tuple[str, str, str], DirectoryMember]] = {}
+        matches = []
+        for group_key, directory in zip(group_keys, directories):
+            platform, credential, _ = group_key
+            if isinstance(directory, BaseException):
+                message = cls._describe_failure(platform, directory)
+                for item, _ in groups[group_key]:
+                    item["error"] = message
+                continue
+
+            for item, search_query in groups[group_key]:
+                members = directory.search(search_query, max_results)
+                person_keys = []
+                for member in members:
+                    person_key = (platform, credential, member.key)
+                    people.setdefault(person_key, (group_key, member))
+                    person_keys.append(person_key)
+                matches.append((item, platform, search_query, members, person_keys))
+
+        async def fetch_links(group_key: Tuple[str, str, str], member: DirectoryMember) -> List[str] | None:
+            platform, credential, _ = group_key
+            if platform == "calcom":
+                return await cls._calcom_booking_links(credential, member)
+            return await cls._calendly_booking_links(credential, member)
+
+        person_keys = list(people)
+        links = await gather_bounded(
+            [fetch_links(*people[person_key]) for person_key in person_keys],
+            concurrency or EVENT_TYPE_CONCURRENCY,
+        )
+        links_by_person = dict(zip(person_keys, links))
+
+        for item, platform, search_query, members, member_keys in matches:
+            build = cls.calcom_result if platform == "calcom" else cls.calendly_result
+            item["results"] = [
+                build(member, search_query.company, links_by_person[person_key])
+                for member, person_key in zip(members, member_keys)
+                if links_by_person[person_key] is not None
+            ]
+
+        for item in items:
+            item["status"] = "error" if "error" in item else "ok"
+
+        return items
+
+
+    @classmethod
+    async def search(cls, platform: str, name: str, company: str, org_id: str = "", api_key: str = None,
+                     max_results: int = None, on_result: ResultCallback = None,
+                     availability_days: int = 0) -> List[Dict[str, Any]]:
+        """
+        Search a single platform for users matching name and company.
+
+        Identical concurrent searches (equal search_key: normalized name, company,
+        organization, credential and availability window) await one shared upstream search, and its
+        results are reused for SEARCH_MEMO_TTL seconds, or at most AVAILABILITY_CACHE_TTL
+        when they include slots. Streaming searches (on_result) always run on their own.
+        """
+        async def load() -> List[Dict[str, Any]]:
+            if platform == "calcom":
+                return await cls.search_calcom(name, company, org_id, api_key, max_results=max_results,
+                                               on_result=on_result, availability_days=availability_days)
+            return await cls.search_calendly(name, company, api_key, max_results=max_results,
+                                             on_result=on_result, availability_days=availability_days)
+
+        if on_result is not None:
+            return await load()
+
+        key = cls.search_key(platform, cls.resolve_credential(platform, api_key), name, company, org_id,
+                             max_results, availability_days)
+        # Results that embed slots must not outlive the slots' own cache
+        ttl = AVAILABILITY_CACHE_TTL if availability_days else None
+        # Callers get their own list so one can't mutate what another receives
+        return list(await search_memo.get_or_load(key, load, ttl))
+
+    @staticmethod
+    def search_key(platform: str, credential: str, name: str, company: str, org_id: str = "",
+                   max_results: int = None, availability_days: int = 0) -> Tuple:
+        """
+        Memo key of a search: searches with equal keys match the same members. Name words
+        are matched independently, so their case, order and repeats don't matter; the
+        company is matched as one substring, so only its case and spacing are normalized.
+        """
+        return (
+            platform,
+            hash_credential(credential),
+            " ".join(sorted(set(name.lower().split()))),
+            " ".join(company.lower().split()),
+            str(org_id or "").strip() if platform == "calcom" else "",
+            max_results or 0,
+            availability_days,
+        )
+
+    @staticmethod
+    def merge_results(platform_results: List[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Merge per-platform results, combining entries for the same email address"""
+        merged = []
+        by_email: Dict[str, Dict[str, Any]] = {}
+        for platform, results in platform_results:
+            for result in results:
+                email = (result.get("email") or "").lower()
+                existing = by_email.get(email) if email else None
+                if existing is None:
+                    entry = {**result, "platforms": [platform]}
+                    merged.append(entry)
+                    if email:
+                        by_email[email] = entry
+                    continue
+
+                existing["platforms"].append(platform)
+                existing["bookingLinks"] = existing["bookingLinks"] + [
+                    link for link in result["bookingLinks"] if link not in existing["bookingLinks"]
+                ]
+                if "availability" in result:
+                    existing["availability"] = existing.get("availability", []) + result["availability"]
+        return merged
+
+    @classmethod
+    async def search_across(cls, platforms: List[str], name: str, company: str, org_id: str = "",
+                            first_hit: bool = False, max_results: int = None, on_result: ResultCallback = None,
+                            availability_days: int = 0) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Search several platforms concurrently using their configured credentials.
+
+        Returns the merged results and a per-platform report with status, result count,
+        timing and any error. With first_hit, the remaining platforms are cancelled as
+        soon as one platform returns a match.
+        """
+        started = time.perf_counter()
+        report: Dict[str, Dict[str, Any]] = {}
+        results_by_platform: Dict[str, List[Dict[str, Any]]] = {}
+
+        def elapsed_ms() -> float:
+            return round((time.perf_counter() - started) * 1000, 1)
+
+        async def run(platform: str) -> None:
+            try:
+                results = await cls.search(platform, name, company, org_id, max_results=max_results,
+                                           on_result=on_result, availability_days=availability_days)
+            except Exception as e:
+                report[platform] = {"status": "error", "error": cls._describe_failure(platform, e), "elapsed_ms": elapsed_ms()}
+                return
+            results_by_platform[platform] = results
+            report[platform] = {"status": "ok", "results": len(results), "elapsed_ms": elapsed_ms()}
+
+        tasks = {asyncio.ensure_future(run(platform)): platform for platform in platforms}
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if first_hit and any(results_by_platform.get(tasks[task]) for task in done):
+                    break
+        finally:
+            # Cancel whatever is still running, whether we stopped early or were cancelled ourselves
+            for task in pending:
+                task.cancel()
+                report[tasks[task]] = {"status": "cancelled", "elapsed_ms": elapsed_ms()}
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        merged = cls.merge_results([
+            (platform, results_by_platform[platform]) for platform in platforms if platform in results_by_platform
+        ])
+        return merged, {platform: report[platform] for platform in platforms}
+
+
+class ServerBusyError(McpError):
+    """A tool call rejected by admission control; error.data carries retry_after and reason"""
+
+
+# Rejections raised during the current tool call, collected so they reach the client as JSON-RPC errors
+admission_rejections: contextvars.ContextVar[List[ServerBusyError] | None] = contextvars.ContextVar(
+    "admission_rejections", default=None
+)
+
+
+class _AdmissionLane:
+    """Slots and waiting calls for one tool or one client token"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.waiters: deque = deque()
+        # Moving average of how long admitted calls hold a slot, for retry hints
+        self.hold_seconds: float | None = None
+        self.admitted = 0
+        self.queued = 0
+        self.wait_seconds = 0.0
+        self.rejected = 0
+
+    def retry_after(self) -> float:
+        """Seconds until a slot is likely to be free for a caller joining the back of the queue"""
+        hold = self.hold_seconds if self.hold_seconds is not None else 1.0
+        return min(60.0, max(0.1, round(hold * (len(self.waiters) + 1) / self.limit, 1)))
+
+
+class AdmissionController:
+    """
+    Limits how many tool calls run at once, per tool and per client token.
+
+    A call first takes a slot in its token's lane, then one in its tool's lane, so a single
+    client can hold at most TOKEN_MAX_IN_FLIGHT of a tool's slots and queue positions. When a
+    lane is full the call waits in a bounded FIFO queue until a slot is handed to it or its
+    deadline passes; a full queue or an expired deadline rejects the call immediately with a
+    retry hint instead of letting work pile up on the event loop. Exempt tools bypass both.
+    """
+
+    # Weight of the newest sample in each lane's moving average hold time
+    HOLD_ALPHA = 0.2
+
+    def __init__(self, tool_limit: int = TOOL_MAX_IN_FLIGHT, token_limit: int = TOKEN_MAX_IN_FLIGHT,
+                 overrides: str = TOOL_MAX_IN_FLIGHT_OVERRIDES, queue_size: int = ADMISSION_QUEUE_SIZE,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT, exempt: str = ADMISSION_EXEMPT_TOOLS):
+        self.tool_limit = max(0, tool_limit)
+        self.token_limit = max(0, token_limit)
+        self.tool_limits = self.parse_overrides(overrides)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = max(0.0, queue_timeout)
+        self.exempt = {tool.strip() for tool in exempt.split(",") if tool.strip()}
+        self._tools: Dict[str, _AdmissionLane] = {}
+        self._tokens: Dict[Tuple[str, str], _AdmissionLane] = {}
+
+    @staticmethod
+    def parse_overrides(overrides: str) -> Dict[str, int]:
+        limits = {}
+        for entry in overrides.split(","):
+            tool, separator, limit = entry.partition(":")
+            if not entry.strip():
+                continue
+            try:
+                limits[tool.strip()] = max(0, int(limit))
+            except ValueError:
+                print(f"Warning: Ignoring invalid TOOL_MAX_IN_FLIGHT_OVERRIDES entry {entry.strip()!r}")
+        return limits
+
+    def limit(self, tool: str) -> int:
+        return self.tool_limits.get(tool, self.tool_limit)
+
+    @staticmethod
+    def client_key() -> Tuple[str, str]:
+        """(client_id, short token digest) of the bearer token behind the current call"""
+        access_token = get_access_token()
+        if access_token is None:
+            return "anonymous", ""
+        return access_token.client_id, TokenRegistry.digest(access_token.token).hex()[:8]
+
+    def _reject(self, lane: _AdmissionLane, tool: str, reason: str, message: str) -> "ServerBusyError":
+        lane.rejected += 1
+        ADMISSION_REJECTED.inc(tool=tool, reason=reason)
+        retry_after = lane.retry_after()
+        return ServerBusyError(ErrorData(
+            code=INTERNAL_ERROR,
+            message=f"Server busy: {message}. Retry after {retry_after:.1f} seconds",
+            data={"retry_after": retry_after, "reason": reason},
+        ))
+
+    async def _acquire(self, lane: _AdmissionLane, tool: str, scope: str, deadline: float) -> None:
+        if lane.in_flight < lane.limit and not lane.waiters:
+            lane.in_flight += 1
+            lane.admitted += 1
+            return
+        if len(lane.waiters) >= self.queue_size:
+            holder = "this client" if scope == "token" else tool
+            raise self._reject(
+                lane, tool, f"{scope}_queue_full",
+                f"{holder} already has {lane.in_flight} calls in flight and {len(lane.waiters)} queued",
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        lane.waiters.append(future)
+        lane.queued += 1
+        started = time.monotonic()
+        try:
+            with tracer.span("admission.wait", scope=scope, queued=len(lane.waiters)):
+                await asyncio.wait((future,), timeout=max(0.0, deadline - started))
+        except BaseException:
+            if future.done():
+                # Cancelled just after a slot was handed over: pass it on
+                self._release(lane, None)
+            else:
+                future.cancel()
+                lane.waiters.remove(future)
+            raise
+        finally:
+            waited = time.monotonic() - started
+            lane.wait_seconds += waited
+            ADMISSION_WAIT.observe(waited, tool=tool)
+        if not future.done():
+            # The deadline passed while queued: give up the queue position
+            future.cancel()
+            lane.waiters.remove(future)
+            raise self._reject(
+                lane, tool, f"{scope}_timeout",
+                f"waited {waited:.1f}s for a free {tool} slot" + (" for this client" if scope == "token" else ""),
+            )
+        lane.admitted += 1
+
+    def _release(self, lane: _AdmissionLane, held: float | None) -> None:
+        if held is not None:
+            lane.hold_seconds = held if lane.hold_seconds is None else (
+                self.HOLD_ALPHA * held + (1 - self.HOLD_ALPHA) * lane.hold_seconds
+            )
+        while lane.waiters:
+            future = lane.waiters.popleft()
+            if not future.done():
+                # Hand the slot straight to the next caller so newcomers can't jump the queue
+                future.set_result(None)
+                return
+        lane.in_flight -= 1
+
+    @asynccontextmanager
+    async def admit(self, tool: str):
+        """Hold a token slot and a tool slot for the enclosed call, waiting or rejecting when full"""
+        tool_limit = self.limit(tool)
+        if tool in self.exempt or (not tool_limit and not self.token_limit):
+            yield
+            return
+
+        deadline = time.monotonic() + self.queue_timeout
+        held: List[_AdmissionLane] = []
+        started = None
+        token_key = self.client_key()
+        try:
+            if self.token_limit:
+                lane = self._tokens.get(token_key)
+                if lane is None:
+                    lane = self._tokens[token_key] = _AdmissionLane(self.token_limit)
+                await self._acquire(lane, tool, "token", deadline)
+                held.append(lane)
+            if tool_limit:
+                lane = self._tools.get(tool)
+                if lane is None:
+                    lane = self._tools[tool] = _AdmissionLane(tool_limit)
+                await self._acquire(lane, tool, "tool", deadline)
+                held.append(lane)
+            started = time.monotonic()
+            yield
+        finally:
+            held_for = time.monotonic() - started if started is not None else None
+            for lane in reversed(held):
+                self._release(lane, held_for)
+            token_lane = self._tokens.get(token_key)
+            if token_lane is not None and not token_lane.in_flight and not token_lane.waiters:
+                # Forget idle clients so the table only holds tokens with calls in flight
+                del self._tokens[token_key]
+
+    def in_flight(self) -> Dict[Tuple, float]:
+        return {(tool,): lane.in_flight for tool, lane in self._tools.items()}
+
+    def queue_depth(self) -> Dict[Tuple, float]:
+        return {(tool,): len(lane.waiters) for tool, lane in self._tools.items()}
+
+    @staticmethod
+    def _lane_stats(lane: _AdmissionLane) -> Dict[str, Any]:
+        return {
+            "limit": lane.limit,
+            "in_flight": lane.in_flight,
+            "queue_depth": len(lane.waiters),
+            "admitted": lane.admitted,
+            "queued": lane.queued,
+            "wait_seconds": round(lane.wait_seconds, 3),
+            "rejected": lane.rejected,
+            "hold_seconds": round(lane.hold_seconds, 3) if lane.hold_seconds is not None else None,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tool_limit": self.tool_limit,
+            "tool_limits": self.tool_limits,
+            "token_limit": self.token_limit,
+            "queue_size": self.queue_size,
+            "queue_timeout": self.queue_timeout,
+            "exempt": sorted(self.exempt),
+            "tools": {tool: self._lane_stats(lane) for tool, lane in self._tools.items()},
+            "clients": [
+                {"client": client_id, "token": digest, **self._lane_stats(lane)}
+                for (client_id, digest), lane in self._tokens.items()
+            ],
+        }
+
+
+admission = AdmissionController()
+Gauge(metrics, "mcp_tool_calls_in_flight", "Admitted tool calls running per tool", ("tool",), admission.in_flight)
+Gauge(metrics, "mcp_admission_queue_depth", "Tool calls waiting for an admission slot", ("tool",), admission.queue_depth)
+
+
+token_registry = TokenRegistry(
+    "" if TOKEN_IS_DEFAULT else TOKEN, MCP_BEARER_TOKENS, MCP_BEARER_TOKENS_FILE,
+    fallback_token=TOKEN if TOKEN_IS_DEFAULT else "",
+)
+
+# Initialize FastMCP server
+mcp = FastMCP(
+    "Scheduling Link Discovery MCP Server",
+    auth=SimpleBearerAuthProvider(token_registry),
+)
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Records the latency and outcome of every MCP tool invocation"""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        started = time.perf_counter()
+        status = "error"
+        try:
+            result = await call_next(context)
+            status = "ok"
+            return result
+        finally:
+            TOOL_DURATION.observe(time.perf_counter() - started, tool=context.message.name, status=status)
+
+
+class TracingMiddleware(Middleware):
+    """Traces sampled MCP tool invocations; see Tracer"""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        with tracer.trace(f"tool {context.message.name}", **{"mcp.tool.name": context.message.name}):
+            return await call_next(context)
+
+
+class AdmissionMiddleware(Middleware):
+    """Queues or rejects tool calls beyond the in-flight limits; see AdmissionController"""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        try:
+            async with admission.admit(context.message.name):
+                return await call_next(context)
+        except ServerBusyError as e:
+            rejections = admission_rejections.get()
+            if rejections is not None:
+                rejections.append(e)
+            raise
+
+
+def send_admission_rejections_as_errors(server: FastMCP) -> None:
+    """
+    The MCP server turns every exception raised by a tool call into an error result that
+    carries only the message text. Answer admission rejections with a JSON-RPC error
+    instead, so clients can read error.data.retry_after rather than parsing the message.
+    """
+    call_tool = server._mcp_server.request_handlers[CallToolRequest]
+
+    async def handler(request: CallToolRequest):
+        rejections: List[ServerBusyError] = []
+        token = admission_rejections.set(rejections)
+        try:
+            result = await call_tool(request)
+        finally:
+            admission_rejections.reset(token)
+        if rejections:
+            raise rejections[0]
+        return result
+
+    server._mcp_server.request_handlers[CallToolRequest] = handler
+
+
+if metrics.enabled:
+    mcp.add_middleware(ToolMetricsMiddleware())
+if tracer.enabled:
+    mcp.add_middleware(TracingMiddleware())
+# Added last so rejections and queueing show up in tool metrics and traces
+mcp.add_middleware(AdmissionMiddleware())
+send_admission_rejections_as_errors(mcp)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus scrape endpoint served alongside the MCP transport"""
+    if not metrics.enabled:
+        return PlainTextResponse("Metrics are disabled\n", status_code=404)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@mcp.custom_route("/webhooks/calendly", methods=["POST"])
+async def calendly_webhook(request: Request) -> Response:
+    """Queue signed Calendly organization membership events for the cached directories"""
+    if not CALENDLY_WEBHOOK_SIGNING_KEY:
+        return PlainTextResponse("Webhooks are disabled\n", status_code=404)
+
+    body = await request.body()
+    signature = request.headers.get("Calendly-Webhook-Signature", "")
+    if not verify_calendly_signature(signature, body, CALENDLY_WEBHOOK_SIGNING_KEY):
+        return PlainTextResponse("Invalid signature\n", status_code=401)
 
+    try:
+        event = json.loads(body)
+    except ValueError:
+        return PlainTextResponse("Invalid JSON\n", status_code=400)
 
-# Initialize FastMCP server
-mcp = FastMCP(
-    "Scheduling Link Discovery MCP Server",
-    auth=SimpleBearerAuthProvider(TOKEN),
-)
+    if not isinstance(event, dict) or event.get("event") not in DirectorySync.EVENT_TYPES:
+        return PlainTextResponse("Ignored\n", status_code=202)
+
+    directory_sync.publish(event)
+    return PlainTextResponse("Queued\n", status_code=202)
 
 
 @mcp.tool
@@ -338,12 +3971,14 @@ async def get_server_info() -> list[TextContent]:
         "name": "Scheduling Link Discovery MCP Server",
         "version": "1.0.0",
         "status": "running",
-        "bearer_token": TOKEN,
         "available_tools": [
             "search_scheduling_links - Search for booking links on Cal.com or Calendly",
+            "batch_search_scheduling_links - Search booking links for many people in one call",
+            "list_company_scheduling_links - List everyone at a company with their booking links, page by page",
             "get_scheduling_config - Check API credential configuration status", 
             "get_organization_info - Get organization IDs for Cal.com or Calendly",
             "get_server_info - Get this server information",
+            "get_performance_stats - Get connection pool and runtime statistics",
             "validate - MCP server validation (returns phone number)"
         ],
         "usage_examples": {
@@ -359,6 +3994,13 @@ async def get_server_info() -> list[TextContent]:
                 "name": "Jane Smith",
                 "company": "AcmeCorp",
                 "api_key": "optional_calendly_pat"
+            },
+            "search_all_platforms": {
+                "platform": "all",
+                "name": "Jane Smith",
+                "company": "AcmeCorp",
+                "org_id": "your_cal_org_id",
+                "first_hit": False
             }
         }
     }
@@ -371,32 +4013,116 @@ async def get_server_info() -> list[TextContent]:
 
 SearchSchedulingToolDescription = RichToolDescription(
     description="Search for scheduling links across Cal.com and Calendly platforms for a specific person and company.",
-    use_when="When you need to find booking links for someone at a specific company on Cal.com or Calendly platforms.",
-    side_effects="Makes API calls to Cal.com or Calendly to search for users and their available booking links.",
+    use_when="When you need to find booking links for someone at a specific company on Cal.com or Calendly platforms, optionally with their soonest free times.",
+    side_effects="Makes API calls to Cal.com or Calendly to search for users and their available booking links, and their open slots with include_availability.",
 )
 
 
+def parse_platforms(platform: str) -> List[str]:
+    """Expand a platform argument ('calcom', 'calendly', 'all' or a comma-separated list)"""
+    if platform.strip() == "all":
+        return list(SchedulingAPI.PLATFORMS)
+
+    platforms = []
+    for value in platform.split(","):
+        value = value.strip()
+        if value not in SchedulingAPI.PLATFORMS:
+            raise McpError(
+                ErrorData(
+                    code=INVALID_PARAMS,
+                    message="Platform must be 'calcom', 'calendly', 'all' or a comma-separated list of platforms"
+                )
+            )
+        if value not in platforms:
+            platforms.append(value)
+    return platforms
+
+
+class ResultStreamer:
+    """
+    Sends each search result to the client as an MCP progress notification as soon as
+    it is ready, followed by a summary notification when the search finishes.
+    """
+
+    def __init__(self, ctx: Context, fields: Tuple[str, ...] | None = None, compact: bool = False):
+        self.ctx = ctx
+        self.fields = fields
+        self.compact = compact
+        self.sent = 0
+
+    @classmethod
+    def for_request(cls, ctx: Context, fields: Tuple[str, ...] | None = None,
+                    compact: bool = False) -> "ResultStreamer | None":
+        """Return a streamer if the client asked for progress notifications, else None"""
+        meta = ctx.request_context.meta
+        if meta is None or meta.progressToken is None:
+            return None
+        return cls(ctx, fields, compact)
+
+    async def __call__(self, platform: str, result: Dict[str, Any]) -> None:
+        self.sent += 1
+        message = encode_json({"platform": platform, "result": project(result, self.fields)}, self.compact)
+        await self.ctx.report_progress(self.sent, message=message)
+
+    async def finish(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Send the summary notification and return the response without the already streamed results"""
+        summary = {key: value for key, value in response.items() if key != "results"}
+        summary["streamed_results"] = self.sent
+        # Progress must keep increasing, so the summary counts as one more step
+        await self.ctx.report_progress(self.sent + 1, self.sent + 1, encode_json({"summary": summary}, self.compact))
+        return summary
+
+
+async def _search_response(response: Dict[str, Any], streamer: ResultStreamer | None,
+                           fields: Tuple[str, ...] | None = None, compact: bool = False) -> list[TextContent]:
+    """Format a search response, replacing streamed results with a summary"""
+    if streamer is not None:
+        response = await streamer.finish(response)
+    elif fields is not None:
+        response = {**response, "results": [project(result, fields) for result in response["results"]]}
+    return [TextContent(
+        type="text",
+        text=encode_json(response, compact)
+    )]
+
+
 @mcp.tool(description=SearchSchedulingToolDescription.model_dump_json())
 async def search_scheduling_links(
-    platform: Annotated[str, Field(description="Platform to search on: 'calcom' or 'calendly'")],
+    platform: Annotated[str, Field(description="Platform to search on: 'calcom', 'calendly', 'all', or a comma-separated list such as 'calcom,calendly'")],
     name: Annotated[str, Field(description="Full name of the person to search for")],
     company: Annotated[str, Field(description="Company name to match against")],
     org_id: Annotated[str, Field(description="Organization ID (required for Cal.com)", default="")] = "",
     api_key: Annotated[str, Field(description="API key override (optional)", default="")] = "",
+    max_results: Annotated[int, Field(description="Stop scanning the directory after this many matches (0 = no limit)", default=0)] = 0,
+    first_hit: Annotated[bool, Field(description="When searching several platforms, return as soon as one platform finds a match", default=False)] = False,
+    stream: Annotated[bool, Field(description="Send each result as a progress notification as soon as it is found, then return a summary (requires a progress token)", default=False)] = False,
+    include_availability: Annotated[bool, Field(description="Also return the soonest open time slots of each booking link", default=False)] = False,
+    availability_days: Annotated[int, Field(description=f"Days ahead to look for open slots with include_availability (default {AVAILABILITY_DAYS}, max {AVAILABILITY_MAX_DAYS})", default=0)] = 0,
+    fields: Annotated[str, Field(description="Comma-separated result fields to return, e.g. 'email,bookingLinks' (default: all)", default="")] = "",
+    compact: Annotated[bool, Field(description="Return minified JSON instead of the indented layout", default=False)] = False,
+    ctx: Context = None,
 ) -> list[TextContent]:
     """
     Search for scheduling links on Cal.com or Calendly for a specific person and company.
     
     For Cal.com: org_id is required to specify which organization to search.
     For Calendly: uses the authenticated user's organization automatically.
+    With platform='all' (or a list), platforms are searched concurrently using their
+    configured credentials and results are merged by email address.
+    With stream=True and a progress token, results are sent as progress notifications
+    while the search runs; otherwise the full result list is returned at the end.
+    With include_availability=True, each result also lists the soonest open slots
+    (UTC start times) of each of its booking links.
     """
     
     # Validate platform
-    if platform not in ["calcom", "calendly"]:
+    platforms = parse_platforms(platform)
+
+    if len(platforms) > 1 and api_key:
         raise McpError(
             ErrorData(
                 code=INVALID_PARAMS,
-                message="Platform must be either 'calcom' or 'calendly'"
+                message="api_key can only be used when searching a single platform; multi-platform searches use configured credentials"
             )
         )
     
@@ -417,20 +4143,48 @@ async def search_scheduling_links(
             )
         )
 
+    if max_results < 0:
+        raise McpError(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message="max_results cannot be negative"
+            )
+        )
+
+    if availability_days < 0 or availability_days > AVAILABILITY_MAX_DAYS:
+        raise McpError(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message=f"availability_days must be between 0 and {AVAILABILITY_MAX_DAYS}"
+            )
+        )
+    availability_days = (availability_days or AVAILABILITY_DAYS) if include_availability else 0
+
+    selected_fields = parse_fields(fields)
+    streamer = ResultStreamer.for_request(ctx, selected_fields, compact) if stream and ctx is not None else None
+
+    if len(platforms) > 1:
+        return await _search_multiple_platforms(
+            platforms, name, company, org_id, first_hit, max_results, streamer, selected_fields, compact,
+            availability_days,
+        )
+
+    platform = platforms[0]
+
     try:
-        # Search based on platform
-        if platform == "calcom":
-            # For Cal.com, org_id is required
-            if not org_id:
-                raise McpError(
-                    ErrorData(
-                        code=INVALID_PARAMS,
-                        message="org_id is required for Cal.com searches. You can find this in your Cal.com dashboard URL: /teams/[ORG_ID]/members"
-                    )
+        # For Cal.com, org_id is required
+        if platform == "calcom" and not org_id:
+            raise McpError(
+                ErrorData(
+                    code=INVALID_PARAMS,
+                    message="org_id is required for Cal.com searches. You can find this in your Cal.com dashboard URL: /teams/[ORG_ID]/members"
                 )
-            results = await SchedulingAPI.search_calcom(name.strip(), company.strip(), org_id, api_key or None)
-        else:  # calendly
-            results = await SchedulingAPI.search_calendly(name.strip(), company.strip(), api_key or None)
+            )
+
+        results = await SchedulingAPI.search(
+            platform, name.strip(), company.strip(), org_id, api_key or None,
+            max_results=max_results or None, on_result=streamer, availability_days=availability_days,
+        )
 
         # Format results
         if not results:
@@ -444,10 +4198,7 @@ async def search_scheduling_links(
                 "results": results
             }
 
-        return [TextContent(
-            type="text",
-            text=json.dumps(response, indent=2)
-        )]
+        return await _search_response(response, streamer, selected_fields, compact)
 
     except McpError:
         # Re-raise MCP errors as-is
@@ -461,6 +4212,229 @@ async def search_scheduling_links(
         )
 
 
+async def _search_multiple_platforms(platforms: List[str], name: str, company: str, org_id: str,
+                                     first_hit: bool, max_results: int,
+                                     streamer: ResultStreamer | None = None,
+                                     fields: Tuple[str, ...] | None = None,
+                                     compact: bool = False, availability_days: int = 0) -> list[TextContent]:
+    """Run search_scheduling_links across several platforms and format the merged response"""
+    try:
+        results, report = await SchedulingAPI.search_across(
+            platforms, name.strip(), company.strip(), org_id, first_hit=first_hit, max_results=max_results or None,
+            on_result=streamer, availability_days=availability_days,
+        )
+    except Exception as e:
+        raise McpError(
+            ErrorData(
+                code=INTERNAL_ERROR,
+                message=f"Search failed: {str(e)}"
+            )
+        )
+
+    if all(entry["status"] == "error" for entry in report.values()):
+        raise McpError(
+            ErrorData(
+                code=INTERNAL_ERROR,
+                message="Search failed on all platforms: " + "; ".join(
+                    f"{platform}: {entry['error']}" for platform, entry in report.items()
+                )
+            )
+        )
+
+    # Each platform stops at max_results; cap the merged list to the same limit
+    if max_results:
+        results = results[:max_results]
+
+    platform_label = ", ".join(platforms)
+    if not results:
+        message = f"No scheduling links found for '{name}' at '{company}' on {platform_label}"
+    else:
+        message = f"Found {len(results)} scheduling link(s) for '{name}' at '{company}' on {platform_label}"
+
+    response = {
+        "message": message,
+        "results": results,
+        "platforms": report
+    }
+
+    return await _search_response(response, streamer, fields, compact)
+
+
+class BatchSearchQuery(BaseModel):
+    platform: str = Field(description="Platform to search on: 'calcom' or 'calendly'")
+    name: str = Field(description="Full name of the person to search for")
+    company: str = Field(description="Company name to match against")
+    org_id: str = Field(default="", description="Organization ID (required for Cal.com)")
+    api_key: str = Field(default="", description="API key override (optional)")
+
+
+BatchSearchSchedulingToolDescription = RichToolDescription(
+    description="Search for scheduling links for many people at once across Cal.com and Calendly.",
+    use_when="When you need booking links for a list of attendees, instead of calling search_scheduling_links once per person.",
+    side_effects="Makes API calls to Cal.com or Calendly, fetching each organization directory once and each matched person's event types once.",
+)
+
+
+@mcp.tool(description=BatchSearchSchedulingToolDescription.model_dump_json())
+async def batch_search_scheduling_links(
+    queries: Annotated[list[BatchSearchQuery], Field(description="List of searches, each with platform, name, company and optional org_id/api_key")],
+    max_results: Annotated[int, Field(description="Return at most this many results per query (0 = no limit)", default=0)] = 0,
+    fields: Annotated[str, Field(description="Comma-separated result fields to return, e.g. 'email,bookingLinks' (default: all)", default="")] = "",
+    compact: Annotated[bool, Field(description="Return minified JSON instead of the indented layout", default=False)] = False,
+) -> list[TextContent]:
+    """
+    Search for scheduling links for several (name, company) pairs in one call.
+
+    Results are returned per query in the same order. A failing query reports its own
+    error without affecting the others.
+    """
+
+    if not queries:
+        raise McpError(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message="At least one query is required"
+            )
+        )
+
+    if len(queries) > BATCH_MAX_QUERIES:
+        raise McpError(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message=f"At most {BATCH_MAX_QUERIES} queries can be searched in one batch"
+            )
+        )
+
+    if max_results < 0:
+        raise McpError(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message="max_results cannot be negative"
+            )
+        )
+
+    selected_fields = parse_fields(fields)
+
+    # Batch work yields to interactive searches when upstream rate limits are tight
+    priority_token = request_priority.set(PRIORITY_BULK)
+    try:
+        items = await SchedulingAPI.batch_search(
+            [query.model_dump() for query in queries], max_results=max_results or None
+        )
+    except McpError:
+        raise
+    except Exception as e:
+        raise McpError(
+            ErrorData(
+                code=INTERNAL_ERROR,
+                message=f"Batch search failed: {str(e)}"
+            )
+        )
+    finally:
+        request_priority.reset(priority_token)
+
+    if selected_fields is not None:
+        for item in items:
+            if "results" in item:
+                item["results"] = [project(result, selected_fields) for result in item["results"]]
+
+    failed = sum(1 for item in items if item["status"] == "error")
+    response = {
+        "message": f"Searched {len(items)} quer{'y' if len(items) == 1 else 'ies'}: {len(items) - failed} succeeded, {failed} failed",
+        "results": items
+    }
+
+    return [TextContent(
+        type="text",
+        text=encode_json(response, compact)
+    )]
+
+
+ListCompanySchedulingToolDescription = RichToolDescription(
+    description="List everyone at a company (by company name or email domain) with their scheduling links, one page at a time.",
+    use_when="When you need booking links for all members of a company rather than one named person, e.g. everyone at acme.com.",
+    side_effects="Makes API calls to Cal.com or Calendly for the organization directory (cached) and for the event types of each listed member.",
+)
+
+
+@mcp.tool(description=ListCompanySchedulingToolDescription.model_dump_json())
+async def list_company_scheduling_links(
+    platform: Annotated[str, Field(description="Platform to list: 'calcom' or 'calendly'")],
+    company: Annotated[str, Field(description="Company name (e.g. 'Acme Corp') or email domain (e.g. 'acme.io')")],
+    org_id: Annotated[str, Field(description="Organization ID (required for Cal.com)", default="")] = "",
+    api_key: Annotated[str, Field(description="API key override (optional)", default="")] = "",
+    cursor: Annotated[int, Field(description="next_cursor from the previous page (0 for the first page)", default=0)] = 0,
+    page_size: Annotated[int, Field(description="Members per page (0 = COMPANY_LIST_PAGE_SIZE)", default=0)] = 0,
+    aliases: Annotated[bool, Field(description="Also match other domains of the same company, such as acme.io or acme.co.uk for acme.com", default=True)] = True,
+    with_links_only: Annotated[bool, Field(description="Leave out members without an active booking link", default=True)] = True,
+    fields: Annotated[str, Field(description="Comma-separated result fields to return, e.g. 'email,bookingLinks' (default: all)", default="")] = "",
+    compact: Annotated[bool, Field(description="Return minified JSON instead of the indented layout", default=False)] = False,
+) -> list[TextContent]:
+    """
+    List a company's members and their booking links from the organization directory.
+
+    Pass the returned next_cursor back to get the following page; it is null on the last page.
+    """
+
+    if platform not in SchedulingAPI.PLATFORMS:
+        raise McpError(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message="Platform must be 'calcom' or 'calendly'"
+            )
+        )
+
+    if not company.strip():
+        raise McpError(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message="Company is required and cannot be empty"
+            )
+        )
+
+    if cursor < 0:
+        raise McpError(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message="cursor cannot be negative"
+            )
+        )
+
+    if not 0 <= page_size <= COMPANY_LIST_MAX_PAGE_SIZE:
+        raise McpError(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message=f"page_size must be between 0 and {COMPANY_LIST_MAX_PAGE_SIZE}"
+            )
+        )
+
+    selected_fields = parse_fields(fields)
+
+    try:
+        response = await SchedulingAPI.list_company(
+            platform, company.strip(), org_id, api_key or None,
+            cursor=cursor, page_size=page_size or COMPANY_LIST_PAGE_SIZE,
+            aliases=aliases, with_links_only=with_links_only,
+        )
+    except McpError:
+        raise
+    except Exception as e:
+        raise McpError(
+            ErrorData(
+                code=INTERNAL_ERROR,
+                message=f"Company listing failed: {str(e)}"
+            )
+        )
+
+    if selected_fields is not None:
+        response["results"] = [project(result, selected_fields) for result in response["results"]]
+
+    return [TextContent(
+        type="text",
+        text=encode_json(response, compact)
+    )]
+
+
 GetSchedulingConfigToolDescription = RichToolDescription(
     description="Get current configuration status for scheduling API credentials.",
     use_when="When you need to check if the required API credentials are configured for Cal.com or Calendly.",
@@ -509,6 +4483,8 @@ GetOrgInfoToolDescription = RichToolDescription(
 async def get_organization_info(
     platform: Annotated[str, Field(description="Platform: 'calcom' or 'calendly'")],
     api_key: Annotated[str, Field(description="API key or PAT (optional if set in environment)", default="")] = "",
+    compact: Annotated[bool, Field(description="Return minified JSON without descriptions", default=False)] = False,
+    max_results: Annotated[int, Field(description="Return at most this many Cal.com organizations (0 = no limit)", default=0)] = 0,
 ) -> list[TextContent]:
     """
     Get organization information for the authenticated user.
@@ -522,6 +4498,14 @@ async def get_organization_info(
                 message="Platform must be 'calcom' or 'calendly'"
             )
         )
+
+    if max_results < 0:
+        raise McpError(
+            ErrorData(
+                code=INVALID_PARAMS,
+                message="max_results cannot be negative"
+            )
+        )
     
     try:
         if platform == "calcom":
@@ -533,41 +4517,25 @@ async def get_organization_info(
                         message="Cal.com API key required"
                     )
                 )
-            
-            async with httpx.AsyncClient() as client:
-                # Get organizations
-                response = await client.get(
-                    "https://api.cal.com/v2/organizations",
-                    headers={
-                        "Authorization": f"Bearer {used_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    timeout=30
-                )
-                
-                if response.status_code >= 400:
-                    raise McpError(
-                        ErrorData(
-                            code=INTERNAL_ERROR,
-                            message=f"Cal.com API error: {response.status_code} - {response.text}"
-                        )
-                    )
+
+            # Get organizations
+            with tracer.span("calcom.organizations"):
+                organizations = await SchedulingAPI.get_calcom_organizations(used_api_key)
                 
-                data = response.json()
-                organizations = data.get("data", [])
+            org_info = {
+                "platform": "calcom",
+                "organizations": []
+            }
                 
-                org_info = {
-                    "platform": "calcom",
-                    "organizations": []
+            for org in organizations[:max_results or None]:
+                entry = {
+                    "id": org.get("id"),
+                    "name": org.get("name"),
+                    "slug": org.get("slug"),
                 }
-                
-                for org in organizations:
-                    org_info["organizations"].append({
-                        "id": org.get("id"),
-                        "name": org.get("name"),
-                        "slug": org.get("slug"),
-                        "description": f"Use org_id='{org.get('id')}' for searches in this organization"
-                    })
+                if not compact:
+                    entry["description"] = f"Use org_id='{org.get('id')}' for searches in this organization"
+                org_info["organizations"].append(entry)
                 
         else:  # calendly
             used_pat = api_key or CALENDLY_PAT
@@ -578,37 +4546,23 @@ async def get_organization_info(
                         message="Calendly PAT required"
                     )
                 )
-            
-            async with httpx.AsyncClient() as client:
-                # Get user info
-                user_response = await client.get(
-                    "https://api.calendly.com/users/me",
-                    headers={
-                        "Authorization": f"Bearer {used_pat}",
-                        "Content-Type": "application/json"
-                    },
-                    timeout=30
-                )
-                
-                if user_response.status_code >= 400:
-                    raise McpError(
-                        ErrorData(
-                            code=INTERNAL_ERROR,
-                            message=f"Calendly API error: {user_response.status_code} - {user_response.text}"
-                        )
-                    )
-                
-                user_data = user_response.json()
-                resource = user_data.get("resource", {})
+
+            # Get user info
+            with tracer.span("calendly.user"):
+                resource = await SchedulingAPI.get_calendly_user(used_pat)
                 
-                org_info = {
-                    "platform": "calendly",
-                    "user_name": resource.get("name"),
-                    "user_email": resource.get("email"),
-                    "organization_uri": resource.get("current_organization"),
-                    "description": "Calendly searches use your authenticated organization automatically - no org_id needed"
-                }
-        
+            org_info = {
+                "platform": "calendly",
+                "user_name": resource.get("name"),
+                "user_email": resource.get("email"),
+                "organization_uri": resource.get("current_organization"),
+            }
+            if not compact:
+                org_info["description"] = "Calendly searches use your authenticated organization automatically - no org_id needed"
+
+        if compact:
+            return [TextContent(type="text", text=encode_json(org_info, compact=True))]
+
         return [TextContent(
             type="text",
             text=f"Organization information for {platform}:\n\n" + 
@@ -626,30 +4580,195 @@ async def get_organization_info(
         )
 
 
-async def main():
+PerformanceStatsToolDescription = RichToolDescription(
+    description="Get runtime performance statistics such as upstream HTTP connection pool utilization and rate-limit queueing.",
+    use_when="When you need to inspect how the server's upstream connections and internal resources are being used.",
+    side_effects="Returns in-process counters without making external API calls.",
+)
+
+
+@mcp.tool(description=PerformanceStatsToolDescription.model_dump_json())
+async def get_performance_stats() -> list[TextContent]:
+    """
+    Get runtime performance statistics for this server process.
+    """
+    stats = {
+        "startup": STARTUP_TIMINGS,
+        "auth": token_registry.stats(),
+        "admission": admission.stats(),
+        "http_pool": client_pool.stats(),
+        "scheduler": request_scheduler.stats(),
+        "upstream_guard": upstream_guard.stats(),
+        "directory_sync": directory_sync.stats(),
+        "persistent_store": persistent_store.stats(),
+        "directory_cache": directory_cache.stats(),
+        "event_type_cache": event_type_cache.stats(),
+        "search_coalescing": search_memo.stats(),
+        "tracing": tracer.stats(),
+        "availability_cache": availability_cache.stats(),
+        "background_refresher": background_refresher.stats(),
+    }
+
+    return [TextContent(
+        type="text",
+        text=json.dumps(stats, indent=2)
+    )]
+
+
+@asynccontextmanager
+async def server_resources():
+    """
+    Own the long-lived resources shared by all tool calls for the lifetime of the server
+    """
+    async with persistent_store, request_scheduler, client_pool, background_refresher:
+        STARTUP_TIMINGS.setdefault("ready_seconds", round(time.perf_counter() - _LOAD_STARTED, 3))
+        yield
+
+
+async def serve_worker(sock: socket.socket) -> None:
+    """Serve MCP requests on an inherited listening socket until told to stop"""
+    import uvicorn
+    from sse_starlette.sse import AppStatus
+
+    # By default sse-starlette cuts every streaming response as soon as shutdown starts;
+    # let in-flight tool calls finish within uvicorn's graceful shutdown timeout instead
+    AppStatus.disable_automatic_graceful_drain()
+
+    # Any worker may receive any request, so no session state can live in one process
+    app = mcp.http_app(transport="streamable-http", stateless_http=True)
+    config = uvicorn.Config(app, lifespan="on", timeout_graceful_shutdown=SHUTDOWN_DRAIN_TIMEOUT, ws="none")
+    async with server_resources():
+        await uvicorn.Server(config).serve(sockets=[sock])
+
+
+def run_worker(sock: socket.socket, workers: int) -> None:
+    """Entry point of a worker process started by run_workers"""
+    # Forked from the supervisor: drop its signal handlers until uvicorn installs its own
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if hasattr(os, "setpgrp"):
+        # Leave the terminal's process group so Ctrl+C reaches only the supervisor, which then drains us once
+        os.setpgrp()
+    request_scheduler.share_rate_limits(workers)
+    persistent_store.shared = True
+    asyncio.run(serve_worker(sock))
+
+
+def run_workers(workers: int) -> None:
+    """
+    Run `workers` server processes on one shared listening socket, restarting any that
+    crash. SIGTERM/SIGINT are forwarded once so workers drain in-flight requests.
+
+    On Linux, workers are forked from this process after every module has been imported,
+    so starting or restarting one skips the imports and all workers share those memory
+    pages. The supervisor therefore never runs an event loop or starts threads of its own.
+    Elsewhere fork is unavailable (Windows) or unsafe (macOS), so workers are started with
+    the platform's default method and import the server themselves.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((SERVER_HOST, SERVER_PORT))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    if sys.platform.startswith("linux") and "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+
+    def start() -> multiprocessing.Process:
+        process = context.Process(target=run_worker, args=(sock, workers))
+        process.start()
+        return process
+
+    stopping = threading.Event()
+    previous_handlers = {
+        signum: signal.signal(signum, lambda *_: stopping.set())
+        for signum in (signal.SIGTERM, signal.SIGINT)
+    }
+    processes = [start() for _ in range(workers)]
+
+    while not stopping.wait(timeout=1):
+        for index, process in enumerate(processes):
+            if not process.is_alive():
+                print(f"Warning: Worker {process.pid} exited with code {process.exitcode}, restarting")
+                processes[index] = start()
+
+    for process in processes:
+        if process.is_alive():
+            os.kill(process.pid, signal.SIGTERM)
+
+    # Give workers the drain window plus a little time to close resources
+    deadline = time.monotonic() + SHUTDOWN_DRAIN_TIMEOUT + 5
+    for process in processes:
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            process.kill()
+    sock.close()
+    for signum, handler in previous_handlers.items():
+        signal.signal(signum, handler)
+
+
+def main() -> None:
     """
     Main function to run the MCP server
     """
     print("🚀 Starting Scheduling Link Discovery MCP Server")
-    print(f"📍 Server will be available at: http://0.0.0.0:8086")
-    print(f"🔑 Bearer Token: {TOKEN}")
+    print(f"📍 Server will be available at: http://{SERVER_HOST}:{SERVER_PORT}")
+    if WORKERS > 1:
+        if not persistent_store.path:
+            # Without a shared file each worker would warm a private cache of its own. Spawned
+            # workers re-read the environment, forked ones inherit the store.
+            persistent_store.path = os.environ["PERSISTENT_CACHE_PATH"] = WORKERS_CACHE_PATH
+            print(f"Warning: PERSISTENT_CACHE_PATH is not set; workers share the default cache file {WORKERS_CACHE_PATH}")
+        elif not persistent_store.enabled:
+            print("Warning: PERSISTENT_CACHE_TTL is 0, so each worker keeps its own in-memory caches only")
+        shared_cache = persistent_store.path if persistent_store.enabled else "disabled"
+        print(f"👷 Workers: {WORKERS} (stateless HTTP, shared cache: {shared_cache})")
+    print(f"🔑 Bearer tokens: {len(token_registry)} client token(s) accepted")
+    if token_registry.using_fallback:
+        print("Warning: No bearer tokens are configured, so the built-in default token is accepted. "
+              "Set MCP_BEARER_TOKEN or MCP_BEARER_TOKENS before exposing this server.")
+    print(f"⏱️  Loaded in {STARTUP_TIMINGS['imports_seconds'] + STARTUP_TIMINGS['module_setup_seconds']:.2f}s "
+          f"(imports {STARTUP_TIMINGS['imports_seconds']:.2f}s, setup {STARTUP_TIMINGS['module_setup_seconds']:.2f}s)")
     print("📋 MCP Protocol Endpoint:")
     print("   - POST /sse      - MCP protocol endpoint (Server-Sent Events)")
+    if metrics.enabled:
+        print("   - GET  /metrics  - Prometheus metrics")
     print("🛠️  Available MCP tools:")
     print("   - search_scheduling_links  - Search Cal.com/Calendly for booking links")
+    print("   - batch_search_scheduling_links - Search booking links for many people")
+    print("   - list_company_scheduling_links - List booking links for everyone at a company")
     print("   - get_scheduling_config    - Check API credential status") 
     print("   - get_organization_info    - Get organization IDs")
     print("   - get_server_info          - Get server information")
+    print("   - get_performance_stats    - Get connection pool and runtime stats")
     print("   - validate                 - MCP validation tool")
     print("💡 Note: Access via MCP client or curl with Bearer token")
     print("=" * 60)
     
-    await mcp.run_async(
-        "streamable-http",
-        host="0.0.0.0",
-        port=8086,  # Different port from the original server
-    )
+    if WORKERS > 1:
+        run_workers(WORKERS)
+        return
+
+    asyncio.run(serve())
+
+
+async def serve() -> None:
+    """Serve MCP requests in this process"""
+    async with server_resources():
+        await mcp.run_async(
+            "streamable-http",
+            host=SERVER_HOST,
+            port=SERVER_PORT,
+            # The banner above replaces FastMCP's, and MCP over HTTP never needs the websocket stack
+            show_banner=False,
+            uvicorn_config={"ws": "none"},
+        )
+
+
+STARTUP_TIMINGS["module_setup_seconds"] = round(time.perf_counter() - _LOAD_STARTED - STARTUP_TIMINGS["imports_seconds"], 3)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -0,0 +1,175 @@
+import asyncio
+
+import pytest
+from fastmcp import Client
+from mcp.shared.exceptions import McpError
+
+import scheduling_mcp_server as server
+from scheduling_mcp_server import AdmissionController, ServerBusyError
+
+
+def controller(**kwargs):
+    kwargs.setdefault("tool_limit", 1)
+    kwargs.setdefault("token_limit", 0)
+    kwargs.setdefault("overrides", "")
+    kwargs.setdefault("queue_size", 1)
+    kwargs.setdefault("queue_timeout", 5)
+    kwargs.setdefault("exempt", "get_server_info")
+    return AdmissionController(**kwargs)
+
+
+async def hold(admission, tool, release, order=None, name=None):
+    async with admission.admit(tool):
+        if order is not None:
+            order.append(name)
+        await release.wait()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_full_queue_rejects_immediately():
+    admission = controller()
+
+    async def run():
+        release = asyncio.Event()
+        running = asyncio.ensure_future(hold(admission, "search", release))
+        queued = asyncio.ensure_future(hold(admission, "search", release))
+        await settle()
+        with pytest.raises(ServerBusyError, match=r"Server busy: search already has 1 calls in flight and 1 queued") as e:
+            async with admission.admit("search"):
+                pass
+        assert e.value.error.data == {"retry_after": 2.0, "reason": "tool_queue_full"}
+        release.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(run())
+    stats = admission.stats()["tools"]["search"]
+    assert (stats["admitted"], stats["queued"], stats["rejected"]) == (2, 1, 1)
+    assert (stats["in_flight"], stats["queue_depth"]) == (0, 0)
+
+
+def test_queued_call_is_rejected_at_its_deadline():
+    admission = controller(queue_timeout=0.05)
+
+    async def run():
+        release = asyncio.Event()
+        running = asyncio.ensure_future(hold(admission, "search", release))
+        await settle()
+        with pytest.raises(McpError, match=r"waited 0\.\d+s for a free search slot\. Retry after [\d.]+ seconds"):
+            async with admission.admit("search"):
+                pass
+        # The expired caller gave up its queue position
+        assert not admission._tools["search"].waiters
+        release.set()
+        await running
+
+    asyncio.run(run())
+    assert admission.stats()["tools"]["search"]["rejected"] == 1
+
+
+def test_slots_are_handed_over_in_arrival_order():
+    admission = controller(queue_size=3)
+    order = []
+
+    async def run():
+        releases = [asyncio.Event() for _ in range(4)]
+        calls = [asyncio.ensure_future(hold(admission, "search", releases[i], order, i)) for i in range(4)]
+        for i in range(4):
+            await settle()
+            assert order == list(range(i + 1))
+            assert admission._tools["search"].in_flight == 1
+            releases[i].set()
+        await asyncio.gather(*calls)
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    admission = controller(queue_size=2)
+    order = []
+
+    async def run():
+        release = asyncio.Event()
+        running = asyncio.ensure_future(hold(admission, "search", release, order, "first"))
+        cancelled = asyncio.ensure_future(hold(admission, "search", release, order, "cancelled"))
+        last = asyncio.ensure_future(hold(admission, "search", release, order, "last"))
+        await settle()
+        cancelled.cancel()
+        await settle()
+        assert len(admission._tools["search"].waiters) == 1
+        release.set()
+        await asyncio.gather(running, last)
+
+    asyncio.run(run())
+    assert order == ["first", "last"]
+    assert admission._tools["search"].in_flight == 0
+
+
+def test_tool_overrides_and_exempt_tools():
+    admission = controller(tool_limit=5, overrides="batch:1, bad, search:2", queue_size=0)
+    assert admission.tool_limits == {"batch": 1, "search": 2}
+
+    async def run():
+        release = asyncio.Event()
+        calls = [asyncio.ensure_future(hold(admission, "search", release)) for _ in range(2)]
+        await settle()
+        with pytest.raises(McpError):
+            async with admission.admit("search"):
+                pass
+        # Exempt tools run however busy the server is
+        async with admission.admit("get_server_info"):
+            pass
+        release.set()
+        await asyncio.gather(*calls)
+
+    asyncio.run(run())
+    assert "get_server_info" not in admission.stats()["tools"]
+
+
+def test_token_lane_caps_one_client_across_tools(monkeypatch):
+    admission = controller(tool_limit=10, token_limit=1, queue_size=0)
+    client = ["alice"]
+    monkeypatch.setattr(AdmissionController, "client_key", staticmethod(lambda: (client[0], "")))
+
+    async def run():
+        release = asyncio.Event()
+        running = asyncio.ensure_future(hold(admission, "search", release))
+        await settle()
+        with pytest.raises(McpError, match="this client already has 1 calls in flight"):
+            async with admission.admit("list"):
+                pass
+        # Another client is unaffected
+        client[0] = "bob"
+        async with admission.admit("list"):
+            pass
+        release.set()
+        await running
+
+    asyncio.run(run())
+    # Idle clients are forgotten
+    assert not admission._tokens
+
+
+def test_rejections_reach_clients_as_errors_with_retry_after(monkeypatch):
+    admission = controller(queue_size=0, exempt="")
+    monkeypatch.setattr(server, "admission", admission)
+
+    async def run():
+        async with Client(server.mcp) as client:
+            release = asyncio.Event()
+            running = asyncio.ensure_future(hold(admission, "get_scheduling_config", release))
+            await settle()
+            with pytest.raises(McpError) as e:
+                await client.call_tool("get_scheduling_config", {})
+            release.set()
+            await running
+            # Admitted calls still return normal tool results
+            assert not (await client.call_tool("get_scheduling_config", {})).is_error
+        return e.value.error
+
+    error = asyncio.run(run())
+    assert error.message.startswith("Server busy: get_scheduling_config already has 1 calls in flight")
+    assert error.data == {"retry_after": 1.0, "reason": "tool_queue_full"}
@@ -0,0 +1,33 @@
+import asyncio
+
+from scheduling_mcp_server import HTTPClientPool
+
+
+def test_shutdown_closes_clients_retired_moments_before():
+    async def run():
+        pool = HTTPClientPool(max_clients=1)
+        retired = pool.get_client("calcom", "key-1")
+        current = pool.get_client("calcom", "key-2")
+        # key-1 was evicted and is waiting out its grace period before closing
+        assert pool.clients_evicted == 1
+        assert not retired.is_closed
+        await pool.aclose()
+        return retired, current, pool
+
+    retired, current, pool = asyncio.run(run())
+    assert retired.is_closed
+    assert current.is_closed
+    assert not pool._retired
+
+
+def test_retired_client_closes_after_its_grace_period(monkeypatch):
+    async def run():
+        pool = HTTPClientPool(max_clients=1)
+        retired = pool.get_client("calcom", "key-1")
+        pool.get_client("calcom", "key-2")
+        await asyncio.gather(*pool._closing)
+        return retired
+
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda delay: real_sleep(0))
+    assert asyncio.run(run()).is_closed
@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from scheduling_mcp_server import DirectoryIndex, DirectoryPage, SchedulingAPI, SearchQuery
+
+QUERIES = [
+    ("Alice", "acme.com"),
+    ("alice smith", "Acme"),
+    ("Bob", "globex.io"),
+    ("Jones", "Globex"),
+    ("", "Acme Corp"),
+    ("Carol", "Initech"),
+    ("al", "acme"),
+]
+
+
+def user(id, name, email, company=None):
+    return {"id": id, "name": name, "email": email, "username": name.split()[0].lower(),
+            "metadata": {"company": company} if company else {}}
+
+
+USERS = [
+    user(1, "Alice Smith", "alice@acme.com"),
+    user(2, "Bob Jones", "bob@globex.io", "Globex"),
+    user(3, "Carol Alvarez", "carol@initech.com", "Initech"),
+    user(4, "Alice Jones", "alice.jones@acme.co.uk"),
+    user(5, "Dan Brown", "dan@eng.acme.com"),
+    user(6, "Erin Smith", "erin@globex.io"),
+    user(7, "Frank Alder", "frank@initech.com", "Initech"),
+    user(8, "Grace Bob", "grace@hooli.com", "acme.com"),
+]
+
+
+def build(users):
+    return DirectoryIndex(users, SchedulingAPI.calcom_member, "calcom")
+
+
+def live(index, table):
+    """A posting table as member ids, without tombstoned positions"""
+    mapped = {
+        key: [index.members[position].key for position in positions if index.members[position] is not None]
+        for key, positions in table.items()
+    }
+    return {key: sorted(ids) for key, ids in mapped.items() if ids}
+
+
+def assert_same_index(index, rebuilt):
+    assert len(index) == len(rebuilt)
+    assert {member.key: member for member in index.members if member is not None} == {
+        member.key: member for member in rebuilt.members
+    }
+    for table in ("domains", "company_keys", "postings"):
+        assert live(index, getattr(index, table)) == live(rebuilt, getattr(rebuilt, table))
+    for name, company in QUERIES:
+        query = SearchQuery(name, company)
+        assert sorted(member.key for member in index.search(query)) == sorted(
+            member.key for member in rebuilt.search(query)
+        )
+        assert index.search(query) == [member for member in index.members if member is not None
+                                       and query.matches(member.name, member.email, member.company)]
+
+
+def test_apply_matches_a_full_rebuild():
+    index = build(USERS)
+    updated = user(2, "Robert Jones", "robert@acme.com", "Acme")
+    added = user(9, "Heidi Alder", "heidi@globex.io")
+    index.apply([SchedulingAPI.calcom_member(updated), SchedulingAPI.calcom_member(added)], [5])
+
+    expected = [updated if u["id"] == 2 else u for u in USERS if u["id"] != 5] + [added]
+    # Two of nine positions are tombstones, below the compaction ratio
+    assert index.removed == 2
+    assert_same_index(index, build(expected))
+
+
+def test_apply_compacts_once_tombstones_pass_the_ratio():
+    index = build(USERS)
+    index.apply([], [1, 2])
+    assert index.removed == 2
+    assert None in index.members
+
+    index.apply([], [3])
+    assert index.removed == 0
+    assert None not in index.members
+    assert list(index.positions.values()) == list(range(len(index.members)))
+    assert_same_index(index, build([u for u in USERS if u["id"] not in (1, 2, 3)]))
+
+
+def test_removing_and_readding_a_member_keeps_one_copy():
+    index = build(USERS)
+    index.apply([], [5])
+    index.apply([SchedulingAPI.calcom_member(USERS[4])], [])
+    assert index.search(SearchQuery("Dan", "Acme Corp")) == [SchedulingAPI.calcom_member(USERS[4])]
+    assert_same_index(index, build(USERS))
+
+
+def test_changed_compares_every_kept_field():
+    index = build(USERS)
+    assert not index.changed(SchedulingAPI.calcom_member(dict(USERS[0])))
+    assert index.changed(SchedulingAPI.calcom_member({**USERS[0], "username": "asmith"}))
+    assert index.changed(SchedulingAPI.calcom_member(user(99, "New Person", "new@acme.com")))
+    # Fields the record doesn't keep don't count as changes
+    assert not index.changed(SchedulingAPI.calcom_member({**USERS[0], "timeZone": "Europe/Paris"}))
+
+
+def page(key, etag):
+    return DirectoryPage(key, etag, etag.encode())
+
+
+def test_sync_matches_a_full_rebuild():
+    index = build([])
+    first, second = USERS[:4], USERS[4:]
+
+    async def walk(pages):
+        for item in pages:
+            yield item
+
+    stats = asyncio.run(index.sync(walk([(page(0, "a"), first), (page(1, "b"), second)])))
+    assert stats == {"pages": 2, "unchanged_pages": 0, "upserts": 8, "removals": 0}
+    assert_same_index(index, build(USERS))
+
+    # The first page is unchanged; on the second, one member changed and one left
+    unchanged = index.pages[0]
+    changed = [user(5, "Dan Brown", "dan@acme.com")] + [u for u in second[1:] if u["id"] != 7]
+    stats = asyncio.run(index.sync(walk([(unchanged, None), (page(1, "c"), changed)])))
+    assert stats == {"pages": 2, "unchanged_pages": 1, "upserts": 1, "removals": 1}
+    assert_same_index(index, build(first + changed))
+
+
+def test_incomplete_sync_changes_nothing():
+    index = build(USERS)
+
+    async def walk():
+        yield page(0, "a"), USERS[:2]
+        raise RuntimeError("page 2 failed")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(index.sync(walk()))
+    assert_same_index(index, build(USERS))
+
+
+def test_records_and_lowercased_fields_share_interned_strings():
+    # Build equal strings at runtime so they start out as distinct objects
+    users = [user(i, "".join(["ali", "ce"]), "".join(["alice@", "acme.com"]), "".join(["ac", "me"])) for i in (1, 2)]
+    assert users[0]["name"] is not users[1]["name"]
+
+    index = build(users)
+    first, second = index.members
+    assert not hasattr(first, "__dict__")
+    assert first.name is second.name
+    assert first.email is second.email
+    assert first.company is second.company
+    # Lowercase fields are the record's own strings, not copies
+    assert index.names[0] is first.name
+    assert index.emails[0] is index.emails[1] is first.email
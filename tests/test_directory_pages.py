@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+
+import scheduling_mcp_server as server
+from scheduling_mcp_server import SchedulingAPI
+
+
+def walk(handler, **kwargs):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return [(page, items) async for page, items in SchedulingAPI.calcom_user_pages(client, "1", **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_stops_when_the_api_ignores_skip():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"data": [{"id": 1, "name": "Alice"}]})
+
+    pages = walk(handler)
+    assert [items for _, items in pages] == [[{"id": 1, "name": "Alice"}]]
+    assert len(requests) == 2
+
+
+def test_stops_when_a_page_repeats_the_previous_ids():
+    def handler(request):
+        # Same members, but the body echoes the requested skip so the digests differ
+        return httpx.Response(200, json={"data": [{"id": 1}, {"id": 2}], "skip": request.url.params["skip"]})
+
+    assert len(walk(handler)) == 1
+
+
+def test_follows_short_pages_until_an_empty_one():
+    def handler(request):
+        skip = int(request.url.params["skip"])
+        return httpx.Response(200, json={"data": [{"id": i} for i in range(skip, min(skip + 3, 7))]})
+
+    pages = walk(handler, page_size=10)
+    assert [member["id"] for _, items in pages for member in items] == list(range(7))
+
+
+def test_stops_at_the_page_cap(monkeypatch):
+    monkeypatch.setattr(server, "DIRECTORY_MAX_PAGES", 5)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"data": [{"id": int(request.url.params["skip"])}]})
+
+    assert len(walk(handler)) == 5
+    assert len(requests) == 5
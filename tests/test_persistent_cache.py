@@ -0,0 +1,157 @@
+import asyncio
+
+import httpx
+import pytest
+
+import scheduling_mcp_server as server
+from scheduling_mcp_server import PersistentCacheTransport, PersistentStore
+
+URL = "https://api.cal.com/v2/organizations/1/users?take=100&skip=0"
+VALIDATORS = {"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2026 07:28:00 GMT"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_800_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(server.time, "time", fake)
+    return fake
+
+
+class Upstream:
+    """Mock API answering with the queued responses (or raising queued exceptions) in turn"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def fetch(path, upstream, *urls, **extensions):
+    """GET each url through a PersistentCacheTransport backed by the SQLite file at path"""
+    async def run():
+        async with PersistentStore(path=str(path), ttl=60) as store:
+            transport = PersistentCacheTransport(httpx.MockTransport(upstream), store, "calcom:digest")
+            responses = []
+            for url in urls:
+                response = await transport.handle_async_request(httpx.Request("GET", url, extensions=extensions))
+                await response.aread()
+                responses.append(response)
+            return responses, store.stats()
+
+    return asyncio.run(run())
+
+
+def test_fresh_entries_are_served_without_calling_upstream(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    upstream = Upstream(httpx.Response(200, json={"data": [1]}, headers=VALIDATORS))
+    (first, second), stats = fetch(path, upstream, URL, URL)
+    assert first.json() == second.json() == {"data": [1]}
+    assert second.headers["ETag"] == '"v1"'
+    assert len(upstream.requests) == 1
+    assert (stats["misses"], stats["fresh_hits"]) == (1, 1)
+
+    # A restarted process serves the entry from the file
+    upstream = Upstream()
+    (response,), stats = fetch(path, upstream, URL)
+    assert response.json() == {"data": [1]}
+    assert stats["fresh_hits"] == 1
+
+
+def test_expired_entry_is_revalidated_and_a_304_is_served_from_sqlite(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    fetch(path, Upstream(httpx.Response(200, json={"data": [1]}, headers=VALIDATORS)), URL)
+
+    clock.now += 61
+    upstream = Upstream(httpx.Response(304))
+    (response, _), _ = fetch(path, upstream, URL, URL)
+    request = upstream.requests[0]
+    assert request.headers["If-None-Match"] == '"v1"'
+    assert request.headers["If-Modified-Since"] == VALIDATORS["Last-Modified"]
+    assert response.status_code == 200
+    assert response.json() == {"data": [1]}
+    # The 304 renewed the entry, so the second GET didn't go upstream
+    assert len(upstream.requests) == 1
+
+    # The renewed expiry was written to the file
+    (response,), stats = fetch(path, Upstream(), URL)
+    assert stats["fresh_hits"] == 1
+
+
+def test_changed_response_replaces_the_stored_copy(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    fetch(path, Upstream(httpx.Response(200, json={"data": [1]}, headers=VALIDATORS)), URL)
+
+    clock.now += 61
+    upstream = Upstream(httpx.Response(200, json={"data": [2]}, headers={"ETag": '"v2"'}))
+    (response,), stats = fetch(path, upstream, URL)
+    assert response.json() == {"data": [2]}
+    assert stats["refreshed"] == 1
+
+    clock.now += 61
+    upstream = Upstream(httpx.Response(304))
+    fetch(path, upstream, URL)
+    assert upstream.requests[0].headers["If-None-Match"] == '"v2"'
+
+
+def test_request_with_its_own_validators_always_asks_upstream(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    upstream = Upstream(httpx.Response(200, json={"data": [1]}, headers=VALIDATORS), httpx.Response(304))
+
+    async def run():
+        async with PersistentStore(path=str(path), ttl=60) as store:
+            transport = PersistentCacheTransport(httpx.MockTransport(upstream), store, "calcom:digest")
+            await transport.handle_async_request(httpx.Request("GET", URL))
+            request = httpx.Request("GET", URL, headers={"If-None-Match": '"v1"'})
+            return await transport.handle_async_request(request)
+
+    assert asyncio.run(run()).status_code == 200
+    assert len(upstream.requests) == 2
+
+
+@pytest.mark.parametrize("failure", [
+    httpx.Response(503),
+    httpx.ConnectError("connection refused"),
+    httpx.ReadTimeout("timed out"),
+    server.CircuitOpenError("circuit open"),
+])
+def test_stale_copy_is_served_when_upstream_fails(tmp_path, clock, failure):
+    path = tmp_path / "cache.sqlite3"
+    fetch(path, Upstream(httpx.Response(200, json={"data": [1]}, headers=VALIDATORS)), URL)
+
+    clock.now += 3600
+    (response,), stats = fetch(path, Upstream(failure), URL)
+    assert response.status_code == 200
+    assert response.json() == {"data": [1]}
+    assert stats["stale_if_error"] == 1
+
+
+def test_failures_without_a_stored_copy_reach_the_caller(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    (response,), stats = fetch(path, Upstream(httpx.Response(503)), URL)
+    assert response.status_code == 503
+    assert stats["entries"] == 0
+
+    with pytest.raises(httpx.ConnectError):
+        fetch(path, Upstream(httpx.ConnectError("connection refused")), URL)
+
+
+def test_requests_can_opt_out_of_the_store(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    upstream = Upstream(httpx.Response(200, json={"slots": []}), httpx.Response(200, json={"slots": []}))
+    _, stats = fetch(path, upstream, URL, URL, persistent_cache=False)
+    assert len(upstream.requests) == 2
+    assert stats["entries"] == 0
@@ -0,0 +1,145 @@
+import asyncio
+
+import httpx
+import pytest
+
+import scheduling_mcp_server as server
+from scheduling_mcp_server import (
+    PRIORITY_BACKGROUND, PRIORITY_BULK, PRIORITY_INTERACTIVE, RequestScheduler, ScheduledTransport, request_priority,
+)
+
+KEY = ("calcom", "digest")
+
+
+class VirtualTime:
+    """time.monotonic and asyncio.sleep that advance a fake clock instead of waiting"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay, result=None):
+        self.sleeps.append(delay)
+        self.now += max(0.0, delay)
+        await self.real_sleep(0)
+        return result
+
+
+@pytest.fixture
+def virtual_time(monkeypatch):
+    clock = VirtualTime()
+    clock.real_sleep = asyncio.sleep
+    monkeypatch.setattr(server.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(server.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def scheduler(**kwargs):
+    kwargs.setdefault("rates", {"calcom": (0.0, 1)})
+    kwargs.setdefault("max_retries", 3)
+    kwargs.setdefault("backoff_base", 0.5)
+    kwargs.setdefault("backoff_max", 30.0)
+    return RequestScheduler(**kwargs)
+
+
+def transport(request_scheduler, responses):
+    """A ScheduledTransport over a mock upstream that answers with `responses` in turn"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses[min(len(requests), len(responses)) - 1]
+
+    return ScheduledTransport(httpx.MockTransport(handler), request_scheduler, KEY), requests
+
+
+def get(scheduled, **params):
+    return scheduled.handle_async_request(httpx.Request("GET", "https://api.cal.com/v2/me", params=params))
+
+
+def test_retry_after_is_honoured_and_pauses_the_lane(virtual_time):
+    request_scheduler = scheduler()
+    scheduled, requests = transport(request_scheduler, [
+        httpx.Response(429, headers={"Retry-After": "7"}),
+        httpx.Response(200),
+    ])
+
+    response = asyncio.run(get(scheduled))
+    assert response.status_code == 200
+    assert len(requests) == 2
+    assert virtual_time.sleeps == [7.0]
+    lane = request_scheduler._lanes[KEY]
+    assert (lane.retries, lane.rate_limited) == (1, 1)
+    assert lane.blocked_until == 1007.0
+
+
+def test_retry_after_as_an_http_date_and_capped_at_backoff_max(virtual_time):
+    request_scheduler = scheduler(backoff_max=10.0)
+    date = httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    far = httpx.Response(429, headers={"Retry-After": "3600"})
+    # A date in the past means retry now
+    assert request_scheduler.retry_after(date) == 0.0
+    assert request_scheduler.retry_after(far) == 10.0
+    assert request_scheduler.retry_after(httpx.Response(429, headers={"Retry-After": "soon"})) is None
+
+
+def test_retries_stop_at_max_retries(virtual_time):
+    request_scheduler = scheduler(max_retries=2)
+    scheduled, requests = transport(request_scheduler, [httpx.Response(503)])
+
+    response = asyncio.run(get(scheduled))
+    # The last failure is handed back instead of retried again
+    assert response.status_code == 503
+    assert len(requests) == 3
+    assert len(virtual_time.sleeps) == 2
+    # Full-jitter backoff: attempt n waits at most backoff_base * 2**n
+    assert all(0 <= delay <= 0.5 * 2 ** attempt for attempt, delay in enumerate(virtual_time.sleeps))
+    assert request_scheduler._lanes[KEY].rate_limited == 0
+
+
+def test_client_errors_are_not_retried(virtual_time):
+    request_scheduler = scheduler()
+    scheduled, requests = transport(request_scheduler, [httpx.Response(404)])
+    assert asyncio.run(get(scheduled)).status_code == 404
+    assert len(requests) == 1
+    assert not virtual_time.sleeps
+
+
+def test_queued_requests_are_dispatched_by_priority(virtual_time):
+    request_scheduler = scheduler(rates={"calcom": (1.0, 1)})
+    scheduled, requests = transport(request_scheduler, [httpx.Response(200)])
+
+    async def call(name, priority):
+        request_priority.set(priority)
+        await get(scheduled, who=name)
+
+    async def run():
+        # Uses the only token, so everything after it queues
+        await get(scheduled, who="first")
+        await asyncio.gather(
+            call("background", PRIORITY_BACKGROUND),
+            call("bulk-1", PRIORITY_BULK),
+            call("bulk-2", PRIORITY_BULK),
+            call("interactive", PRIORITY_INTERACTIVE),
+        )
+
+    asyncio.run(run())
+    assert [request.url.params["who"] for request in requests] == [
+        "first", "interactive", "bulk-1", "bulk-2", "background",
+    ]
+    # One token per second: each queued request waited for the next one
+    assert virtual_time.now == pytest.approx(1004.0)
+    assert request_scheduler._lanes[KEY].throttled == 4
+
+
+def test_rate_limit_pause_holds_back_other_requests(virtual_time):
+    request_scheduler = scheduler()
+    request_scheduler.record_retry(KEY, 429, 5.0)
+    # A pause blocks the fast path, so a hedge can't slip past it either
+    assert not request_scheduler.try_acquire(KEY)
+
+    asyncio.run(request_scheduler.acquire(KEY))
+    assert virtual_time.now == pytest.approx(1005.0)
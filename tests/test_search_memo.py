@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+
+import scheduling_mcp_server as server
+from scheduling_mcp_server import SchedulingAPI, TTLCache
+
+
+def key(name, company, **kwargs):
+    kwargs.setdefault("platform", "calcom")
+    kwargs.setdefault("credential", "cal_key")
+    kwargs.setdefault("org_id", "1")
+    return SchedulingAPI.search_key(name=name, company=company, **kwargs)
+
+
+@pytest.mark.parametrize("name, company", [
+    ("alice smith", "acme corp"),
+    ("Alice Smith", "Acme Corp"),
+    ("ALICE   SMITH ", " ACME  CORP"),
+    ("Smith Alice", "Acme Corp"),
+    ("smith alice alice", "acme corp"),
+])
+def test_equivalent_queries_share_a_key(name, company):
+    assert key(name, company) == key("Alice Smith", "Acme Corp")
+
+
+@pytest.mark.parametrize("changes", [
+    {"company": "Corp Acme"},
+    {"name": "Alice Smithson"},
+    {"platform": "calendly"},
+    {"credential": "other_key"},
+    {"org_id": "2"},
+    {"max_results": 5},
+    {"availability_days": 7},
+])
+def test_different_searches_get_different_keys(changes):
+    query = {"name": "Alice Smith", "company": "Acme Corp", **changes}
+    assert key(**query) != key("Alice Smith", "Acme Corp")
+
+
+def test_org_id_is_ignored_for_calendly():
+    assert key("Alice", "Acme", platform="calendly", org_id="1") == key("Alice", "Acme", platform="calendly", org_id="")
+
+
+def test_equivalent_concurrent_searches_share_one_upstream_search(monkeypatch):
+    calls = []
+
+    async def search_calcom(name, company, org_id, api_key, **kwargs):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        return [{"name": "Alice Smith", "email": "alice@acme.com", "bookingLinks": []}]
+
+    monkeypatch.setattr(server, "search_memo", TTLCache("search", ttl=5, max_size=100))
+    monkeypatch.setattr(SchedulingAPI, "search_calcom", staticmethod(search_calcom))
+
+    async def run():
+        return await asyncio.gather(*(
+            SchedulingAPI.search("calcom", name, company, "1", "cal_key")
+            for name, company in [("Alice Smith", "Acme Corp"), ("smith  ALICE", "acme corp"), ("Alice", "Acme Corp")]
+        ))
+
+    first, reordered, broader = asyncio.run(run())
+    assert sorted(calls) == ["Alice", "Alice Smith"]
+    assert first == reordered == broader
+    # Each caller gets its own list
+    first.append({})
+    assert len(reordered) == 1
+
+
+def test_searches_with_slots_are_memoized_no_longer_than_the_slots(monkeypatch):
+    async def search_calcom(name, company, org_id, api_key, **kwargs):
+        return []
+
+    monkeypatch.setattr(server, "search_memo", TTLCache("search", ttl=300, max_size=100))
+    monkeypatch.setattr(server, "AVAILABILITY_CACHE_TTL", 10)
+    monkeypatch.setattr(SchedulingAPI, "search_calcom", staticmethod(search_calcom))
+
+    async def run():
+        await SchedulingAPI.search("calcom", "Alice", "Acme", "1", "cal_key")
+        await SchedulingAPI.search("calcom", "Alice", "Acme", "1", "cal_key", availability_days=7)
+
+    asyncio.run(run())
+    lifetimes = {
+        memo_key[-1]: entry.expires_at - time.monotonic()
+        for memo_key, entry in server.search_memo._entries.items()
+    }
+    assert lifetimes[0] > 10
+    assert 0 < lifetimes[7] <= 10
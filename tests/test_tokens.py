@@ -0,0 +1,34 @@
+from scheduling_mcp_server import TokenRegistry
+
+
+def test_fallback_token_works_only_while_nothing_is_configured():
+    registry = TokenRegistry(fallback_token="696969")
+    assert registry.using_fallback
+    assert registry.lookup("696969").client_id == "default"
+
+
+def test_configured_tokens_retire_the_fallback_token():
+    for configured in ({"tokens": "bot:secret1"}, {"default_token": "custom"}):
+        registry = TokenRegistry(fallback_token="696969", **configured)
+        assert not registry.using_fallback
+        assert registry.lookup("696969") is None
+
+
+def test_empty_token_file_does_not_reenable_the_fallback_token(tmp_path):
+    path = tmp_path / "tokens.txt"
+    path.write_text("# every token revoked\n")
+    registry = TokenRegistry(path=str(path), fallback_token="696969")
+    assert len(registry) == 0
+    assert registry.lookup("696969") is None
+
+
+def test_entries_map_tokens_to_clients(tmp_path):
+    path = tmp_path / "tokens.txt"
+    path.write_text("reporting:a71d\nbare\n")
+    registry = TokenRegistry("main", "bot:secret1, secret2", str(path))
+    tokens = ("main", "secret1", "secret2", "a71d", "bare")
+    assert {token: registry.lookup(token).client_id for token in tokens} == {
+        "main": "default", "secret1": "bot", "secret2": "env", "a71d": "reporting", "bare": "file",
+    }
+    assert registry.lookup("secret") is None
+    assert registry.stats()["rejected"] == 1
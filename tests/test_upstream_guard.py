@@ -0,0 +1,236 @@
+import asyncio
+
+import httpx
+import pytest
+
+import scheduling_mcp_server as server
+from scheduling_mcp_server import CircuitBreaker, CircuitOpenError, GuardedTransport, UpstreamGuard
+
+URL = "https://api.cal.com/v2/event-types"
+
+
+def guard(**kwargs):
+    kwargs.setdefault("total_timeout", 0)
+    kwargs.setdefault("window", 4)
+    kwargs.setdefault("min_calls", 4)
+    kwargs.setdefault("failure_ratio", 0.5)
+    kwargs.setdefault("slow_call_seconds", 1.0)
+    kwargs.setdefault("open_seconds", 10.0)
+    kwargs.setdefault("hedging", False)
+    kwargs.setdefault("hedge_min_samples", 5)
+    kwargs.setdefault("hedge_min_delay", 0.0)
+    return UpstreamGuard(**kwargs)
+
+
+def send(transport, method="GET"):
+    return transport.handle_async_request(httpx.Request(method, URL))
+
+
+def warm(upstream_guard, latency):
+    """Record enough fast successful calls that the endpoint has a p95 to hedge on"""
+    breaker = upstream_guard.breaker("calcom", "/v2/event-types")
+    for _ in range(upstream_guard.hedge_min_samples):
+        breaker.record(True, latency)
+    return breaker
+
+
+def test_cancelled_caller_cancels_the_unhedged_primary():
+    upstream_guard = guard(hedging=True, total_timeout=0.05)
+    warm(upstream_guard, 1.0)
+    cancelled = []
+
+    async def handler(request):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(request)
+            raise
+        return httpx.Response(200)
+
+    async def run():
+        transport = GuardedTransport(httpx.MockTransport(handler), upstream_guard, "calcom")
+        # The total timeout fires while _send is still waiting out the hedge delay
+        with pytest.raises(httpx.TimeoutException):
+            await send(transport)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert len(cancelled) == 1
+
+    asyncio.run(run())
+    assert upstream_guard.hedges == 0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Only the breaker tests use it: they run no timers, so the event loop doesn't notice
+    fake = FakeClock()
+    monkeypatch.setattr(server.time, "monotonic", fake)
+    return fake
+
+
+def test_circuit_opens_rejects_probes_and_closes(clock):
+    upstream_guard = guard()
+    statuses = iter([200, 500, 200, 500, 200])
+    seen = []
+
+    def handler(request):
+        breaker = upstream_guard.breaker("calcom", "/v2/event-types")
+        seen.append(breaker.state)
+        if breaker.state == CircuitBreaker.HALF_OPEN:
+            # Only the probe goes through while half-open
+            assert not breaker.allow()
+        return httpx.Response(next(statuses))
+
+    async def run():
+        transport = GuardedTransport(httpx.MockTransport(handler), upstream_guard, "calcom")
+        for _ in range(4):
+            await send(transport)
+        breaker = upstream_guard.breaker("calcom", "/v2/event-types")
+        assert breaker.state == CircuitBreaker.OPEN
+
+        clock.now += 9.9
+        with pytest.raises(CircuitOpenError):
+            await send(transport)
+        assert len(seen) == 4
+
+        clock.now += 0.1
+        response = await send(transport)
+        assert response.status_code == 200
+        assert seen[-1] == CircuitBreaker.HALF_OPEN
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert not breaker.outcomes
+        return breaker
+
+    breaker = asyncio.run(run())
+    assert breaker.times_opened == 1
+    assert breaker.rejected == 2
+
+
+def test_failed_probe_reopens_the_circuit(clock):
+    upstream_guard = guard(window=2, min_calls=2)
+
+    def handler(request):
+        return httpx.Response(503)
+
+    async def run():
+        transport = GuardedTransport(httpx.MockTransport(handler), upstream_guard, "calcom")
+        await send(transport)
+        await send(transport)
+        breaker = upstream_guard.breaker("calcom", "/v2/event-types")
+        assert breaker.state == CircuitBreaker.OPEN
+        clock.now += 10
+        await send(transport)
+        assert breaker.state == CircuitBreaker.OPEN
+        # The open period restarts from the failed probe
+        clock.now += 5
+        with pytest.raises(CircuitOpenError):
+            await send(transport)
+        return breaker
+
+    assert asyncio.run(run()).times_opened == 2
+
+
+def test_slow_calls_count_as_failures_but_429_does_not(clock):
+    upstream_guard = guard(window=2, min_calls=2, failure_ratio=1.0)
+    responses = iter([(429, 0), (429, 0), (200, 2.0), (200, 2.0)])
+
+    def handler(request):
+        status, seconds = next(responses)
+        clock.now += seconds
+        return httpx.Response(status)
+
+    async def run():
+        transport = GuardedTransport(httpx.MockTransport(handler), upstream_guard, "calcom")
+        breaker = upstream_guard.breaker("calcom", "/v2/event-types")
+        await send(transport)
+        await send(transport)
+        assert breaker.state == CircuitBreaker.CLOSED
+        await send(transport)
+        assert breaker.state == CircuitBreaker.CLOSED
+        await send(transport)
+        assert breaker.state == CircuitBreaker.OPEN
+
+    asyncio.run(run())
+
+
+def hedged_transport(upstream_guard, delays):
+    """A transport whose n-th request takes delays[n] seconds; records who was cancelled"""
+    calls = []
+    cancelled = []
+
+    async def handler(request):
+        number = len(calls)
+        calls.append(asyncio.get_running_loop().time())
+        try:
+            await asyncio.sleep(delays[number])
+        except asyncio.CancelledError:
+            cancelled.append(number)
+            raise
+        return httpx.Response(200, json={"copy": number})
+
+    return GuardedTransport(httpx.MockTransport(handler), upstream_guard, "calcom"), calls, cancelled
+
+
+def test_hedge_fires_after_the_p95_delay_and_the_loser_is_cancelled():
+    upstream_guard = guard(hedging=True)
+    warm(upstream_guard, 0.05)
+    transport, calls, cancelled = hedged_transport(upstream_guard, [5.0, 0.01])
+
+    async def run():
+        response = await send(transport)
+        await asyncio.sleep(0)
+        return response
+
+    response = asyncio.run(run())
+    assert response.json() == {"copy": 1}
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.05
+    assert cancelled == [0]
+    assert (upstream_guard.hedges, upstream_guard.hedge_wins) == (1, 1)
+
+
+def test_primary_can_still_win_after_a_hedge():
+    upstream_guard = guard(hedging=True)
+    warm(upstream_guard, 0.02)
+    transport, calls, cancelled = hedged_transport(upstream_guard, [0.05, 5.0])
+
+    async def run():
+        response = await send(transport)
+        await asyncio.sleep(0)
+        return response
+
+    assert asyncio.run(run()).json() == {"copy": 0}
+    assert cancelled == [1]
+    assert (upstream_guard.hedges, upstream_guard.hedge_wins) == (1, 0)
+
+
+def test_no_hedge_without_enough_samples_or_for_writes():
+    upstream_guard = guard(hedging=True)
+    transport, calls, _ = hedged_transport(upstream_guard, [0.05, 0.05])
+    asyncio.run(send(transport))
+    warm(upstream_guard, 0.01)
+    asyncio.run(send(transport, "POST"))
+    assert len(calls) == 2
+    assert upstream_guard.hedges == 0
+
+
+def test_no_hedge_when_the_rate_limiter_has_no_token_free():
+    class NoTokens:
+        def try_acquire(self, key):
+            return False
+
+    upstream_guard = guard(hedging=True)
+    warm(upstream_guard, 0.01)
+    transport, calls, _ = hedged_transport(upstream_guard, [0.1])
+    transport.scheduler = NoTokens()
+    assert asyncio.run(send(transport)).json() == {"copy": 0}
+    assert len(calls) == 1
+    assert upstream_guard.hedges == 0